@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.conversation_memory import ConversationMemory, InMemoryBackend
+from services.sqlite_memory import SQLiteMemoryBackend
+
+
+async def run_requests(memory: ConversationMemory, sessions: int, requests: int):
+    """Replay the per-request memory calls of /api/ai: has_session, get_conversation_exchanges, add_exchange."""
+    rng = random.Random(5)
+    latencies = []
+    for i in range(requests):
+        session_id = f"session-{rng.randrange(sessions)}"
+        start = time.perf_counter()
+        await memory.has_session(session_id)
+        await memory.get_conversation_exchanges(session_id)
+        await memory.add_exchange(session_id, f"question {i} about Alice's deals", f"answer {i} " * 40)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e6
+
+
+def bench(name: str, memory: ConversationMemory, sessions: int, requests: int):
+    asyncio.run(run_requests(memory, sessions, min(requests, 1000)))
+    latencies = asyncio.run(run_requests(memory, sessions, requests))
+    memory.close()
+    print(f"{name:>26} | {latencies.mean():>8.1f} | {np.percentile(latencies, 50):>8.1f} | {np.percentile(latencies, 99):>8.1f}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Per-request conversation memory overhead by backend")
+    parser.add_argument("--sessions", type=int, default=2_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests over {args.sessions} sessions (has_session + get_conversation_exchanges + add_exchange)")
+    print(f"{'backend':>26} | {'mean us':>8} | {'p50 us':>8} | {'p99 us':>8}")
+    print("-" * 60)
+
+    bench("memory", ConversationMemory(backend=InMemoryBackend()), args.sessions, args.requests)
+    with tempfile.TemporaryDirectory() as directory:
+        bench(
+            "sqlite wal, batched 50ms",
+            ConversationMemory(backend=SQLiteMemoryBackend(os.path.join(directory, "batched.db"))),
+            args.sessions, args.requests
+        )
+        bench(
+            "sqlite wal, write-through",
+            ConversationMemory(backend=SQLiteMemoryBackend(os.path.join(directory, "sync.db"), flush_interval_seconds=0)),
+            args.sessions, args.requests
+        )
+
+
+if __name__ == "__main__":
+    run()
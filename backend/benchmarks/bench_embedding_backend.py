@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+import numpy as np
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_corpus():
+    """The production chunk set from dummyData.json, plus questions about it."""
+    from services.rag_service import RAGService
+    from services.local_router import SALES_EXAMPLES, GENERAL_EXAMPLES
+
+    with open(os.path.join(BACKEND_DIR, "dummyData.json"), encoding="utf-8") as f:
+        reps = json.load(f)["salesReps"]
+    chunks, _ = RAGService._create_sales_chunks(reps)
+
+    questions = list(SALES_EXAMPLES) + list(GENERAL_EXAMPLES)
+    for rep in reps:
+        questions += [f"What deals does {rep['name']} have?", f"Which clients does {rep['name']} work with?",
+                      f"Who covers {rep['region']}?"]
+    return list(chunks.values()), questions
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def worker(kind: str, output_path: str):
+    """Runs in a fresh interpreter so each backend's RSS is measured alone."""
+    chunks, questions = load_corpus()
+    from services.embedding_backend import create_embedding_backend
+    from utils.logger import logger
+    logger.configure(console_level="NONE")
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    backend = create_embedding_backend(kind)
+    load_seconds = time.perf_counter() - start
+    backend.encode(["warm up"])
+
+    start = time.perf_counter()
+    chunk_embeddings = backend.encode(chunks)
+    chunk_seconds = time.perf_counter() - start
+
+    latencies = []
+    query_embeddings = []
+    for question in questions:
+        start = time.perf_counter()
+        query_embeddings.append(backend.encode([question])[0])
+        latencies.append(time.perf_counter() - start)
+
+    np.savez(output_path, chunks=chunk_embeddings, queries=np.array(query_embeddings))
+    latencies_ms = np.array(latencies) * 1000
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "rss_model_mb": rss_mb() - rss_before,
+        "rss_total_mb": rss_mb(),
+        "chunk_ms": chunk_seconds * 1000 / len(chunks),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+    }))
+
+
+def run_worker(kind: str, output_path: str):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", kind, "--output", output_path],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"{kind} worker failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def top_k_overlap(reference_chunks, reference_queries, chunks, queries, k: int) -> float:
+    reference_top = np.argsort(-normalize(reference_queries) @ normalize(reference_chunks).T, axis=1)[:, :k]
+    top = np.argsort(-normalize(queries) @ normalize(chunks).T, axis=1)[:, :k]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(reference_top, top)]))
+
+
+def run():
+    parser = argparse.ArgumentParser(description="fp32 vs int8 embedding backends: latency, RSS and retrieval agreement")
+    parser.add_argument("--backends", default="fp32,int8")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.output)
+        return
+
+    kinds = args.backends.split(",")
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for kind in kinds:
+            path = os.path.join(directory, f"{kind}.npz")
+            results[kind] = (run_worker(kind, path), np.load(path))
+
+    chunks, questions = load_corpus()
+    print(f"{len(chunks)} chunks, {len(questions)} single-question encodes, top-{args.k} agreement against {kinds[0]}")
+    print(f"{'backend':>8} | {'load':>7} | {'model MB':>8} | {'RSS MB':>7} | {'chunk ms':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'cosine':>6} | {'top-k':>6}")
+    print("-" * 90)
+    reference = results[kinds[0]][1]
+    for kind in kinds:
+        stats, vectors = results[kind]
+        cosine = float(np.mean(np.sum(normalize(reference["queries"]) * normalize(vectors["queries"]), axis=1)))
+        overlap = top_k_overlap(reference["chunks"], reference["queries"], vectors["chunks"], vectors["queries"], args.k)
+        print(f"{kind:>8} | {stats['load_seconds']:>6.2f}s | {stats['rss_model_mb']:>8.0f} | {stats['rss_total_mb']:>7.0f} | "
+              f"{stats['chunk_ms']:>8.2f} | {stats['p50_ms']:>7.2f} | {stats['p99_ms']:>7.2f} | {cosine:>6.3f} | {overlap:>6.3f}")
+
+
+if __name__ == "__main__":
+    run()
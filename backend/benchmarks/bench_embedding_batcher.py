@@ -0,0 +1,83 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.embedding_batcher import EmbeddingBatcher
+from utils.logger import logger
+
+
+class SimulatedModel:
+    """Encode cost of ``call_ms + item_ms * batch`` on one compute lane, like a saturated CPU."""
+
+    def __init__(self, call_ms: float, item_ms: float):
+        self.call_seconds = call_ms / 1000
+        self.item_seconds = item_ms / 1000
+        self._lane = threading.Lock()
+
+    def get_sentence_embedding_dimension(self):
+        return 384
+
+    def encode(self, texts):
+        with self._lane:
+            time.sleep(self.call_seconds + self.item_seconds * len(texts))
+        return np.zeros((len(texts), 384), dtype="float32")
+
+
+def load_model(args):
+    if args.simulate:
+        return SimulatedModel(args.call_ms, args.item_ms), f"simulated ({args.call_ms}ms/call + {args.item_ms}ms/item)"
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("all-MiniLM-L6-v2"), "all-MiniLM-L6-v2"
+
+
+def bench(name: str, encoder, callers: int, requests: int):
+    latencies = []
+
+    def one(i: int):
+        start = time.perf_counter()
+        encoder.encode([f"How did rep {i % 50} do with client {i} this quarter?"])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    batch = f"{encoder.items / encoder.batches:>6.1f}" if isinstance(encoder, EmbeddingBatcher) and encoder.batches else f"{'-':>6}"
+    print(f"{name:>22} | {requests / elapsed:>8.0f} | {np.percentile(latencies_ms, 50):>8.2f} | {np.percentile(latencies_ms, 99):>8.2f} | {batch}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Single-question encodes from concurrent callers, direct vs micro-batched")
+    parser.add_argument("--callers", type=int, default=32, help="Concurrent threads, like to_thread workers under load")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--windows", default="0,1,2,5", help="Comma-separated max_wait_ms values")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--simulate", action="store_true", help="Use a cost model instead of loading sentence-transformers")
+    parser.add_argument("--call-ms", type=float, default=4.0)
+    parser.add_argument("--item-ms", type=float, default=0.3)
+    args = parser.parse_args()
+
+    logger.configure(console_level="NONE")
+    model, description = load_model(args)
+    print(f"{description}, {args.callers} callers, {args.requests} single-question encodes")
+    print(f"{'encoder':>22} | {'enc/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'batch':>6}")
+    print("-" * 66)
+
+    bench("direct", model, args.callers, args.requests)
+    for window in args.windows.split(","):
+        batcher = EmbeddingBatcher(model, max_batch_size=args.max_batch, max_wait_ms=float(window))
+        bench(f"batched, {window}ms window", batcher, args.callers, args.requests)
+        batcher.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import faiss
+import numpy as np
+
+from services.vector_index import IndexConfig, build_index
+
+
+def make_corpus(count: int, dimension: int, clusters: int, seed: int = 7) -> np.ndarray:
+    """Clustered unit vectors, closer to sentence embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((clusters, dimension)).astype("float32")
+    assignments = rng.integers(0, clusters, size=count)
+    corpus = centroids[assignments] + 0.6 * rng.standard_normal((count, dimension)).astype("float32")
+    faiss.normalize_L2(corpus)
+    return corpus
+
+
+def make_queries(corpus: np.ndarray, count: int, seed: int = 11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    picks = corpus[rng.integers(0, len(corpus), size=count)]
+    queries = picks + 0.3 * rng.standard_normal(picks.shape).astype("float32")
+    faiss.normalize_L2(queries)
+    return queries
+
+
+def index_bytes(index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray, k: int) -> float:
+    hits = sum(len(set(truth[i, :k]) & set(found[i, :k])) for i in range(len(truth)))
+    return hits / (len(truth) * k)
+
+
+def bench(name: str, config: IndexConfig, corpus, queries, truth, k: int):
+    start = time.perf_counter()
+    index = build_index(corpus, config)
+    build_time = time.perf_counter() - start
+
+    latencies = []
+    found = np.empty((len(queries), k), dtype="int64")
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, ids = index.search(query.reshape(1, -1), k)
+        latencies.append(time.perf_counter() - start)
+        found[i] = ids[0]
+
+    latencies_ms = np.array(latencies) * 1000
+    print(
+        f"{name:>22} | {build_time:>8.2f}s | {np.percentile(latencies_ms, 50):>8.3f} | "
+        f"{np.percentile(latencies_ms, 99):>8.3f} | {index_bytes(index) / 2**20:>8.1f} | {recall_at_k(truth, found, k):>8.3f}"
+    )
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Compare FAISS index types against the flat baseline")
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.chunks, args.dimension, clusters=max(8, args.chunks // 500))
+    queries = make_queries(corpus, args.queries)
+
+    flat = build_index(corpus, IndexConfig("flat"))
+    _, truth = flat.search(queries, args.k)
+
+    print(f"{args.chunks} chunks x {args.dimension}d, {args.queries} single-query searches, recall@{args.k} vs flat")
+    print(f"{'index':>22} | {'build':>9} | {'p50 ms':>8} | {'p99 ms':>8} | {'MiB':>8} | {'recall':>8}")
+    print("-" * 80)
+
+    bench("flat", IndexConfig("flat"), corpus, queries, truth, args.k)
+    for nprobe in (4, 16, 64):
+        bench(f"ivf_flat nprobe={nprobe}", IndexConfig("ivf_flat", nprobe=nprobe), corpus, queries, truth, args.k)
+    for nprobe in (16, 64):
+        bench(f"ivf_pq nprobe={nprobe}", IndexConfig("ivf_pq", nprobe=nprobe), corpus, queries, truth, args.k)
+    for ef_search in (32, 128):
+        bench(f"hnsw ef={ef_search}", IndexConfig("hnsw", ef_search=ef_search), corpus, queries, truth, args.k)
+
+
+if __name__ == "__main__":
+    run()
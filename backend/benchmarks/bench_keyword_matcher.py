@@ -0,0 +1,67 @@
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.keyword_matcher import KeywordMatcher
+
+KEYWORD_COUNTS = [100, 1_000, 10_000, 100_000]
+QUESTIONS = [
+    "Who are the top sales representatives in North America?",
+    "What is the status of the deal with client 4821 corp?",
+    "Tell me a joke about databases",
+    "Which reps have negotiation and crm skills?",
+]
+
+
+def make_keywords(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    keywords = set()
+    while len(keywords) < count:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        keywords.add(f"{word} corp" if rng.random() < 0.5 else word)
+    keywords.add("client 4821 corp")
+    return list(keywords)
+
+
+def time_per_question(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for question in QUESTIONS:
+            fn(question)
+    return (time.perf_counter() - start) / (repeat * len(QUESTIONS))
+
+
+def run():
+    print(f"{'keywords':>10} | {'build':>9} | {'substring':>11} | {'regex':>11} | {'matcher':>11}")
+    print("-" * 64)
+
+    for count in KEYWORD_COUNTS:
+        keywords = make_keywords(count)
+
+        build_start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        build_time = time.perf_counter() - build_start
+
+        repeat = max(1, 20_000 // count)
+
+        substring_time = time_per_question(
+            lambda q: any(kw in q.lower() for kw in keywords), repeat
+        )
+        regex_time = time_per_question(
+            lambda q: {kw for kw in keywords if re.search(r'\b' + re.escape(kw) + r'\b', q.lower())}, repeat
+        )
+        matcher_time = time_per_question(matcher.find_all, max(repeat, 200))
+
+        print(
+            f"{count:>10} | {build_time * 1000:>7.1f}ms | {substring_time * 1e6:>9.1f}us | "
+            f"{regex_time * 1e6:>9.1f}us | {matcher_time * 1e6:>9.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,55 @@
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import APILogger
+
+
+class LegacyLogger(APILogger):
+    """Previous behaviour: print, then open/append/flush/close the file per event."""
+
+    def log_sync(self, session_id, event_type, duration=None, extra=None):
+        log_entry = self.format_log(session_id, event_type, duration, extra)
+        print(f"🔍 {log_entry.strip()}")
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(log_entry)
+                f.flush()
+        except Exception as e:
+            print(f"Sync logging error: {e}")
+
+
+def bench(name: str, api_logger: APILogger, events: int):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for i in range(events):
+            api_logger.log_sync("a1b2c3d4", "RAG_SEARCH_END", 0.0123, f"Retrieved {i} chars")
+        hot_path = time.perf_counter() - start
+        api_logger.close()
+        total = time.perf_counter() - start
+
+    print(f"{name:>28} | {hot_path / events * 1e6:>10.2f} | {total:>8.3f}s")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Per-event cost of log_sync on the calling thread")
+    parser.add_argument("--events", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{args.events} events, console output to /dev/null")
+    print(f"{'logger':>28} | {'us/event':>10} | {'drained':>9}")
+    print("-" * 54)
+
+    with tempfile.TemporaryDirectory() as directory:
+        bench("legacy (print + open/close)", LegacyLogger(os.path.join(directory, "legacy.txt")), args.events)
+        bench("batched, console INFO", APILogger(os.path.join(directory, "batched.txt")), args.events)
+        bench("batched, console off", APILogger(os.path.join(directory, "quiet.txt"), console_level="NONE"), args.events)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+import main
+from middleware.timing import TimingMiddleware, drain_pending_finishes
+from utils.logger import generate_session_id, TimingContext, logger
+
+PATH = "/api/sales-reps"
+
+
+class LegacyTimingMiddleware(BaseHTTPMiddleware):
+    """Previous behaviour: BaseHTTPMiddleware with an untracked finish task and no status or size."""
+
+    async def dispatch(self, request, call_next):
+        session_id = generate_session_id()
+        timing_context = TimingContext(session_id)
+
+        request.state.session_id = session_id
+        request.state.timing_context = timing_context
+
+        logger.log_sync(session_id, "REQUEST_START", extra=f"{request.method} {request.url.path}")
+
+        response = await call_next(request)
+
+        asyncio.create_task(timing_context.finish_async())
+
+        return response
+
+
+def make_scope():
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": PATH, "raw_path": PATH.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def bench(name: str, middleware_class, requests: int, concurrency: int):
+    """Calls the ASGI app directly so client overhead doesn't swamp the middleware cost."""
+    app = FastAPI(routes=main.app.routes)
+    app.add_middleware(middleware_class)
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    async def worker(count: int):
+        for _ in range(count):
+            await app(make_scope(), receive, send)
+
+    await worker(1)
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(requests // concurrency) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    await drain_pending_finishes()
+    assert set(statuses) == {200}, statuses[:5]
+    completed = requests // concurrency * concurrency
+    print(f"{name:>28} | {completed / elapsed:>10.0f} | {elapsed / completed * 1e6:>10.1f}")
+
+
+async def run_all(requests: int, concurrency: int):
+    print(f"GET {PATH}, {requests} requests, {concurrency} concurrent callers, app called in-process")
+    print(f"{'middleware':>28} | {'req/s':>10} | {'us/req':>10}")
+    print("-" * 54)
+    await bench("BaseHTTPMiddleware (legacy)", LegacyTimingMiddleware, requests, concurrency)
+    await bench("pure ASGI", TimingMiddleware, requests, concurrency)
+    await logger.shutdown()
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Requests/sec through the timing middleware")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    logger.configure(console_level="NONE")
+    asyncio.run(run_all(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,75 @@
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.sales_analytics import SalesAnalytics
+from utils.logger import logger
+
+REGIONS = ["North America", "Europe", "Asia-Pacific", "South America", "Middle East"]
+INDUSTRIES = ["Tech", "Finance", "Retail", "Healthcare", "Energy", "Manufacturing"]
+STATUSES = ["Closed Won", "In Progress", "Closed Lost"]
+
+
+def synthetic_reps(reps: int, deals_per_rep: int, seed: int = 7):
+    rng = random.Random(seed)
+    data = []
+    for rep_id in range(reps):
+        clients = [{"name": f"Client {rep_id}-{i}", "industry": rng.choice(INDUSTRIES)} for i in range(max(1, deals_per_rep // 3))]
+        deals = [{"client": rng.choice(clients)["name"], "value": rng.randrange(5_000, 250_000, 500), "status": rng.choice(STATUSES)}
+                 for _ in range(deals_per_rep)]
+        data.append({"id": rep_id, "name": f"Rep {rep_id}", "region": rng.choice(REGIONS), "clients": clients, "deals": deals})
+    return data
+
+
+def python_closed_won_by_industry(reps):
+    """What answering the question from the nested JSON looks like without the columnar store."""
+    totals = defaultdict(float)
+    for rep in reps:
+        industries = {client["name"]: client["industry"] for client in rep["clients"]}
+        for deal in rep["deals"]:
+            if deal["status"] == "Closed Won":
+                totals[industries.get(deal["client"], "Unknown")] += deal["value"]
+    return totals
+
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Closed-won value by industry: nested-JSON loop vs columnar NumPy store")
+    parser.add_argument("--reps", default="5,100,1000")
+    parser.add_argument("--deals-per-rep", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    logger.configure(console_level="NONE")
+    won = {"status": ["Closed Won"]}
+    print(f"{'reps':>6} | {'deals':>8} | {'build ms':>8} | {'python us':>10} | {'group-by us':>11} | {'top-5 us':>9} | {'speedup':>7}")
+    print("-" * 78)
+    for count in (int(value) for value in args.reps.split(",")):
+        reps = synthetic_reps(count, args.deals_per_rep)
+        start = time.perf_counter()
+        analytics = SalesAnalytics.from_sales_reps(reps)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        expected = python_closed_won_by_industry(reps)
+        assert {group["key"]: group["value"] for group in analytics.group_by("industry", filters=won)} == expected
+
+        python_us = timed(lambda: python_closed_won_by_industry(reps), args.repeats)
+        group_by_us = timed(lambda: analytics.group_by("industry", filters=won), args.repeats)
+        top_us = timed(lambda: analytics.top_k("rep", 5, filters=won), args.repeats)
+        print(f"{count:>6} | {analytics.deal_count:>8} | {build_ms:>8.2f} | {python_us:>10.1f} | {group_by_us:>11.1f} | "
+              f"{top_us:>9.1f} | {python_us / group_by_us:>6.1f}x")
+
+
+if __name__ == "__main__":
+    run()
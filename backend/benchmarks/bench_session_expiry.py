@@ -0,0 +1,80 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.conversation_memory import ConversationExchange, InMemoryBackend
+
+
+class LinearScanBackend(InMemoryBackend):
+    """Previous behaviour: every call scans all session timestamps for expiry."""
+
+    scanning = True
+
+    def expire(self) -> int:
+        if not self.scanning:
+            return 0
+        cutoff = time.monotonic() - self.timeout_seconds
+        expired = [session_id for session_id, timestamp in self.session_last_active.items() if timestamp < cutoff]
+        for session_id in expired:
+            self.delete(session_id)
+        return len(expired)
+
+
+def fill(backend: InMemoryBackend, sessions: int, exchanges_per_session: int):
+    timestamp = datetime.now() - timedelta(seconds=1)
+    for i in range(sessions):
+        session_id = f"session-{i}"
+        for j in range(exchanges_per_session):
+            backend.append(session_id, ConversationExchange(f"question {j}", f"answer {j}", timestamp))
+
+
+def per_call_us(backend: InMemoryBackend, sessions: int, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        session_id = f"session-{(i * 7919) % sessions}"
+        backend.has_session(session_id)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Per-call cost of in-memory session lookups as live sessions grow")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--exchanges", type=int, default=3)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--linear-max", type=int, default=100_000, help="Largest size to run the linear-scan baseline at")
+    args = parser.parse_args()
+
+    print(f"has_session() with {args.exchanges} exchanges per live session")
+    print(f"{'sessions':>10} | {'ordered us/call':>15} | {'linear us/call':>14} | {'bytes/session':>13}")
+    print("-" * 62)
+
+    for size in args.sizes:
+        gc.collect()
+        tracemalloc.start()
+        backend = InMemoryBackend()
+        fill(backend, size, args.exchanges)
+        bytes_per_session = tracemalloc.get_traced_memory()[0] / size
+        tracemalloc.stop()
+        ordered = per_call_us(backend, size, args.calls)
+        del backend
+
+        linear = "-"
+        if size <= args.linear_max:
+            baseline = LinearScanBackend()
+            baseline.scanning = False
+            fill(baseline, size, args.exchanges)
+            baseline.scanning = True
+            linear = f"{per_call_us(baseline, size, max(10, args.calls * 1000 // size // 100)):.1f}"
+            del baseline
+
+        print(f"{size:>10} | {ordered:>15.2f} | {linear:>14} | {bytes_per_session:>13.0f}")
+
+
+if __name__ == "__main__":
+    run()
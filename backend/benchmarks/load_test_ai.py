@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+os.environ.setdefault("OPENAI_API_KEY", "sk-load-test")
+# Measure LLM concurrency, not caching: every request should reach the router and chat chains.
+os.environ.setdefault("SEMANTIC_CACHE_ENABLED", "false")
+os.environ.setdefault("LOCAL_ROUTER_ENABLED", "false")
+
+import httpx
+from langchain_core.messages import AIMessage
+
+import main
+
+LLM_LATENCY = 0.2
+REQUESTS = 32
+LIMITS = [1, 4, 16]
+QUESTION = "What is a good way to start presentation #{}?"
+
+
+class StubChain:
+    """Stands in for a prompt | ChatOpenAI chain with a fixed completion latency."""
+
+    def __init__(self, reply: str, latency: float, blocking: bool = False):
+        self.reply = reply
+        self.latency = latency
+        self.blocking = blocking
+
+    def invoke(self, inputs):
+        time.sleep(self.latency)
+        return AIMessage(content=self.reply)
+
+    async def ainvoke(self, inputs):
+        if self.blocking:
+            return self.invoke(inputs)
+        await asyncio.sleep(self.latency)
+        return AIMessage(content=self.reply)
+
+
+def install_stubs(limit: int, blocking: bool = False):
+    main.ai_router.router_chain = StubChain("general", LLM_LATENCY, blocking)
+    main.chat_service.chat_chain = StubChain("Stubbed answer.", LLM_LATENCY, blocking)
+    main.rag_service.rag_chain = StubChain("Stubbed sales answer.", LLM_LATENCY, blocking)
+
+    main.ai_router.llm_semaphore = asyncio.Semaphore(limit)
+    main.chat_service.llm_semaphore = asyncio.Semaphore(limit)
+    main.rag_service.llm_semaphore = asyncio.Semaphore(limit)
+
+
+def cache_hits() -> int:
+    return main.semantic_cache.hits if main.semantic_cache is not None else 0
+
+
+async def run_load(limit: int, blocking: bool = False):
+    install_stubs(limit, blocking)
+    hits_before = cache_hits()
+    transport = httpx.ASGITransport(app=main.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            # Distinct questions, so a cache left enabled via the environment can't answer repeats.
+            client.post("/api/ai", json={"question": QUESTION.format(i)}) for i in range(REQUESTS)
+        ])
+        elapsed = time.perf_counter() - start
+
+    failures = [r for r in responses if r.status_code != 200]
+    if failures:
+        raise RuntimeError(f"{len(failures)} requests failed: {failures[0].text}")
+
+    return REQUESTS / elapsed, cache_hits() - hits_before
+
+
+async def run():
+    await main.require_services()
+    print(f"{REQUESTS} concurrent /api/ai requests, stub LLM latency {LLM_LATENCY * 1000:.0f}ms per call (router + chat)")
+    print(f"Semantic cache: {'enabled' if main.semantic_cache is not None else 'disabled'} | "
+          f"local router: {'enabled' if main.ai_router.local_router is not None else 'disabled'}")
+    print(f"{'mode':>22} | {'req/s':>8} | {'cache hits':>10}")
+    print("-" * 47)
+
+    throughput, hits = await run_load(limit=16, blocking=True)
+    print(f"{'blocking invoke':>22} | {throughput:>8.2f} | {hits:>10}")
+
+    for limit in LIMITS:
+        throughput, hits = await run_load(limit)
+        print(f"{f'ainvoke, limit={limit}':>22} | {throughput:>8.2f} | {hits:>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
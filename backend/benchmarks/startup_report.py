@@ -0,0 +1,58 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+HEAVY_MODULES = ("faiss", "sentence_transformers", "torch", "langchain", "langchain_openai")
+
+
+def import_profile():
+    """Import main in a fresh interpreter with -X importtime; returns (total_us, {module: (self_us, cumulative_us)})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules.get("main", (0, 0))[1], modules
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Report import time of main and service warmup time")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--skip-warmup", action="store_true", help="Only profile imports (no OPENAI_API_KEY needed)")
+    args = parser.parse_args()
+
+    total_us, modules = import_profile()
+    print(f"import main: {total_us / 1e6:.3f}s")
+    loaded_heavy = [name for name in HEAVY_MODULES if name in modules]
+    print(f"heavy modules imported by main: {', '.join(loaded_heavy) if loaded_heavy else 'none'}")
+    print(f"\n{'module':<50} | {'cumulative':>10}")
+    print("-" * 64)
+    top_level = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (_, cumulative_us) in top_level[1:args.top + 1]:
+        print(f"{name:<50} | {cumulative_us / 1e6:>9.3f}s")
+
+    if args.skip_warmup:
+        return
+
+    os.chdir(BACKEND_DIR)
+    import main
+
+    start = time.perf_counter()
+    main.initialize_server(main.data_service)
+    print(f"\nwarmup: {time.perf_counter() - start:.3f}s")
+    for name, duration in main.startup_report["phases"].items():
+        print(f"  {name:<20} {duration:>8.3f}s")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,23 +1,88 @@
-from fastapi import FastAPI, Request, HTTPException
+import time
+IMPORT_STARTED_AT = time.perf_counter()
+
+from fastapi import FastAPI, Request, HTTPException, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from middleware.timing import TimingMiddleware
-from services.ai_router import AIRouter
-from services.rag_service import RAGService
-from services.chat_service import ChatService
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
+from middleware.timing import TimingMiddleware, drain_pending_finishes
 from services.data_service import DataService
 from services.conversation_memory import conversation_memory
-from models.schemas import QuestionRequest, AIResponse, RouteType
+from models.schemas import QuestionRequest, AIResponse, RouteType, RouteDecision, BatchQuestionRequest, BatchItemResponse, BatchAIResponse
 from utils.logger import logger
+from utils.metrics import metrics, CACHE_LOOKUPS, ROUTE_DECISIONS
+from utils.tracing import tracer, span
+from contextlib import asynccontextmanager, contextmanager
 import uvicorn
+import json
+import hmac
 import os
-import time
 import asyncio
+from typing import List, Optional, Sequence
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger.configure(
+    console_level=os.getenv("LOG_CONSOLE_LEVEL", "INFO"),
+    buffer_size=int(os.getenv("LOG_BUFFER_SIZE", "65536")),
+    max_bytes=int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024))),
+    backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5"))
+)
+
+tracer.configure(
+    output_dir=os.getenv("TRACE_DIR", ""),
+    sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "0.01")),
+    slow_threshold_seconds=float(os.getenv("TRACE_SLOW_SECONDS", "2.0"))
+)
+
+SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "true").lower() in ("1", "true", "yes")
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LOCAL_ROUTER_ENABLED = os.getenv("LOCAL_ROUTER_ENABLED", "true").lower() in ("1", "true", "yes")
+DATA_WATCH_INTERVAL_SECONDS = float(os.getenv("DATA_WATCH_INTERVAL_SECONDS", "5"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+CONVERSATION_BACKEND = os.getenv("CONVERSATION_BACKEND", "memory").lower()
+CONVERSATION_SWEEP_INTERVAL_SECONDS = float(os.getenv("CONVERSATION_SWEEP_INTERVAL_SECONDS", "60"))
+EMBEDDING_BATCHING = os.getenv("EMBEDDING_BATCHING", "true").lower() in ("1", "true", "yes")
+BATCH_MAX_QUESTIONS = int(os.getenv("BATCH_MAX_QUESTIONS", "50"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+def configure_conversation_memory():
+    """Use the SQLite backend when several workers or containers must share sessions."""
+    if CONVERSATION_BACKEND == "sqlite":
+        from services.sqlite_memory import SQLiteMemoryBackend
+        conversation_memory.set_backend(SQLiteMemoryBackend(
+            os.getenv("CONVERSATION_DB_PATH", "conversations.db"),
+            max_exchanges=conversation_memory.max_exchanges,
+            session_timeout_minutes=conversation_memory.timeout_minutes,
+            flush_interval_seconds=float(os.getenv("CONVERSATION_FLUSH_INTERVAL_SECONDS", "0.05")),
+            batch_size=int(os.getenv("CONVERSATION_BATCH_SIZE", "256"))
+        ))
+    elif CONVERSATION_BACKEND != "memory":
+        raise RuntimeError(f"Unknown CONVERSATION_BACKEND '{CONVERSATION_BACKEND}', expected 'memory' or 'sqlite'")
+    logger.log_sync("SERVER", "CONVERSATION_BACKEND", extra=f"Conversation memory: {CONVERSATION_BACKEND}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_conversation_memory()
+    if CONVERSATION_SWEEP_INTERVAL_SECONDS > 0:
+        conversation_memory.start_sweeper(CONVERSATION_SWEEP_INTERVAL_SECONDS)
+    start_warmup()
+    yield
+    logger.log_sync("SERVER", "SHUTDOWN_BEGIN", extra="Fitra Portofolio API Server shutting down")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    if reload_service is not None:
+        await reload_service.stop_watching()
+    await conversation_memory.stop_sweeper()
+    if EMBEDDING_BATCHING and rag_service is not None:
+        rag_service.embedding_model.close()
+    conversation_memory.close()
+    await drain_pending_finishes()
+    await logger.shutdown()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Fitra Portofolio API",
     description="AI-powered sales assistant with modular architecture and intelligent routing",
     version="2.0.0",
@@ -44,7 +109,19 @@ app.add_middleware(
 if os.path.exists("images"):
     app.mount("/images", StaticFiles(directory="images"), name="images")
 
-def initialize_server():
+startup_report = {"import_seconds": None, "warmup_seconds": None, "phases": {}}
+
+@contextmanager
+def startup_phase(name: str):
+    phase_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - phase_start
+        startup_report["phases"][name] = round(duration, 3)
+        logger.log_sync("SERVER", "STARTUP_PHASE", duration, name)
+
+def initialize_server(data_service: DataService):
     logger.log_sync("SERVER", "STARTUP_BEGIN", extra="Initializing Fitra Portofolio API Server v2.0")
     
     python_version = f"{os.sys.version_info.major}.{os.sys.version_info.minor}.{os.sys.version_info.micro}"
@@ -57,7 +134,29 @@ def initialize_server():
     
     logger.log_sync("SERVER", "CONFIG_SUCCESS", extra="OPENAI_API_KEY loaded")
     
-    data_service = DataService()
+    # faiss, sentence_transformers and langchain are only imported here so that
+    # importing main (tests, uvicorn reload) stays cheap.
+    with startup_phase("imports"):
+        from services.ai_router import AIRouter
+        from services.rag_service import RAGService
+        from services.chat_service import ChatService
+        from services.keyword_matcher import KeywordMatcher
+        from services.retrieval_cache import RetrievalCache
+        from services.semantic_cache import SemanticCache
+        from services.local_router import LocalRouter
+        from services.embedding_store import EmbeddingStore
+        from services.vector_index import IndexConfig
+        from services.reload_service import ReloadService
+        from services.prompt_packer import PromptPacker, RouteBudget
+        from services.embedding_batcher import EmbeddingBatcher
+        from services.embedding_backend import create_embedding_backend
+    
+    router_max_concurrency = int(os.getenv("ROUTER_MAX_CONCURRENCY", "16"))
+    rag_max_concurrency = int(os.getenv("RAG_MAX_CONCURRENCY", "16"))
+    chat_max_concurrency = int(os.getenv("CHAT_MAX_CONCURRENCY", "16"))
+    logger.log_sync("SERVER", "SPECULATIVE_CONFIG", extra=f"Speculative retrieval: {'enabled' if SPECULATIVE_RETRIEVAL else 'disabled'}")
+    logger.log_sync("SERVER", "CONCURRENCY_CONFIG", extra=f"Router: {router_max_concurrency} | RAG: {rag_max_concurrency} | Chat: {chat_max_concurrency}")
+    
     sales_data = data_service.get_sales_data()
     
     def load_system_instruction():
@@ -69,16 +168,199 @@ def initialize_server():
     
     system_instruction = load_system_instruction()
     
-    ai_router = AIRouter(OPENAI_API_KEY, sales_data)
-    rag_service = RAGService(OPENAI_API_KEY, sales_data)
-    chat_service = ChatService(OPENAI_API_KEY, system_instruction)
+    with startup_phase("keyword_matcher"):
+        keyword_matcher = KeywordMatcher.from_sales_data(sales_data)
+    
+    retrieval_cache = RetrievalCache(
+        max_size=int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024")),
+        ttl_seconds=float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "600"))
+    )
+    embedding_cache_dir = os.getenv("EMBEDDING_CACHE_DIR", "embedding_cache")
+    embedding_store = EmbeddingStore(embedding_cache_dir) if embedding_cache_dir else None
+    index_config = IndexConfig(
+        index_type=os.getenv("FAISS_INDEX_TYPE", "flat"),
+        nlist=int(os.getenv("FAISS_NLIST", "256")),
+        nprobe=int(os.getenv("FAISS_NPROBE", "16")),
+        pq_m=int(os.getenv("FAISS_PQ_M", "48")),
+        pq_bits=int(os.getenv("FAISS_PQ_BITS", "8")),
+        hnsw_m=int(os.getenv("FAISS_HNSW_M", "32")),
+        ef_construction=int(os.getenv("FAISS_EF_CONSTRUCTION", "200")),
+        ef_search=int(os.getenv("FAISS_EF_SEARCH", "64"))
+    )
+    logger.log_sync("SERVER", "INDEX_CONFIG", extra=f"FAISS index: {index_config.spec()}")
+    
+    with startup_phase("prompt_packer"):
+        prompt_packer = PromptPacker(budgets={
+            "router": RouteBudget(history_tokens=int(os.getenv("PROMPT_ROUTER_HISTORY_TOKENS", "300"))),
+            "sales": RouteBudget(
+                history_tokens=int(os.getenv("PROMPT_SALES_HISTORY_TOKENS", "600")),
+                sales_data_tokens=int(os.getenv("PROMPT_SALES_DATA_TOKENS", "750"))
+            ),
+            "general": RouteBudget(history_tokens=int(os.getenv("PROMPT_GENERAL_HISTORY_TOKENS", "1200")))
+        })
+    
+    with startup_phase("embedding_backend"):
+        embedding_backend = create_embedding_backend(
+            os.getenv("EMBEDDING_BACKEND", "fp32"),
+            os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        )
+    
+    with startup_phase("rag_service"):
+        rag_service = RAGService(
+            OPENAI_API_KEY, sales_data, keyword_matcher, max_concurrency=rag_max_concurrency,
+            retrieval_cache=retrieval_cache, embedding_store=embedding_store, index_config=index_config,
+            prompt_packer=prompt_packer, embedding_backend=embedding_backend,
+            sales_analytics=get_sales_analytics_service()
+        )
+    data_service.add_reload_listener(lambda _: retrieval_cache.clear())
+    
+    if EMBEDDING_BATCHING:
+        # Everything below embeds queries through rag_service.embedding_model, so wrap it once here.
+        rag_service.embedding_model = EmbeddingBatcher(
+            rag_service.embedding_model,
+            max_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+            max_wait_ms=float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "2"))
+        )
+    logger.log_sync("SERVER", "EMBEDDING_BATCHING_CONFIG", extra=f"Query encode batching: {'enabled' if EMBEDDING_BATCHING else 'disabled'}")
+    
+    local_router = None
+    if LOCAL_ROUTER_ENABLED:
+        with startup_phase("local_router"):
+            local_router = LocalRouter(
+                rag_service.embedding_model, rag_service.sales_embeddings, k=int(os.getenv("LOCAL_ROUTER_K", "7")),
+                embedding_store=embedding_store, model_name=rag_service.embedding_model_name
+            )
+    
+    with startup_phase("ai_router"):
+        ai_router = AIRouter(
+            OPENAI_API_KEY, sales_data, keyword_matcher, max_concurrency=router_max_concurrency,
+            local_router=local_router,
+            local_general_threshold=float(os.getenv("LOCAL_ROUTER_GENERAL_THRESHOLD", "0.35")),
+            local_sales_threshold=float(os.getenv("LOCAL_ROUTER_SALES_THRESHOLD", "0.65")),
+            prompt_packer=prompt_packer
+        )
+    
+    semantic_cache = None
+    if SEMANTIC_CACHE_ENABLED:
+        semantic_cache = SemanticCache(
+            rag_service.embedding_model,
+            similarity_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9")),
+            max_size=int(os.getenv("SEMANTIC_CACHE_SIZE", "512")),
+            ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "900")),
+            keyword_matcher=keyword_matcher
+        )
+        # The reload service hands ai_router the new matcher before it commits the data.
+        data_service.add_reload_listener(lambda _: semantic_cache.apply_keyword_matcher(ai_router.keyword_matcher))
+    logger.log_sync("SERVER", "SEMANTIC_CACHE_CONFIG", extra=f"Semantic cache: {'enabled' if semantic_cache is not None else 'disabled'}")
+    
+    with startup_phase("chat_service"):
+        chat_service = ChatService(OPENAI_API_KEY, system_instruction, max_concurrency=chat_max_concurrency, prompt_packer=prompt_packer)
+    
+    reload_service = ReloadService(data_service, ai_router, rag_service, local_router)
     
     logger.log_sync("SERVER", "SERVICES_INITIALIZED", extra="All services ready")
-    logger.log_sync("SERVER", "STARTUP_COMPLETE", extra="Fitra Portofolio API Server v2.0 ready")
     
-    return ai_router, rag_service, chat_service, data_service
+    return ai_router, rag_service, chat_service, semantic_cache, reload_service
+
+data_service = DataService()
+ai_router = rag_service = chat_service = semantic_cache = reload_service = None
+sales_analytics_service = None
+services_ready = False
+warmup_task: Optional[asyncio.Task] = None
+warmup_error: Optional[str] = None
+
+async def warmup():
+    global ai_router, rag_service, chat_service, semantic_cache, reload_service, services_ready, warmup_error
+    warmup_start = time.perf_counter()
+    warmup_error = None
+    
+    try:
+        services = await asyncio.to_thread(initialize_server, data_service)
+    except Exception as e:
+        warmup_error = str(e)
+        logger.log_sync("SERVER", "STARTUP_FAILED", time.perf_counter() - warmup_start, f"Error: {warmup_error}")
+        raise
+    
+    ai_router, rag_service, chat_service, semantic_cache, reload_service = services
+    services_ready = True
+    
+    warmup_duration = time.perf_counter() - warmup_start
+    startup_report["warmup_seconds"] = round(warmup_duration, 3)
+    phases = " | ".join(f"{name}: {duration:.3f}s" for name, duration in startup_report["phases"].items())
+    logger.log_sync("SERVER", "STARTUP_COMPLETE", warmup_duration, f"Fitra Portofolio API Server v2.0 ready | {phases}")
+    
+    if DATA_WATCH_INTERVAL_SECONDS > 0:
+        reload_service.start_watching(DATA_WATCH_INTERVAL_SECONDS)
+
+def start_warmup() -> asyncio.Task:
+    """Start service warmup once; a failed warmup is retried by the next caller."""
+    global warmup_task
+    if warmup_task is None or (warmup_task.done() and not services_ready):
+        warmup_task = asyncio.get_running_loop().create_task(warmup())
+        warmup_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+    return warmup_task
+
+async def require_services():
+    """Wait for warmup, starting it lazily when the app runs without lifespan events."""
+    if services_ready:
+        return
+    try:
+        await asyncio.shield(start_warmup())
+    except Exception:
+        raise HTTPException(status_code=503, detail="AI services are unavailable. Please try again later.")
+
+def get_sales_analytics_service():
+    """Created on first use so importing main doesn't pull in numpy; needs no warmup."""
+    global sales_analytics_service
+    if sales_analytics_service is None:
+        from services.sales_analytics import SalesAnalyticsService
+        sales_analytics_service = SalesAnalyticsService(data_service)
+    return sales_analytics_service
+
+startup_report["import_seconds"] = round(time.perf_counter() - IMPORT_STARTED_AT, 3)
+logger.log_sync("SERVER", "IMPORT_COMPLETE", startup_report["import_seconds"], "main imported, services warm up in the background")
+
+api_health_doc = """
+Liveness probe. Returns `200 OK` as soon as the process serves HTTP, even while
+services are still warming up.
+"""
+
+@app.get("/health", summary="Liveness Check", tags=["Monitoring"], description=api_health_doc)
+async def health():
+    return {"status": "ok"}
+
+api_ready_doc = """
+Readiness probe. Returns `503 Service Unavailable` until the embedding model,
+vector index and LLM clients are initialized, then `200 OK`.
+
+**Example Response:**
+```json
+{
+    "status": "ready",
+    "startup": {
+        "import_seconds": 0.412,
+        "warmup_seconds": 3.871,
+        "phases": {"imports": 2.104, "rag_service": 1.322, "local_router": 0.018}
+    }
+}
+```
+"""
 
-ai_router, rag_service, chat_service, data_service = initialize_server()
+@app.get("/ready", summary="Readiness Check", tags=["Monitoring"], description=api_ready_doc)
+async def ready():
+    if services_ready:
+        status = "ready"
+    elif warmup_error is not None:
+        status = "failed"
+    elif warmup_task is not None:
+        status = "warming_up"
+    else:
+        status = "not_started"
+    
+    body = {"status": status, "startup": startup_report}
+    if warmup_error is not None and not services_ready:
+        body["error"] = warmup_error
+    return JSONResponse(status_code=200 if services_ready else 503, content=body)
 
 api_sales_reps_doc = """
 Retrieve sales representatives data.
@@ -101,6 +383,22 @@ Retrieve sales representatives data.
 ```
 """
 
+api_metrics_doc = """
+Prometheus metrics in the text exposition format.
+
+Available before warmup completes. Series:
+- `http_request_duration_seconds{path,method}` - total request time, labelled by route template
+- `routing_duration_seconds{method}` - keyword, local and llm routing latency
+- `retrieval_duration_seconds{source}` - sales data retrieval by cache, entity_index or faiss
+- `llm_generation_duration_seconds{service,mode}` - rag/chat generation, invoke or stream
+- `route_decisions_total{route,method}` - routed questions by route type and deciding method
+- `cache_lookups_total{cache,result}` - semantic and retrieval cache hits and misses
+"""
+
+@app.get("/metrics", summary="Prometheus Metrics", tags=["Monitoring"], description=api_metrics_doc)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/sales-reps", summary="Get Sales Representatives", tags=["Sales Data"], description=api_sales_reps_doc)
 async def get_sales_reps(request: Request):
     timing_context = request.state.timing_context
@@ -108,6 +406,134 @@ async def get_sales_reps(request: Request):
     
     return data_service.get_sales_data()
 
+api_sales_analytics_doc = """
+Exact aggregates over every deal, computed on a columnar in-memory store.
+
+Available before warmup completes and rebuilt automatically after a data
+reload. Aggregates are vectorized over NumPy columns, so a query takes
+microseconds regardless of how the deals are spread across reps.
+
+**Endpoints:**
+- `GET /api/sales/analytics/summary` - deal count, total and average value, totals by status
+- `GET /api/sales/analytics/group-by` - one row per `dimension` value with the chosen `metric`
+- `GET /api/sales/analytics/top` - the `k` `dimension` values with the largest `metric`
+
+**Query Parameters:**
+- `dimension` (str): `rep`, `region`, `status`, `industry` or `client`
+- `metric` (str): `sum`, `count`, `mean` or `max` of deal value (default `sum`)
+- `status`, `region`, `industry`, `rep`, `client` (str): comma-separated filter values, case-insensitive
+- `min_value`, `max_value` (float): deal value bounds
+- `k` (int): number of groups for `/top` (default 5)
+
+**Responses:**
+- `200 OK`: Aggregates as JSON
+- `400 Bad Request`: Unknown dimension or metric
+
+**Example Request:**
+`GET /api/sales/analytics/group-by?dimension=region&status=Closed%20Won`
+
+**Example Response:**
+```json
+{
+    "dimension": "region",
+    "metric": "sum",
+    "groups": [
+        {"key": "North America", "value": 120000.0, "deals": 1},
+        {"key": "Europe", "value": 90000.0, "deals": 1}
+    ]
+}
+```
+"""
+
+def analytics_filters(status: Optional[str], region: Optional[str], industry: Optional[str], rep: Optional[str], client: Optional[str]):
+    filters = {"status": status, "region": region, "industry": industry, "rep": rep, "client": client}
+    return {dimension: [value.strip() for value in values.split(",") if value.strip()] for dimension, values in filters.items() if values}
+
+def run_analytics(request: Request, description: str, query):
+    timing_context = request.state.timing_context
+    start_time = time.perf_counter()
+    try:
+        with span("analytics.query", "analytics"):
+            result = query(get_sales_analytics_service().current())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    timing_context.log_event("ANALYTICS_QUERY", f"{description} | {(time.perf_counter() - start_time) * 1000:.3f}ms")
+    return result
+
+@app.get("/api/sales/analytics/summary", summary="Sales Analytics Summary", tags=["Sales Data"], description=api_sales_analytics_doc)
+async def sales_analytics_summary(
+    request: Request, status: Optional[str] = None, region: Optional[str] = None, industry: Optional[str] = None,
+    rep: Optional[str] = None, client: Optional[str] = None, min_value: Optional[float] = None, max_value: Optional[float] = None
+):
+    filters = analytics_filters(status, region, industry, rep, client)
+    return run_analytics(request, "summary", lambda analytics: analytics.summary(filters, min_value, max_value))
+
+@app.get("/api/sales/analytics/group-by", summary="Sales Analytics Group-By", tags=["Sales Data"], description=api_sales_analytics_doc)
+async def sales_analytics_group_by(
+    request: Request, dimension: str, metric: str = "sum", status: Optional[str] = None, region: Optional[str] = None,
+    industry: Optional[str] = None, rep: Optional[str] = None, client: Optional[str] = None,
+    min_value: Optional[float] = None, max_value: Optional[float] = None
+):
+    filters = analytics_filters(status, region, industry, rep, client)
+    groups = run_analytics(
+        request, f"group-by {dimension} {metric}",
+        lambda analytics: analytics.group_by(dimension, metric, filters, min_value, max_value)
+    )
+    return {"dimension": dimension, "metric": metric, "groups": groups}
+
+@app.get("/api/sales/analytics/top", summary="Sales Analytics Top-K", tags=["Sales Data"], description=api_sales_analytics_doc)
+async def sales_analytics_top(
+    request: Request, dimension: str, metric: str = "sum", k: int = Query(default=5, ge=1, le=100),
+    status: Optional[str] = None, region: Optional[str] = None, industry: Optional[str] = None,
+    rep: Optional[str] = None, client: Optional[str] = None, min_value: Optional[float] = None, max_value: Optional[float] = None
+):
+    filters = analytics_filters(status, region, industry, rep, client)
+    groups = run_analytics(
+        request, f"top {k} {dimension} {metric}",
+        lambda analytics: analytics.top_k(dimension, k, metric, filters, min_value, max_value)
+    )
+    return {"dimension": dimension, "metric": metric, "k": k, "groups": groups}
+
+api_cache_stats_doc = """
+Counters for the caches and the query encode batcher. Waits for warmup.
+
+**Response:**
+- `retrieval`: retrieved sales data per question (`RETRIEVAL_CACHE_SIZE`, `RETRIEVAL_CACHE_TTL_SECONDS`)
+- `semantic`: answers keyed by question similarity, or `null` when `SEMANTIC_CACHE_ENABLED` is off
+- `embedding_batcher`: micro-batched query encodes, or `null` when `EMBEDDING_BATCHING` is off
+
+**Cache Fields:**
+- `size` / `max_size`: current and maximum number of entries
+- `ttl_seconds`: entry lifetime
+- `hits`, `misses`, `hit_rate`: lookups since startup; `hit_rate` is `hits / (hits + misses)`
+- `evictions`: entries dropped to stay within `max_size`
+- `expirations`: entries dropped after `ttl_seconds`
+- `invalidations`: full clears, e.g. after a sales data reload
+- `similarity_threshold` (semantic only): minimum cosine similarity for a hit
+
+**Batcher Fields:**
+- `batches`, `items`, `mean_batch_size`: model calls made, questions encoded and their ratio
+- `max_batch_size`, `max_wait_ms`: batching limits
+
+**Example Response:**
+```json
+{
+    "retrieval": {"size": 42, "max_size": 1024, "ttl_seconds": 600.0, "hits": 17, "misses": 42, "hit_rate": 0.2881, "evictions": 0, "expirations": 3, "invalidations": 1},
+    "semantic": {"size": 30, "max_size": 512, "ttl_seconds": 900.0, "similarity_threshold": 0.9, "hits": 9, "misses": 30, "hit_rate": 0.2308, "evictions": 0, "expirations": 0, "invalidations": 1},
+    "embedding_batcher": {"batches": 51, "items": 88, "mean_batch_size": 1.73, "max_batch_size": 32, "max_wait_ms": 2.0}
+}
+```
+"""
+
+@app.get("/api/cache/stats", summary="Get Cache Statistics", tags=["Monitoring"], description=api_cache_stats_doc)
+async def cache_stats():
+    await require_services()
+    return {
+        "retrieval": rag_service.retrieval_cache.stats(),
+        "semantic": semantic_cache.stats() if semantic_cache is not None else None,
+        "embedding_batcher": rag_service.embedding_model.stats() if EMBEDDING_BATCHING else None
+    }
+
 api_ai_doc = """
 AI-powered question answering with intelligent routing.
 
@@ -124,6 +550,7 @@ AI-powered question answering with intelligent routing.
 - `200 OK`: AI-generated answer with metadata
 - `400 Bad Request`: Empty question
 - `500 Internal Server Error`: Processing error
+- `503 Service Unavailable`: AI services failed to initialize
 
 **Example Request:**
 ```json
@@ -188,6 +615,96 @@ async def conversation_status(request: Request):
         "timeout_minutes": 30
     }
 
+async def lookup_semantic_cache(question: str, session_id: str, conversation_history: Sequence[str], question_embedding=None):
+    if semantic_cache is None or conversation_history:
+        return None, None
+    with span("semantic_cache.lookup", "cache"):
+        cached_answer, question_embedding = await asyncio.to_thread(semantic_cache.lookup, question, session_id, question_embedding)
+    if cached_answer is not None:
+        CACHE_LOOKUPS.inc("semantic", "hit")
+        ROUTE_DECISIONS.inc(cached_answer.route_type, "semantic_cache")
+    else:
+        CACHE_LOOKUPS.inc("semantic", "miss")
+    return cached_answer, question_embedding
+
+async def lookup_semantic_cache_batch(questions: List[str], session_id: str, embeddings):
+    if semantic_cache is None or not questions:
+        return [None] * len(questions)
+    with span("semantic_cache.lookup", "cache", size=len(questions)):
+        cached_answers = await asyncio.to_thread(semantic_cache.lookup_batch, questions, session_id, embeddings)
+    for cached_answer in cached_answers:
+        if cached_answer is not None:
+            CACHE_LOOKUPS.inc("semantic", "hit")
+            ROUTE_DECISIONS.inc(cached_answer.route_type, "semantic_cache")
+        else:
+            CACHE_LOOKUPS.inc("semantic", "miss")
+    return cached_answers
+
+def store_semantic_cache(question: str, answer: str, route_type: RouteType, question_embedding):
+    if semantic_cache is not None and question_embedding is not None:
+        semantic_cache.store(question, answer, route_type.value, question_embedding)
+
+async def prefetch_sales_data(route_decision: RouteDecision, question: str, session_id: str, question_embedding):
+    """Retrieve now for a sales decision when the question is already embedded, instead of encoding it again later."""
+    if route_decision.route_type != RouteType.SALES or question_embedding is None:
+        return None
+    return await rag_service.retrieve(question, session_id, question_embedding)
+
+async def route_with_speculation(question: str, session_id: str, conversation_history: Sequence[str], question_embedding=None):
+    """Route a question, overlapping sales retrieval with the router LLM call when enabled.
+
+    The keyword matcher and local classifier run first; only questions they
+    cannot decide reach the router LLM. ``question_embedding`` (from the
+    semantic cache lookup, or encoded here for the local classifier) is shared
+    with retrieval, so a question is embedded at most once.
+
+    Returns ``(route_decision, sales_data)``; ``sales_data`` is ``None`` when it
+    was not prefetched and the RAG service should retrieve it.
+    """
+    keyword_decision = ai_router.keyword_route(question, session_id)
+    if keyword_decision is not None:
+        return keyword_decision, None
+    
+    if question_embedding is None and ai_router.local_router is not None:
+        question_embedding = await asyncio.to_thread(rag_service.encode_questions, [question])
+    
+    local_decision = await ai_router.local_route(question, session_id, question_embedding)
+    if local_decision is not None:
+        return local_decision, await prefetch_sales_data(local_decision, question, session_id, question_embedding)
+    
+    if not SPECULATIVE_RETRIEVAL:
+        route_decision = await ai_router.llm_route(question, session_id, conversation_history)
+        return route_decision, await prefetch_sales_data(route_decision, question, session_id, question_embedding)
+    
+    speculative_start = time.time()
+    
+    async def timed_retrieval():
+        sales_data = await rag_service.retrieve(question, session_id, question_embedding)
+        return sales_data, time.time()
+    
+    retrieval_task = asyncio.create_task(timed_retrieval())
+    retrieval_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+    
+    try:
+        route_decision = await ai_router.llm_route(question, session_id, conversation_history)
+    except BaseException:
+        retrieval_task.cancel()
+        raise
+    
+    router_end = time.time()
+    
+    if route_decision.route_type != RouteType.SALES:
+        retrieval_task.cancel()
+        logger.log_sync(session_id, "SPECULATIVE_DISCARDED", router_end - speculative_start, "General route, retrieval discarded")
+        return route_decision, None
+    
+    sales_data, retrieval_end = await retrieval_task
+    saved = min(retrieval_end, router_end) - speculative_start
+    waited = max(0.0, retrieval_end - router_end)
+    logger.log_sync(session_id, "SPECULATIVE_HIT", saved, f"Overlap saved {saved:.3f}s | Waited {waited:.3f}s after routing")
+    
+    return route_decision, sales_data
+
 @app.post("/api/ai", summary="AI Question Answering", tags=["AI"], description=api_ai_doc)
 async def ai_endpoint(request: Request, question_request: QuestionRequest):
     timing_context = request.state.timing_context
@@ -200,22 +717,38 @@ async def ai_endpoint(request: Request, question_request: QuestionRequest):
         timing_context.log_event("ERROR", "Empty question provided")
         raise HTTPException(status_code=400, detail="The 'question' field cannot be empty.")
 
+    await require_services()
+    
     try:
         total_start_time = time.time()
         
-        route_decision = await ai_router.route_question(question, session_id)
+        conversation_history = await conversation_memory.get_conversation_exchanges(session_id)
+        cached_answer, question_embedding = await lookup_semantic_cache(question, session_id, conversation_history)
+        if cached_answer is not None:
+            timing_context.log_event("ROUTE_DECISION", "SEMANTIC_CACHE_HIT")
+            timing_context.log_response_ready(len(cached_answer.answer))
+            await conversation_memory.add_exchange(session_id, question, cached_answer.answer)
+            
+            return AIResponse(
+                answer=cached_answer.answer,
+                route_type=cached_answer.route_type,
+                processing_time=round(time.time() - total_start_time, 3)
+            )
+        
+        route_decision, sales_data = await route_with_speculation(question, session_id, conversation_history, question_embedding)
         
         if route_decision.route_type == RouteType.SALES:
             timing_context.log_event("ROUTE_DECISION", "SALES_RAG_PATH")
-            answer = await rag_service.process_sales_question(question, session_id)
+            answer = await rag_service.process_sales_question(question, session_id, sales_data, conversation_history)
         else:
             timing_context.log_event("ROUTE_DECISION", "GENERAL_CHAT_PATH")
-            answer = await chat_service.process_general_question(question, session_id)
+            answer = await chat_service.process_general_question(question, session_id, conversation_history)
         
         total_duration = time.time() - total_start_time
         timing_context.log_response_ready(len(answer))
         
         await conversation_memory.add_exchange(session_id, question, answer)
+        store_semantic_cache(question, answer, route_decision.route_type, question_embedding)
         
         response = AIResponse(
             answer=answer,
@@ -229,9 +762,271 @@ async def ai_endpoint(request: Request, question_request: QuestionRequest):
         logger.log_sync(session_id, "AI_ENDPOINT_ERROR", extra=f"Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to process the AI request. Please try again later.")
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.log_sync("SERVER", "SHUTDOWN_BEGIN", extra="Fitra Portofolio API Server shutting down")
+api_ai_stream_doc = """
+Streaming variant of `/api/ai` using server-sent events.
+
+**Events:**
+- `route`: Routing decision, sent before generation starts
+- `token`: Incremental answer text (`delta`)
+- `done`: Final metadata including `time_to_first_token`
+- `error`: Processing error
+
+**Example Stream:**
+```
+event: route
+data: {"route_type": "sales", "confidence": 0.95}
+
+event: token
+data: {"delta": "Based on"}
+
+event: done
+data: {"route_type": "sales", "processing_time": 1.234, "time_to_first_token": 0.412}
+```
+"""
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/ai/stream", summary="AI Question Answering (Streaming)", tags=["AI"], description=api_ai_stream_doc)
+async def ai_stream_endpoint(request: Request, question_request: QuestionRequest):
+    timing_context = request.state.timing_context
+    question = question_request.question.strip()
+    session_id = request.state.session_id
+    
+    timing_context.log_input_received(question, len(question))
+    
+    if not question:
+        timing_context.log_event("ERROR", "Empty question provided")
+        raise HTTPException(status_code=400, detail="The 'question' field cannot be empty.")
+    
+    await require_services()
+    
+    async def event_stream():
+        total_start_time = time.time()
+        time_to_first_token = None
+        answer_parts = []
+        
+        try:
+            conversation_history = await conversation_memory.get_conversation_exchanges(session_id)
+            cached_answer, question_embedding = await lookup_semantic_cache(question, session_id, conversation_history)
+            if cached_answer is not None:
+                timing_context.log_event("ROUTE_DECISION", "SEMANTIC_CACHE_HIT")
+                yield format_sse("route", {"route_type": cached_answer.route_type, "confidence": round(cached_answer.similarity, 3), "cached": True})
+                yield format_sse("token", {"delta": cached_answer.answer})
+                timing_context.log_response_ready(len(cached_answer.answer))
+                await conversation_memory.add_exchange(session_id, question, cached_answer.answer)
+                processing_time = round(time.time() - total_start_time, 3)
+                yield format_sse("done", {"route_type": cached_answer.route_type, "processing_time": processing_time, "time_to_first_token": processing_time})
+                return
+            
+            route_decision, sales_data = await route_with_speculation(question, session_id, conversation_history, question_embedding)
+            
+            if route_decision.route_type == RouteType.SALES:
+                timing_context.log_event("ROUTE_DECISION", "SALES_RAG_PATH")
+                token_stream = rag_service.stream_sales_question(question, session_id, sales_data, conversation_history)
+            else:
+                timing_context.log_event("ROUTE_DECISION", "GENERAL_CHAT_PATH")
+                token_stream = chat_service.stream_general_question(question, session_id, conversation_history)
+            
+            yield format_sse("route", {
+                "route_type": route_decision.route_type.value,
+                "confidence": route_decision.confidence
+            })
+            
+            async for delta in token_stream:
+                if time_to_first_token is None:
+                    time_to_first_token = time.time() - total_start_time
+                    timing_context.log_event("FIRST_TOKEN", f"TTFT: {time_to_first_token:.3f}s")
+                answer_parts.append(delta)
+                yield format_sse("token", {"delta": delta})
+            
+            answer = "".join(answer_parts)
+            total_duration = time.time() - total_start_time
+            timing_context.log_response_ready(len(answer))
+            
+            await conversation_memory.add_exchange(session_id, question, answer)
+            store_semantic_cache(question, answer, route_decision.route_type, question_embedding)
+            
+            yield format_sse("done", {
+                "route_type": route_decision.route_type.value,
+                "processing_time": round(total_duration, 3),
+                "time_to_first_token": round(time_to_first_token, 3) if time_to_first_token is not None else None
+            })
+            
+        except Exception as e:
+            logger.log_sync(session_id, "AI_STREAM_ERROR", extra=f"Error: {str(e)}")
+            yield format_sse("error", {"detail": "Failed to process the AI request. Please try again later."})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+api_ai_batch_doc = """
+Answer many independent questions in one request, e.g. for dashboards.
+
+Questions are answered without conversation history and are not added to
+the session. All questions are embedded in a single `encode` call and
+checked against the semantic cache in one index search; the
+keyword fast path runs over every question, the local classifier scores the
+rest in one index search, and sales questions share one batched FAISS search.
+Generation calls then run with at most `BATCH_CONCURRENCY` in flight.
+
+Results come back in request order. A failed or empty question gets an
+`error` instead of failing the batch. `processing_time` per item is measured
+from the start of the batch.
+
+**Example Request:**
+```json
+{
+    "questions": ["What deals does Alice have?", "How do I write a good cold email?"]
+}
+```
+
+**Example Response:**
+```json
+{
+    "results": [
+        {"answer": "Alice has...", "route_type": "sales", "routing_method": "keyword", "processing_time": 1.102, "error": null},
+        {"answer": "Start with...", "route_type": "general", "routing_method": "local", "processing_time": 1.387, "error": null}
+    ],
+    "processing_time": 1.391
+}
+```
+"""
+
+@app.post("/api/ai/batch", summary="AI Question Answering (Batch)", tags=["AI"], description=api_ai_batch_doc, response_model=BatchAIResponse)
+async def ai_batch_endpoint(request: Request, batch_request: BatchQuestionRequest):
+    timing_context = request.state.timing_context
+    session_id = request.state.session_id
+    questions = [question.strip() for question in batch_request.questions]
+    
+    timing_context.log_event("BATCH_RECEIVED", f"{len(questions)} questions")
+    
+    if not questions:
+        raise HTTPException(status_code=400, detail="The 'questions' field cannot be empty.")
+    if len(questions) > BATCH_MAX_QUESTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_QUESTIONS} questions per batch.")
+    
+    await require_services()
+    timing_context.log_event("ROUTE_DECISION", "BATCH_PATH")
+    
+    total_start_time = time.time()
+    results: List[Optional[BatchItemResponse]] = [
+        None if question else BatchItemResponse(error="The question cannot be empty.") for question in questions
+    ]
+    rows = [row for row, question in enumerate(questions) if question]
+    
+    def finish(row: int, answer: str, route_type: str, routing_method: str):
+        results[row] = BatchItemResponse(
+            answer=answer,
+            route_type=route_type,
+            routing_method=routing_method,
+            processing_time=round(time.time() - total_start_time, 3)
+        )
+    
+    try:
+        embeddings = await asyncio.to_thread(rag_service.encode_questions, [questions[row] for row in rows])
+        
+        cached_answers = await lookup_semantic_cache_batch([questions[row] for row in rows], session_id, embeddings)
+        
+        uncached = []
+        for position, (row, cached_answer) in enumerate(zip(rows, cached_answers)):
+            if cached_answer is not None:
+                finish(row, cached_answer.answer, cached_answer.route_type, "semantic_cache")
+            else:
+                uncached.append(position)
+        
+        rows = [rows[position] for position in uncached]
+        embeddings = embeddings[uncached]
+        decisions = await ai_router.route_batch([questions[row] for row in rows], session_id, embeddings)
+        
+        sales_positions = [position for position, (decision, _) in enumerate(decisions) if decision.route_type == RouteType.SALES]
+        sales_data = {}
+        if sales_positions:
+            retrieved = await rag_service.retrieve_batch([questions[rows[position]] for position in sales_positions], embeddings[sales_positions], session_id)
+            sales_data = dict(zip(sales_positions, retrieved))
+    except Exception as e:
+        logger.log_sync(session_id, "AI_BATCH_ERROR", extra=f"Error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to process the batch request. Please try again later.")
+    
+    generation_slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def answer(position: int):
+        row = rows[position]
+        question = questions[row]
+        decision, routing_method = decisions[position]
+        
+        async with generation_slots:
+            try:
+                if decision.route_type == RouteType.SALES:
+                    text = await rag_service.process_sales_question(question, session_id, sales_data[position], ())
+                else:
+                    text = await chat_service.process_general_question(question, session_id, ())
+            except Exception as e:
+                logger.log_sync(session_id, "AI_BATCH_ITEM_ERROR", extra=f"Item {row} | Error: {str(e)}")
+                results[row] = BatchItemResponse(route_type=decision.route_type.value, routing_method=routing_method, error="Failed to answer this question.")
+                return
+        
+        finish(row, text, decision.route_type.value, routing_method)
+        store_semantic_cache(question, text, decision.route_type, embeddings[position:position + 1])
+    
+    await asyncio.gather(*[answer(position) for position in range(len(rows))])
+    
+    total_duration = time.time() - total_start_time
+    timing_context.log_response_ready(sum(len(result.answer or "") for result in results))
+    logger.log_sync(session_id, "AI_BATCH_COMPLETE", total_duration, f"Questions: {len(questions)} | Sales: {len(sales_positions)} | Errors: {sum(result.error is not None for result in results)}")
+    
+    return BatchAIResponse(results=results, processing_time=round(total_duration, 3))
+
+api_admin_reload_doc = """
+Reload sales data from disk without restarting the server.
+
+Reps are diffed by `id`; only added or changed reps are re-embedded, and the
+new retrieval state is swapped in while requests keep being served. The same
+reload runs automatically when the data file changes (`DATA_WATCH_INTERVAL_SECONDS`).
+
+Disabled unless the `ADMIN_TOKEN` environment variable is set; every call
+must then send the same value.
+
+**Headers:**
+- `X-Admin-Token`: Must equal `ADMIN_TOKEN`
+
+**Responses:**
+- `200 OK`: Reload result
+- `403 Forbidden`: `ADMIN_TOKEN` is not configured, or the token is missing or wrong
+- `500 Internal Server Error`: The data file could not be read; the current data is kept
+
+**Example Response:**
+```json
+{
+    "status": "reloaded",
+    "reps_added": 1,
+    "reps_removed": 0,
+    "reps_changed": 1,
+    "reps_unchanged": 3,
+    "chunks_removed": 3,
+    "chunks_embedded": 6,
+    "chunks_total": 18,
+    "duration": 0.084
+}
+```
+"""
+
+@app.post("/api/admin/reload", summary="Reload Sales Data", tags=["Admin"], description=api_admin_reload_doc)
+async def admin_reload(x_admin_token: Optional[str] = Header(default=None)):
+    # Fail closed: without a configured token anyone could trigger a full re-embed.
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them.")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+    
+    await require_services()
+    result = await reload_service.reload_async("admin_endpoint")
+    if result["status"] == "error":
+        raise HTTPException(status_code=500, detail=f"Reload failed: {result['detail']}")
+    return result
 
 if __name__ == "__main__":
     logger.log_sync("SERVER", "STARTUP_UVICORN", extra="Starting Uvicorn server on 0.0.0.0:8000")
@@ -1,24 +1,64 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-import time
 import asyncio
+import time
+from typing import Set
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from utils.logger import generate_session_id, TimingContext, logger
+from utils.metrics import REQUEST_DURATION
+from utils.tracing import current_trace, span
+
+# Strong references to REQUEST_COMPLETE tasks; the event loop only keeps weak ones.
+pending_finishes: Set[asyncio.Task] = set()
+
+async def drain_pending_finishes(timeout: float = 5.0):
+    """Waits for outstanding REQUEST_COMPLETE logging so shutdown doesn't lose it."""
+    if pending_finishes:
+        await asyncio.wait(set(pending_finishes), timeout=timeout)
+
+class TimingMiddleware:
+    """Raw ASGI middleware: messages are forwarded as they arrive, so streaming bodies are never buffered."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
         session_id = generate_session_id()
         timing_context = TimingContext(session_id)
-        
-        request.state.session_id = session_id
-        request.state.timing_context = timing_context
-        
-        method = request.method
-        path = str(request.url.path)
-        
+
+        state = scope.setdefault("state", {})
+        state["session_id"] = session_id
+        state["timing_context"] = timing_context
+
+        method = scope["method"]
+        path = scope["path"]
+
         logger.log_sync(session_id, "REQUEST_START", extra=f"{method} {path}")
-        
-        response = await call_next(request)
-        
-        asyncio.create_task(timing_context.finish_async())
-        
-        return response
+
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        start_time = time.perf_counter()
+        trace_token = current_trace.set(timing_context.trace)
+        try:
+            with span(f"{method} {path}", "http"):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(trace_token)
+            # Label by route template so path parameters don't explode the series count.
+            route = scope.get("route")
+            REQUEST_DURATION.observe(time.perf_counter() - start_time, getattr(route, "path", "unmatched"), method)
+
+            task = asyncio.create_task(timing_context.finish_async(status_code, response_size))
+            pending_finishes.add(task)
+            task.add_done_callback(pending_finishes.discard)
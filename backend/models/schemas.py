@@ -14,6 +14,20 @@ class AIResponse(BaseModel):
     route_type: Optional[str] = None
     processing_time: Optional[float] = None
 
+class BatchQuestionRequest(BaseModel):
+    questions: List[str]
+
+class BatchItemResponse(BaseModel):
+    answer: Optional[str] = None
+    route_type: Optional[str] = None
+    routing_method: Optional[str] = None
+    processing_time: Optional[float] = None
+    error: Optional[str] = None
+
+class BatchAIResponse(BaseModel):
+    results: List[BatchItemResponse]
+    processing_time: float
+
 class RouteDecision(BaseModel):
     route_type: RouteType
     confidence: float
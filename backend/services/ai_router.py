@@ -1,14 +1,23 @@
+import asyncio
 import json
 import time
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Optional, Tuple, Sequence
+import numpy as np
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from models.schemas import RouteDecision, RouteType
 from utils.logger import logger
+from utils.metrics import ROUTE_DECISIONS, ROUTING_DURATION
+from utils.tracing import span
 from services.conversation_memory import conversation_memory
+from services.keyword_matcher import KeywordMatcher
+from services.local_router import LocalRouter
+from services.prompt_packer import PromptPacker
 
 class AIRouter:
-    def __init__(self, openai_api_key: str, sales_data: Dict[str, Any]):
+    def __init__(self, openai_api_key: str, sales_data: Dict[str, Any], keyword_matcher: Optional[KeywordMatcher] = None, max_concurrency: int = 16,
+                 local_router: Optional[LocalRouter] = None, local_general_threshold: float = 0.35, local_sales_threshold: float = 0.65,
+                 prompt_packer: Optional[PromptPacker] = None):
         self.router_model = ChatOpenAI(
             model="gpt-3.5-turbo",
             openai_api_key=openai_api_key,
@@ -16,8 +25,14 @@ class AIRouter:
             max_completion_tokens=100
         )
         
-        self.sales_keywords = self._extract_sales_keywords(sales_data)
-        logger.log_sync("AI_ROUTER", "KEYWORDS_EXTRACTED", extra=f"Loaded {len(self.sales_keywords)} sales keywords")
+        self.llm_semaphore = asyncio.Semaphore(max_concurrency)
+        self.prompt_packer = prompt_packer or PromptPacker()
+        
+        self.local_router = local_router
+        self.local_general_threshold = local_general_threshold
+        self.local_sales_threshold = local_sales_threshold
+        
+        self.apply_keyword_matcher(keyword_matcher or KeywordMatcher.from_sales_data(sales_data))
         
         self.routing_prompt = PromptTemplate(
             input_variables=["question", "conversation_history", "sales_keywords"],
@@ -36,55 +51,140 @@ class AIRouter:
         
         self.router_chain = self.routing_prompt | self.router_model
     
-    def _extract_sales_keywords(self, sales_data: Dict[str, Any]) -> Set[str]:
-        keywords = set()
+    def apply_keyword_matcher(self, keyword_matcher: KeywordMatcher):
+        self.keyword_matcher = keyword_matcher
+        self.sales_keywords = keyword_matcher.keywords
+        logger.log_sync("AI_ROUTER", "KEYWORDS_EXTRACTED", extra=f"Loaded {len(self.sales_keywords)} sales keywords")
+    
+    def keyword_route(self, question: str, session_id: str) -> Optional[RouteDecision]:
+        start_time = time.time()
         
-        for rep in sales_data.get("salesReps", []):
-            keywords.add(rep["name"].lower())
-            keywords.add(rep["role"].lower()) 
-            keywords.add(rep["region"].lower())
-            
-            for skill in rep.get("skills", []):
-                keywords.add(skill.lower())
-            
-            for client in rep.get("clients", []):
-                keywords.add(client["name"].lower())
-                keywords.add(client["industry"].lower())
-            
-            for deal in rep.get("deals", []):
-                keywords.add(deal["client"].lower())
-                keywords.add(deal["status"].lower())
+        logger.log_sync(session_id, "AI_ROUTING_START", extra=f"Analyzing: {question[:30]}...")
+        
+        with span("route.keyword", "routing"):
+            matched = self.keyword_matcher.contains_any(question)
+        
+        if not matched:
+            ROUTING_DURATION.observe(time.time() - start_time, "keyword")
+            return None
+        
+        duration = time.time() - start_time
+        ROUTING_DURATION.observe(duration, "keyword")
+        ROUTE_DECISIONS.inc(RouteType.SALES.value, "keyword")
+        logger.log_sync(session_id, "DIRECT_KEYWORD_MATCH", duration, f"Found sales keyword in: {question[:50]}")
+        
+        return RouteDecision(
+            route_type=RouteType.SALES,
+            confidence=0.95,
+            reasoning=f"Direct keyword match found in {duration:.3f}s"
+        )
+    
+    async def local_route(self, question: str, session_id: str, embedding: Optional[np.ndarray] = None) -> Optional[RouteDecision]:
+        """``embedding``, if given, is the question's normalised ``(1, dim)`` row and saves the classifier an encode."""
+        if self.local_router is None:
+            return None
         
-        return keywords
-
-    async def route_question(self, question: str, session_id: str) -> RouteDecision:
         start_time = time.time()
         
         try:
-            logger.log_sync(session_id, "AI_ROUTING_START", extra=f"Analyzing: {question[:30]}...")
-            
-            question_lower = question.lower()
-            
-            direct_keyword_match = any(keyword in question_lower for keyword in self.sales_keywords)
-            
-            if direct_keyword_match:
-                duration = time.time() - start_time
-                logger.log_sync(session_id, "DIRECT_KEYWORD_MATCH", duration, f"Found sales keyword in: {question[:50]}")
-                
-                return RouteDecision(
-                    route_type=RouteType.SALES,
-                    confidence=0.95,
-                    reasoning=f"Direct keyword match found in {duration:.3f}s"
-                )
+            with span("route.local", "routing"):
+                if embedding is None:
+                    sales_probability = await asyncio.to_thread(self.local_router.classify, question)
+                else:
+                    sales_probability = float((await asyncio.to_thread(self.local_router.classify_embeddings, embedding))[0])
+        except Exception as e:
+            logger.log_sync(session_id, "LOCAL_ROUTING_ERROR", time.time() - start_time, f"Error: {str(e)}")
+            return None
+        
+        duration = time.time() - start_time
+        ROUTING_DURATION.observe(duration, "local")
+        
+        return self._local_decision(sales_probability, duration, session_id)
+    
+    def _local_decision(self, sales_probability: float, duration: float, session_id: str) -> Optional[RouteDecision]:
+        if sales_probability >= self.local_sales_threshold:
+            route_type, confidence = RouteType.SALES, sales_probability
+        elif sales_probability <= self.local_general_threshold:
+            route_type, confidence = RouteType.GENERAL, 1.0 - sales_probability
+        else:
+            logger.log_sync(session_id, "LOCAL_ROUTING_UNCERTAIN", duration, f"P(sales): {sales_probability:.3f} | Band: {self.local_general_threshold}-{self.local_sales_threshold} | Deferring to LLM")
+            return None
+        
+        ROUTE_DECISIONS.inc(route_type.value, "local")
+        logger.log_sync(session_id, "LOCAL_ROUTING_COMPLETE", duration, f"Route: {route_type.value} | P(sales): {sales_probability:.3f} | Confidence: {confidence:.3f}")
+        
+        return RouteDecision(
+            route_type=route_type,
+            confidence=round(confidence, 3),
+            reasoning=f"Local classifier decided in {duration:.3f}s"
+        )
+    
+    async def route_question(self, question: str, session_id: str, conversation_history: Optional[Sequence[str]] = None) -> RouteDecision:
+        keyword_decision = self.keyword_route(question, session_id)
+        if keyword_decision is not None:
+            return keyword_decision
+        
+        local_decision = await self.local_route(question, session_id)
+        if local_decision is not None:
+            return local_decision
+        
+        return await self.llm_route(question, session_id, conversation_history)
+    
+    async def route_batch(self, questions: List[str], session_id: str, embeddings: Optional[np.ndarray] = None) -> List[Tuple[RouteDecision, str]]:
+        """Routes many independent questions; returns ``(decision, method)`` per question, in order.
+        
+        The keyword pass runs over every question, the local classifier scores
+        the rest in one index search using ``embeddings`` (rows aligned with
+        ``questions``), and only the questions it is unsure about go to the
+        router LLM, concurrently and without conversation history.
+        """
+        results: List[Optional[Tuple[RouteDecision, str]]] = [None] * len(questions)
+        
+        for row, question in enumerate(questions):
+            decision = self.keyword_route(question, session_id)
+            if decision is not None:
+                results[row] = (decision, "keyword")
+        
+        undecided = [row for row, result in enumerate(results) if result is None]
+        if undecided and self.local_router is not None and embeddings is not None:
+            start_time = time.time()
+            try:
+                with span("route.local", "routing", size=len(undecided)):
+                    probabilities = await asyncio.to_thread(self.local_router.classify_embeddings, embeddings[undecided])
+            except Exception as e:
+                logger.log_sync(session_id, "LOCAL_ROUTING_ERROR", time.time() - start_time, f"Error: {str(e)}")
+                probabilities = []
+            duration = time.time() - start_time
+            ROUTING_DURATION.observe(duration, "local")
             
-            conversation_history = await conversation_memory.get_conversation_context(session_id)
-            keywords_str = ", ".join(sorted(list(self.sales_keywords)[:20]))
+            for row, sales_probability in zip(undecided, probabilities):
+                decision = self._local_decision(float(sales_probability), duration, session_id)
+                if decision is not None:
+                    results[row] = (decision, "local")
+        
+        undecided = [row for row, result in enumerate(results) if result is None]
+        decisions = await asyncio.gather(*[self.llm_route(questions[row], session_id, ()) for row in undecided])
+        for row, decision in zip(undecided, decisions):
+            results[row] = (decision, "llm")
+        
+        return results
+    
+    async def llm_route(self, question: str, session_id: str, conversation_history: Optional[Sequence[str]] = None) -> RouteDecision:
+        start_time = time.time()
+        
+        try:
+            if conversation_history is None:
+                conversation_history = await conversation_memory.get_conversation_exchanges(session_id)
+            conversation_history, _ = self.prompt_packer.pack("router", session_id, conversation_history)
+            keywords_str = ", ".join(self.sales_keywords[:20])
             
-            response = self.router_chain.invoke({
-                "question": question,
-                "conversation_history": conversation_history or "No previous conversation",
-                "sales_keywords": keywords_str
-            })
+            async with self.llm_semaphore:
+                with span("route.llm", "llm"):
+                    response = await self.router_chain.ainvoke({
+                        "question": question,
+                        "conversation_history": conversation_history or "No previous conversation",
+                        "sales_keywords": keywords_str
+                    })
             route_text = response.content.strip().lower()
             
             duration = time.time() - start_time
@@ -100,6 +200,8 @@ class AIRouter:
                 confidence = 0.5
                 logger.log_sync(session_id, "AI_ROUTING_FALLBACK", extra=f"Unclear response: {route_text}")
             
+            ROUTING_DURATION.observe(duration, "llm")
+            ROUTE_DECISIONS.inc(route_type.value, "llm")
             logger.log_sync(session_id, "AI_ROUTING_COMPLETE", duration, f"Route: {route_type.value} | Confidence: {confidence}")
             
             return RouteDecision(
@@ -110,6 +212,8 @@ class AIRouter:
             
         except Exception as e:
             duration = time.time() - start_time
+            ROUTING_DURATION.observe(duration, "llm")
+            ROUTE_DECISIONS.inc(RouteType.GENERAL.value, "fallback")
             logger.log_sync(session_id, "AI_ROUTING_ERROR", duration, f"Error: {str(e)}")
             
             return RouteDecision(
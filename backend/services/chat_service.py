@@ -1,12 +1,19 @@
+import asyncio
 import time
+from typing import AsyncIterator, Optional, Sequence
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from utils.logger import logger
+from utils.metrics import LLM_DURATION
+from utils.tracing import span
 from services.conversation_memory import conversation_memory
+from services.prompt_packer import PromptPacker
 
 class ChatService:
-    def __init__(self, openai_api_key: str, system_instruction: str):
+    def __init__(self, openai_api_key: str, system_instruction: str, max_concurrency: int = 16, prompt_packer: Optional[PromptPacker] = None):
         self.system_instruction = system_instruction
+        self.llm_semaphore = asyncio.Semaphore(max_concurrency)
+        self.prompt_packer = prompt_packer or PromptPacker()
         
         self.chat_model = ChatOpenAI(
             model="gpt-3.5-turbo",
@@ -27,21 +34,26 @@ class ChatService:
         
         self.chat_chain = self.chat_prompt | self.chat_model
 
-    async def process_general_question(self, question: str, session_id: str) -> str:
+    async def process_general_question(self, question: str, session_id: str, conversation_history: Optional[Sequence[str]] = None) -> str:
         start_time = time.time()
         
         logger.log_sync(session_id, "CHAT_OPENAI_START", extra="Processing general question")
         
         try:
-            conversation_history = await conversation_memory.get_conversation_context(session_id)
+            if conversation_history is None:
+                conversation_history = await conversation_memory.get_conversation_exchanges(session_id)
+            conversation_history, _ = self.prompt_packer.pack("general", session_id, conversation_history)
             
-            response = self.chat_chain.invoke({
-                "system_instruction": self.system_instruction,
-                "conversation_history": conversation_history or "No previous conversation",
-                "question": question
-            })
+            async with self.llm_semaphore:
+                with span("chat.generate", "llm"):
+                    response = await self.chat_chain.ainvoke({
+                        "system_instruction": self.system_instruction,
+                        "conversation_history": conversation_history or "No previous conversation",
+                        "question": question
+                    })
             
             duration = time.time() - start_time
+            LLM_DURATION.observe(duration, "chat", "invoke")
             logger.log_sync(session_id, "CHAT_OPENAI_END", duration, "General response generated")
             
             return response.content if hasattr(response, "content") else str(response)
@@ -50,3 +62,34 @@ class ChatService:
             duration = time.time() - start_time
             logger.log_sync(session_id, "CHAT_OPENAI_ERROR", duration, f"Error: {str(e)}")
             raise e
+
+
+    async def stream_general_question(self, question: str, session_id: str, conversation_history: Optional[Sequence[str]] = None) -> AsyncIterator[str]:
+        start_time = time.time()
+        
+        logger.log_sync(session_id, "CHAT_OPENAI_START", extra="Streaming general question")
+        
+        try:
+            if conversation_history is None:
+                conversation_history = await conversation_memory.get_conversation_exchanges(session_id)
+            conversation_history, _ = self.prompt_packer.pack("general", session_id, conversation_history)
+            
+            async with self.llm_semaphore:
+                with span("chat.generate", "llm", mode="stream"):
+                    async for chunk in self.chat_chain.astream({
+                        "system_instruction": self.system_instruction,
+                        "conversation_history": conversation_history or "No previous conversation",
+                        "question": question
+                    }):
+                        delta = chunk.content if hasattr(chunk, "content") else str(chunk)
+                        if delta:
+                            yield delta
+            
+            duration = time.time() - start_time
+            LLM_DURATION.observe(duration, "chat", "stream")
+            logger.log_sync(session_id, "CHAT_OPENAI_END", duration, "General response streamed")
+            
+        except Exception as e:
+            duration = time.time() - start_time
+            logger.log_sync(session_id, "CHAT_OPENAI_ERROR", duration, f"Error: {str(e)}")
+            raise e
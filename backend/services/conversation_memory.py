@@ -1,70 +1,199 @@
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from abc import ABC, abstractmethod
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict, deque
+from datetime import datetime
 import asyncio
+import time
 from dataclasses import dataclass
+from utils.tracing import span
 
-@dataclass
+@dataclass(slots=True)
 class ConversationExchange:
     user_message: str
     ai_response: str
     timestamp: datetime
 
+def render_exchange(exchange: ConversationExchange) -> str:
+    return f"User: {exchange.user_message}\nAssistant: {exchange.ai_response}"
+
+class SessionHistory:
+    """Ring buffer of exchanges plus their rendered parts, updated per append."""
+    
+    __slots__ = ("exchanges", "parts")
+    
+    def __init__(self, max_exchanges: int):
+        self.exchanges: Deque[ConversationExchange] = deque(maxlen=max_exchanges)
+        self.parts: Deque[str] = deque(maxlen=max_exchanges)
+        
+    def append(self, exchange: ConversationExchange):
+        self.exchanges.append(exchange)
+        self.parts.append(render_exchange(exchange))
+
+class MemoryBackend(ABC):
+    """Storage for per-session exchanges.
+    
+    Backends own trimming to ``max_exchanges`` and session expiry, since a
+    shared backend has to apply both on behalf of every worker process.
+    Backends that do I/O set ``blocking`` so ``ConversationMemory`` calls
+    them from a worker thread instead of the event loop.
+    """
+    
+    blocking = False
+    
+    def __init__(self, max_exchanges: int = 5, session_timeout_minutes: int = 30):
+        self.max_exchanges = max_exchanges
+        self.timeout_minutes = session_timeout_minutes
+        
+    @abstractmethod
+    def append(self, session_id: str, exchange: ConversationExchange):
+        ...
+        
+    @abstractmethod
+    def get_exchanges(self, session_id: str) -> Sequence[ConversationExchange]:
+        ...
+        
+    def get_rendered_exchanges(self, session_id: str) -> Sequence[str]:
+        """One rendered string per exchange, oldest first, for packing whole exchanges into a prompt."""
+        return [render_exchange(exchange) for exchange in self.get_exchanges(session_id)]
+        
+    def get_context(self, session_id: str) -> str:
+        return "\n".join(self.get_rendered_exchanges(session_id))
+        
+    def has_session(self, session_id: str) -> bool:
+        return bool(self.get_exchanges(session_id))
+        
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+        
+    def expire(self) -> int:
+        return 0
+        
+    def close(self):
+        pass
+
+class InMemoryBackend(MemoryBackend):
+    """Process-local storage; sessions are not shared between workers.
+    
+    Sessions live in an OrderedDict kept in last-activity order, so expiry
+    only pops from the front and stops at the first live session instead of
+    scanning every session. Each session keeps bounded deques of its
+    exchanges and their rendered text, so reading the history is a dict
+    lookup.
+    """
+    
+    def __init__(self, max_exchanges: int = 5, session_timeout_minutes: int = 30):
+        super().__init__(max_exchanges, session_timeout_minutes)
+        self.sessions: Dict[str, SessionHistory] = {}
+        self.session_last_active: "OrderedDict[str, float]" = OrderedDict()
+        self.timeout_seconds = session_timeout_minutes * 60
+        
+    def append(self, session_id: str, exchange: ConversationExchange):
+        self.expire()
+        
+        history = self.sessions.get(session_id)
+        if history is None:
+            history = self.sessions[session_id] = SessionHistory(self.max_exchanges)
+        history.append(exchange)
+        
+        self.session_last_active[session_id] = time.monotonic()
+        self.session_last_active.move_to_end(session_id)
+        
+    def get_exchanges(self, session_id: str) -> Sequence[ConversationExchange]:
+        self.expire()
+        history = self.sessions.get(session_id)
+        return history.exchanges if history is not None else ()
+        
+    def get_rendered_exchanges(self, session_id: str) -> Sequence[str]:
+        self.expire()
+        history = self.sessions.get(session_id)
+        return tuple(history.parts) if history is not None else ()
+        
+    def has_session(self, session_id: str) -> bool:
+        self.expire()
+        return session_id in self.sessions
+        
+    def delete(self, session_id: str):
+        self.sessions.pop(session_id, None)
+        self.session_last_active.pop(session_id, None)
+        
+    def expire(self) -> int:
+        cutoff = time.monotonic() - self.timeout_seconds
+        last_active = self.session_last_active
+        expired = 0
+        
+        while last_active:
+            session_id, timestamp = next(iter(last_active.items()))
+            if timestamp >= cutoff:
+                break
+            last_active.popitem(last=False)
+            self.sessions.pop(session_id, None)
+            expired += 1
+        
+        return expired
+
 class ConversationMemory:
-    def __init__(self, max_exchanges_per_session: int = 5, session_timeout_minutes: int = 30):
-        self.sessions: Dict[str, List[ConversationExchange]] = {}
-        self.session_timestamps: Dict[str, datetime] = {}
+    def __init__(self, max_exchanges_per_session: int = 5, session_timeout_minutes: int = 30, backend: Optional[MemoryBackend] = None):
         self.max_exchanges = max_exchanges_per_session
         self.timeout_minutes = session_timeout_minutes
+        self.backend = backend or InMemoryBackend(max_exchanges_per_session, session_timeout_minutes)
+        self._sweeper_task: Optional[asyncio.Task] = None
         
-    async def add_exchange(self, session_id: str, user_message: str, ai_response: str):
-        await self._cleanup_expired_sessions()
+    def set_backend(self, backend: MemoryBackend):
+        """Swap the storage backend; existing sessions are not migrated."""
+        previous, self.backend = self.backend, backend
+        previous.close()
         
-        if session_id not in self.sessions:
-            self.sessions[session_id] = []
+    async def _call(self, method, *args):
+        # In-memory calls are cheaper than a thread hop and not thread-safe, so only blocking backends leave the loop.
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
         
+    async def add_exchange(self, session_id: str, user_message: str, ai_response: str):
         exchange = ConversationExchange(
             user_message=user_message,
             ai_response=ai_response,
             timestamp=datetime.now()
         )
+        with span("memory.add_exchange", "memory"):
+            await self._call(self.backend.append, session_id, exchange)
         
-        self.sessions[session_id].append(exchange)
-        self.session_timestamps[session_id] = datetime.now()
-        
-        if len(self.sessions[session_id]) > self.max_exchanges:
-            self.sessions[session_id] = self.sessions[session_id][-self.max_exchanges:]
-    
     async def get_conversation_context(self, session_id: str) -> str:
-        await self._cleanup_expired_sessions()
-        
-        if session_id not in self.sessions or not self.sessions[session_id]:
-            return ""
+        with span("memory.get_context", "memory"):
+            return await self._call(self.backend.get_context, session_id)
         
-        context_parts = []
-        for exchange in self.sessions[session_id]:
-            context_parts.append(f"User: {exchange.user_message}")
-            context_parts.append(f"Assistant: {exchange.ai_response}")
+    async def get_conversation_exchanges(self, session_id: str) -> Sequence[str]:
+        """Rendered exchanges, oldest first; what the prompt packer and the LLM services take as history."""
+        with span("memory.get_context", "memory"):
+            return await self._call(self.backend.get_rendered_exchanges, session_id)
         
-        return "\n".join(context_parts)
-    
     async def has_session(self, session_id: str) -> bool:
-        await self._cleanup_expired_sessions()
-        return session_id in self.sessions and bool(self.sessions[session_id])
-    
+        return await self._call(self.backend.has_session, session_id)
+        
     async def clear_session(self, session_id: str):
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-        if session_id in self.session_timestamps:
-            del self.session_timestamps[session_id]
-    
-    async def _cleanup_expired_sessions(self):
-        cutoff_time = datetime.now() - timedelta(minutes=self.timeout_minutes)
-        expired_sessions = [
-            session_id for session_id, timestamp in self.session_timestamps.items()
-            if timestamp < cutoff_time
-        ]
-        
-        for session_id in expired_sessions:
-            await self.clear_session(session_id)
+        await self._call(self.backend.delete, session_id)
+        
+    def start_sweeper(self, interval_seconds: float):
+        """Expire idle sessions periodically so memory is reclaimed without traffic."""
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.get_running_loop().create_task(self._sweep(interval_seconds))
+        
+    async def _sweep(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self._call(self.backend.expire)
+        
+    async def stop_sweeper(self):
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            try:
+                await self._sweeper_task
+            except asyncio.CancelledError:
+                pass
+            self._sweeper_task = None
+        
+    def close(self):
+        self.backend.close()
 
 conversation_memory = ConversationMemory()
@@ -1,19 +1,24 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List
 from utils.logger import logger
 
 class DataService:
     def __init__(self, data_file_path: str = "dummyData.json"):
         self.data_file_path = data_file_path
         self.sales_data = self._load_sales_data()
+        self.version = 0
+        self._reload_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def read_data_file(self) -> Dict[str, Any]:
+        with open(self.data_file_path, "r") as f:
+            data = json.load(f)
+            logger.log_sync("SERVER", "DATA_LOADED", extra=f"Loaded {len(data.get('salesReps', []))} sales reps")
+            return data
 
     def _load_sales_data(self) -> Dict[str, Any]:
         try:
-            with open(self.data_file_path, "r") as f:
-                data = json.load(f)
-                logger.log_sync("SERVER", "DATA_LOADED", extra=f"Loaded {len(data.get('salesReps', []))} sales reps")
-                return data
+            return self.read_data_file()
         except FileNotFoundError:
             logger.log_sync("SERVER", "DATA_ERROR", extra=f"File {self.data_file_path} not found")
             return {"salesReps": []}
@@ -27,6 +32,27 @@ class DataService:
     def get_sales_reps(self) -> list:
         return self.sales_data.get("salesReps", [])
 
+    def add_reload_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        self._reload_listeners.append(listener)
+
+    def set_sales_data(self, new_data: Dict[str, Any]) -> bool:
+        changed = new_data != self.sales_data
+        self.sales_data = new_data
+        
+        if changed:
+            self.version += 1
+            logger.log_sync("SERVER", "DATA_CHANGED", extra=f"Sales data version {self.version}")
+            for listener in self._reload_listeners:
+                listener(self.sales_data)
+        
+        return changed
+
     def reload_data(self) -> Dict[str, Any]:
-        self.sales_data = self._load_sales_data()
+        """Re-reads the data file and notifies reload listeners; data only.
+
+        Embeddings, the vector index and keyword matchers are not rebuilt
+        here. Use ``ReloadService.reload`` (or ``POST /api/admin/reload``) to
+        refresh the AI services along with the data.
+        """
+        self.set_sales_data(self._load_sales_data())
         return self.sales_data
@@ -0,0 +1,73 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+import numpy as np
+from utils.logger import logger
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+class EmbeddingBackend(ABC):
+    """Turns texts into float32 embeddings for chunk indexing and queries.
+
+    ``name`` identifies the vectors a backend produces and keys the on-disk
+    embedding cache, so two backends whose vectors differ must not share it.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        """Keyword arguments are model options (e.g. ``batch_size``) passed through to the model."""
+        ...
+
+    @abstractmethod
+    def get_sentence_embedding_dimension(self) -> int:
+        ...
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """fp32 PyTorch sentence-transformers model."""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, device: Optional[str] = None):
+        self.model_name = model_name
+        self.name = model_name
+        self.model = self._load(model_name, device)
+
+    def _load(self, model_name: str, device: Optional[str]):
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name, device=device)
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, **kwargs), dtype='float32')
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+class QuantizedSentenceTransformerBackend(SentenceTransformerBackend):
+    """Same model with its Linear layers dynamically quantized to int8, on CPU.
+
+    Weights are stored as int8 and activations are quantized per batch, so
+    the transformer's matmuls run on int8 kernels. Embeddings differ slightly
+    from fp32; ``benchmarks/bench_embedding_backend.py`` measures by how much.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL):
+        super().__init__(model_name, device="cpu")
+        self.name = f"{model_name}@int8"
+
+    def _load(self, model_name: str, device: Optional[str]):
+        import torch
+        model = super()._load(model_name, device)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+EMBEDDING_BACKENDS: Dict[str, Type[SentenceTransformerBackend]] = {
+    "fp32": SentenceTransformerBackend,
+    "int8": QuantizedSentenceTransformerBackend,
+}
+
+def create_embedding_backend(kind: str = "fp32", model_name: str = DEFAULT_EMBEDDING_MODEL) -> EmbeddingBackend:
+    backend_class = EMBEDDING_BACKENDS.get(kind.lower())
+    if backend_class is None:
+        raise ValueError(f"Unknown embedding backend '{kind}', expected one of: {', '.join(EMBEDDING_BACKENDS)}")
+
+    backend = backend_class(model_name)
+    logger.log_sync("EMBEDDING", "EMBEDDING_BACKEND_LOADED", extra=f"{kind.lower()} | {backend.name} | dim {backend.get_sentence_embedding_dimension()}")
+    return backend
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, List, Tuple
+import numpy as np
+from utils.logger import logger
+from utils.metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_QUEUE_WAIT
+
+class EmbeddingBatcher:
+    """Coalesces single-question encodes from concurrent requests into one model call.
+
+    Wraps an embedding model and exposes the same ``encode`` and
+    ``get_sentence_embedding_dimension``, so it can replace the model
+    wherever queries are embedded. A call with exactly one text is queued;
+    a dedicated thread waits up to ``max_wait_ms`` after the first queued
+    text, or until ``max_batch_size`` texts are waiting, then encodes them
+    together and resolves each caller's future. Calls with several texts
+    (chunk indexing, batch requests) are already batched and go straight
+    to the model.
+    """
+
+    def __init__(self, embedding_model, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        self.embedding_model = embedding_model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Deque[Tuple[str, Future, float]] = deque()
+        self._condition = threading.Condition()
+        self._worker = None
+        self._stopping = False
+        self.batches = 0
+        self.items = 0
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.embedding_model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        if isinstance(texts, str) or len(texts) != 1 or kwargs:
+            return self.embedding_model.encode(texts, **kwargs)
+        return self.submit(texts[0]).result()[np.newaxis, :]
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("EmbeddingBatcher is closed")
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+            self._queue.append((text, future, time.perf_counter()))
+            self._condition.notify()
+        return future
+
+    def _next_batch(self) -> List[Tuple[str, Future, float]]:
+        with self._condition:
+            while not self._queue and not self._stopping:
+                self._condition.wait()
+            if not self._queue:
+                return []
+
+            deadline = self._queue[0][2] + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._stopping:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            return [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch_size))]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            started = time.perf_counter()
+            try:
+                embeddings = np.asarray(self.embedding_model.encode([text for text, _, _ in batch]), dtype='float32')
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            EMBEDDING_BATCH_SIZE.observe(len(batch))
+            for row, (_, future, queued_at) in enumerate(batch):
+                EMBEDDING_QUEUE_WAIT.observe(started - queued_at)
+                future.set_result(embeddings[row].copy())
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    def close(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout=5)
+        logger.log_sync("EMBEDDING_BATCHER", "EMBEDDING_BATCHER_CLOSED", extra=f"{self.items} encodes in {self.batches} batches")
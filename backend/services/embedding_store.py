@@ -0,0 +1,200 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import faiss
+import numpy as np
+from utils.logger import logger
+
+def hash_text(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def hash_sales_data(sales_data: Dict[str, Any]) -> str:
+    canonical = json.dumps(sales_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class EmbeddingStore:
+    """On-disk cache of chunk embeddings and the FAISS index built from them.
+
+    Entries are keyed by a hash of the sales data, the model name and the index
+    spec. Embeddings are loaded memory-mapped, and on a miss the most recent
+    entry for the same model donates rows for chunks whose text is unchanged.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 4):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_key(self, data_hash: str, model_name: str, index_spec: str) -> str:
+        return hashlib.sha256(f"{data_hash}|{model_name}|{index_spec}".encode("utf-8")).hexdigest()[:16]
+
+    def _paths(self, key: str) -> Dict[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return {
+            "manifest": f"{base}.json",
+            "embeddings": f"{base}.embeddings.npy",
+            "index": f"{base}.faiss"
+        }
+
+    def _read_manifest(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, key: str, chunk_hashes: List[str]) -> Optional[Tuple[np.ndarray, Any]]:
+        paths = self._paths(key)
+        manifest = self._read_manifest(paths["manifest"])
+        if manifest is None or manifest.get("chunk_hashes") != chunk_hashes:
+            return None
+
+        try:
+            embeddings = np.load(paths["embeddings"], mmap_mode="r")
+            index = faiss.read_index(paths["index"], faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except Exception as e:
+            logger.log_sync("RAG_SERVICE", "EMBEDDING_CACHE_ERROR", extra=f"Failed to load {key}: {str(e)}")
+            return None
+
+        return embeddings, index
+
+    def _reusable_rows(self, chunk_hashes: List[str], model_name: str) -> Dict[str, np.ndarray]:
+        manifests = []
+        for path in glob.glob(os.path.join(self.cache_dir, "*.json")):
+            manifest = self._read_manifest(path)
+            if manifest and manifest.get("model_name") == model_name:
+                manifests.append((os.path.getmtime(path), path, manifest))
+
+        if not manifests:
+            return {}
+
+        _, path, manifest = max(manifests, key=lambda item: item[0])
+        wanted = set(chunk_hashes)
+
+        try:
+            previous = np.load(path[:-len(".json")] + ".embeddings.npy", mmap_mode="r")
+        except OSError:
+            return {}
+
+        return {
+            chunk_hash: np.array(previous[row])
+            for row, chunk_hash in enumerate(manifest.get("chunk_hashes", []))
+            if chunk_hash in wanted
+        }
+
+    def _write_atomic(self, path: str, write: Callable[[str], None]):
+        """Writes ``path`` through a temp file of its own, so workers cold-starting together never share one.
+
+        Keys are content hashes, so if the replace fails because another
+        worker already put ``path`` in place, its file is just as good.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=os.path.basename(path) + ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            if not os.path.exists(path):
+                raise
+            logger.log_sync("RAG_SERVICE", "EMBEDDING_CACHE_RACE", extra=f"{os.path.basename(path)} already written by another worker")
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _save(self, key: str, model_name: str, chunk_hashes: List[str], embeddings: np.ndarray, index):
+        paths = self._paths(key)
+
+        def write_embeddings(tmp_path: str):
+            with open(tmp_path, "wb") as f:
+                np.save(f, embeddings)
+
+        def write_manifest(tmp_path: str):
+            with open(tmp_path, "w") as f:
+                json.dump({"model_name": model_name, "created_at": time.time(), "chunk_hashes": chunk_hashes}, f)
+
+        # The manifest goes last: readers only trust an entry once it exists.
+        self._write_atomic(paths["embeddings"], write_embeddings)
+        self._write_atomic(paths["index"], lambda tmp_path: faiss.write_index(index, tmp_path))
+        self._write_atomic(paths["manifest"], write_manifest)
+
+    def _prune(self):
+        manifests = sorted(glob.glob(os.path.join(self.cache_dir, "*.json")), key=os.path.getmtime)
+        stale = []
+        for manifest in manifests[:-self.max_entries]:
+            stale.extend(self._paths(os.path.basename(manifest)[:-len(".json")]).values())
+        # encode_cached files have no manifest; keep the most recently used ones, by the same bound.
+        stale += sorted(glob.glob(os.path.join(self.cache_dir, "texts-*.npy")), key=os.path.getmtime)[:-self.max_entries]
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def encode_cached(self, texts: List[str], model_name: str, encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        key = hashlib.sha256("|".join([model_name] + [hash_text(text) for text in texts]).encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(self.cache_dir, f"texts-{key}.npy")
+
+        try:
+            # Mark it as recently used so pruning drops text sets nobody loads anymore.
+            os.utime(path)
+            return np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            pass
+
+        embeddings = np.asarray(encode(texts), dtype="float32")
+        faiss.normalize_L2(embeddings)
+
+        def write_embeddings(tmp_path: str):
+            with open(tmp_path, "wb") as f:
+                np.save(f, embeddings)
+
+        self._write_atomic(path, write_embeddings)
+        self._prune()
+        return embeddings
+
+    def save(self, chunks: List[str], data_hash: str, model_name: str, index_spec: str, embeddings: np.ndarray, index):
+        """Stores an entry built elsewhere, e.g. by an incremental reload, so the next cold start on this data loads it.
+
+        ``embeddings`` rows and index ids must follow ``chunks``, as ``load_or_build`` returns them.
+        """
+        start_time = time.time()
+        key = self._cache_key(data_hash, model_name, index_spec)
+        self._save(key, model_name, [hash_text(chunk) for chunk in chunks], embeddings, index)
+        self._prune()
+        logger.log_sync("RAG_SERVICE", "EMBEDDING_CACHE_SAVED", time.time() - start_time, f"Saved {len(chunks)} embeddings as {key}")
+
+    def load_or_build(self, chunks: List[str], data_hash: str, model_name: str, index_spec: str,
+                      encode: Callable[[List[str]], np.ndarray], build_index: Callable[[np.ndarray], Any]) -> Tuple[np.ndarray, Any]:
+        start_time = time.time()
+        key = self._cache_key(data_hash, model_name, index_spec)
+        chunk_hashes = [hash_text(chunk) for chunk in chunks]
+
+        cached = self._load(key, chunk_hashes)
+        if cached is not None:
+            logger.log_sync("RAG_SERVICE", "EMBEDDING_CACHE_HIT", time.time() - start_time, f"Loaded {len(chunks)} embeddings from {key}")
+            return cached
+
+        reusable = self._reusable_rows(chunk_hashes, model_name)
+        missing = [i for i, chunk_hash in enumerate(chunk_hashes) if chunk_hash not in reusable]
+
+        encoded = {}
+        if missing:
+            fresh = np.asarray(encode([chunks[i] for i in missing]), dtype="float32")
+            faiss.normalize_L2(fresh)
+            encoded = dict(zip(missing, fresh))
+
+        embeddings = np.stack([
+            encoded[i] if i in encoded else reusable[chunk_hash]
+            for i, chunk_hash in enumerate(chunk_hashes)
+        ]).astype("float32")
+
+        index = build_index(embeddings)
+        self._save(key, model_name, chunk_hashes, embeddings, index)
+        self._prune()
+
+        logger.log_sync("RAG_SERVICE", "EMBEDDING_CACHE_MISS", time.time() - start_time, f"Embedded {len(missing)} of {len(chunks)} chunks, saved as {key}")
+        return embeddings, index
@@ -0,0 +1,121 @@
+from collections import deque
+from typing import Any, Dict, Iterable, List, Set
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def extract_sales_keywords(sales_data: Dict[str, Any]) -> Set[str]:
+    keywords = set()
+
+    for rep in sales_data.get("salesReps", []):
+        keywords.add(rep["name"].lower())
+        keywords.update(rep["name"].lower().split())
+        keywords.add(rep["role"].lower())
+        keywords.add(rep["region"].lower())
+
+        for skill in rep.get("skills", []):
+            keywords.add(skill.lower())
+
+        for client in rep.get("clients", []):
+            keywords.add(client["name"].lower())
+            keywords.add(client["industry"].lower())
+
+        for deal in rep.get("deals", []):
+            keywords.add(deal["client"].lower())
+            keywords.add(deal["status"].lower())
+
+    keywords.discard("")
+    return keywords
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over lowercase keywords with regex ``\\b`` semantics.
+
+    The automaton is built once, so a scan costs O(len(text) + matches)
+    no matter how many keywords are loaded.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = sorted({keyword.lower() for keyword in keywords if keyword})
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            self._insert(keyword, keyword_id)
+        self._build_failure_links()
+
+    @classmethod
+    def from_sales_data(cls, sales_data: Dict[str, Any]) -> "KeywordMatcher":
+        return cls(extract_sales_keywords(sales_data))
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _insert(self, keyword: str, keyword_id: int):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @staticmethod
+    def _at_boundary(text: str, position: int) -> bool:
+        before = position > 0 and _is_word_char(text[position - 1])
+        after = position < len(text) and _is_word_char(text[position])
+        return before != after
+
+    def _scan(self, text: str, first_only: bool) -> Set[str]:
+        matches = set()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            if not output[state]:
+                continue
+
+            end = position + 1
+            for keyword_id in output[state]:
+                keyword = self.keywords[keyword_id]
+                start = end - len(keyword)
+                if self._at_boundary(text, start) and self._at_boundary(text, end):
+                    matches.add(keyword)
+                    if first_only:
+                        return matches
+
+        return matches
+
+    def find_all(self, text: str) -> Set[str]:
+        return self._scan(text.lower(), first_only=False)
+
+    def contains_any(self, text: str) -> bool:
+        return bool(self._scan(text.lower(), first_only=True))
@@ -0,0 +1,110 @@
+import time
+from typing import Optional
+import faiss
+import numpy as np
+from utils.logger import logger
+from utils.tracing import span
+from services.embedding_store import EmbeddingStore
+
+SALES_EXAMPLES = [
+    "Who closed the most deals?",
+    "Top closer?",
+    "Which rep has the highest revenue?",
+    "Who is our best salesperson?",
+    "Show me the deals that are still in progress",
+    "What is our total pipeline value?",
+    "How many deals did we lose?",
+    "Which clients are in the finance industry?",
+    "List the sales representatives and their regions",
+    "What skills does the sales team have?",
+    "Which region performs best?",
+    "What is the status of our biggest deal?",
+    "Who handles our enterprise clients?",
+    "Compare the performance of our reps",
+    "How much revenue have we won this year?",
+    "Who should I contact about the retail account?",
+]
+
+GENERAL_EXAMPLES = [
+    "What is the capital of France?",
+    "Tell me a joke",
+    "How do I write a Python function?",
+    "What's the weather like today?",
+    "Explain machine learning in simple terms",
+    "Who wrote Romeo and Juliet?",
+    "Give me tips for a job interview",
+    "How does photosynthesis work?",
+    "Translate hello into Spanish",
+    "What time zone is Tokyo in?",
+    "Recommend a good book to read",
+    "What is 15% of 200?",
+    "How do I cook pasta?",
+    "Hello, how are you?",
+    "What can you help me with?",
+    "Summarize the plot of a famous movie",
+]
+
+class LocalRouter:
+    """kNN question classifier over labelled examples and the sales chunks.
+
+    ``classify`` returns the share of neighbour similarity that belongs to
+    sales examples, so 1.0 is certainly sales and 0.0 certainly general.
+    """
+
+    def __init__(self, embedding_model, sales_chunk_embeddings: Optional[np.ndarray], k: int = 7,
+                 embedding_store: Optional[EmbeddingStore] = None, model_name: str = "all-MiniLM-L6-v2"):
+        self.embedding_model = embedding_model
+        self.k = k
+        self.embedding_store = embedding_store
+        self.model_name = model_name
+        self._state = None
+        self.example_embeddings = self._embed_examples()
+        self.rebuild(sales_chunk_embeddings)
+
+    def _embed_examples(self) -> np.ndarray:
+        examples = SALES_EXAMPLES + GENERAL_EXAMPLES
+        if self.embedding_store is not None:
+            return self.embedding_store.encode_cached(examples, self.model_name, self.embedding_model.encode)
+
+        embeddings = self.embedding_model.encode(examples).astype('float32')
+        faiss.normalize_L2(embeddings)
+        return embeddings
+
+    def rebuild(self, sales_chunk_embeddings: Optional[np.ndarray]):
+        start_time = time.time()
+
+        embedding_parts = [np.asarray(self.example_embeddings, dtype='float32')]
+        chunk_count = 0
+        if sales_chunk_embeddings is not None and len(sales_chunk_embeddings):
+            embedding_parts.append(np.asarray(sales_chunk_embeddings, dtype='float32'))
+            chunk_count = len(sales_chunk_embeddings)
+
+        embeddings = np.ascontiguousarray(np.vstack(embedding_parts))
+        labels = np.array(
+            [True] * len(SALES_EXAMPLES) + [False] * len(GENERAL_EXAMPLES) + [True] * chunk_count
+        )
+
+        index = faiss.IndexFlatIP(embeddings.shape[1])
+        index.add(embeddings)
+
+        self._state = (index, labels)
+
+        duration = time.time() - start_time
+        logger.log_sync("LOCAL_ROUTER", "EXAMPLES_INDEXED", duration, f"{int(labels.sum())} sales / {int((~labels).sum())} general examples")
+
+    def classify(self, question: str) -> float:
+        with span("embedding.encode", "embedding", caller="local_router"):
+            query_embedding = self.embedding_model.encode([question]).astype('float32')
+        faiss.normalize_L2(query_embedding)
+
+        return float(self.classify_embeddings(query_embedding)[0])
+
+    def classify_embeddings(self, query_embeddings: np.ndarray) -> np.ndarray:
+        """Sales probability for each row of already L2-normalised embeddings, in one index search."""
+        index, labels = self._state
+        scores, indices = index.search(np.ascontiguousarray(query_embeddings, dtype='float32'), min(self.k, index.ntotal))
+
+        weights = np.clip(scores, 0.0, None)
+        totals = weights.sum(axis=1)
+        sales_weights = np.where(labels[indices], weights, 0.0).sum(axis=1)
+        return np.divide(sales_weights, totals, out=np.full(len(totals), 0.5), where=totals > 0)
@@ -0,0 +1,113 @@
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from utils.logger import logger
+
+@dataclass
+class RouteBudget:
+    history_tokens: int
+    sales_data_tokens: int = 0
+
+DEFAULT_BUDGETS = {
+    "router": RouteBudget(history_tokens=300),
+    "sales": RouteBudget(history_tokens=600, sales_data_tokens=750),
+    "general": RouteBudget(history_tokens=1200),
+}
+
+class PromptPacker:
+    """Fits conversation history and retrieved chunks into per-route token budgets.
+
+    Units are kept or dropped whole: history keeps the most recent exchanges
+    that fit, retrieved data keeps chunks in relevance order, skipping any
+    that would overflow. History arrives as the session's rendered exchanges
+    (``ConversationMemory.get_conversation_exchanges``), so answers that
+    contain "User: " can't split an exchange. The most relevant chunk is
+    always kept so a long record never leaves the prompt without data; if it
+    alone overflows the budget it is cut at a word boundary to fit.
+    """
+
+    def __init__(self, model_name: str = "gpt-3.5-turbo", budgets: Optional[Dict[str, RouteBudget]] = None,
+                 count_tokens: Optional[Callable[[str], int]] = None):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.count_tokens = count_tokens or self._load_token_counter(model_name)
+
+    @staticmethod
+    def _load_token_counter(model_name: str) -> Callable[[str], int]:
+        try:
+            import tiktoken
+            encoding = tiktoken.encoding_for_model(model_name)
+        except Exception as e:
+            # tiktoken downloads its BPE file on first use; offline hosts estimate instead.
+            logger.log_sync("PROMPT_PACKER", "TOKENIZER_FALLBACK", extra=f"tiktoken unavailable ({type(e).__name__}), estimating 4 chars per token")
+            return lambda text: math.ceil(len(text) / 4)
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+    def _pack_units(self, units: Sequence[str], budget: int, contiguous: bool) -> Tuple[List[str], int, int]:
+        kept = []
+        kept_tokens = 0
+        total_tokens = 0
+        blocked = False
+
+        for unit in units:
+            tokens = self.count_tokens(unit)
+            total_tokens += tokens
+            if not blocked and kept_tokens + tokens <= budget:
+                kept.append(unit)
+                kept_tokens += tokens
+            elif contiguous:
+                blocked = True
+
+        return kept, kept_tokens, total_tokens
+
+    def _truncate(self, text: str, budget: int) -> str:
+        """Longest prefix of whole words within ``budget`` tokens, by binary search over the word count."""
+        words = text.split(" ")
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(" ".join(words[:middle])) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        return " ".join(words[:low])
+
+    def pack(self, route: str, session_id: str, conversation_history: Optional[Sequence[str]],
+             sales_data: Optional[str] = None, reserved_data_tokens: int = 0) -> Tuple[str, Optional[str]]:
+        """Returns ``(conversation_history, sales_data)`` as prompt text trimmed to the route's budget.
+
+        ``conversation_history`` is the session's rendered exchanges, oldest first.
+        ``reserved_data_tokens`` comes out of the sales data budget for other
+        data the caller puts in the prompt, such as exact totals.
+        """
+        budget = self.budgets[route]
+        data_budget = max(budget.sales_data_tokens - reserved_data_tokens, 0)
+
+        exchanges = list(conversation_history or ())
+        kept_exchanges, history_tokens, history_total = self._pack_units(list(reversed(exchanges)), budget.history_tokens, contiguous=True)
+        history_text = "\n".join(reversed(kept_exchanges))
+
+        chunks = sales_data.split("\n") if sales_data else []
+        kept_chunks, data_tokens, data_total = [], 0, 0
+        truncated = False
+        if chunks:
+            first = chunks[0]
+            data_tokens = data_total = self.count_tokens(first)
+            if data_tokens > data_budget:
+                first = self._truncate(first, data_budget)
+                data_tokens = self.count_tokens(first)
+                truncated = True
+            kept_chunks, rest_tokens, rest_total = self._pack_units(chunks[1:], data_budget - data_tokens, contiguous=False)
+            kept_chunks.insert(0, first)
+            data_tokens += rest_tokens
+            data_total += rest_total
+        if truncated or len(kept_chunks) < len(chunks):
+            sales_data = "\n".join(kept_chunks)
+
+        saved = (history_total - history_tokens) + (data_total - data_tokens)
+        logger.log_sync(
+            session_id, "PROMPT_PACKED",
+            extra=f"Route: {route} | Tokens: {history_tokens + data_tokens + reserved_data_tokens} | Saved: {saved} | "
+                  f"Dropped: {len(exchanges) - len(kept_exchanges)} exchanges, {len(chunks) - len(kept_chunks)} chunks"
+                  f"{' | First chunk truncated' if truncated else ''}"
+        )
+        return history_text, sales_data
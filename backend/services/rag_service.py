@@ -1,21 +1,51 @@
+import asyncio
 import json
 import time
 import faiss
 import numpy as np
-import re
-from typing import List, Dict, Any, Set
-from sentence_transformers import SentenceTransformer
+import heapq
+from dataclasses import dataclass
+from typing import List, Dict, Any, Set, Optional, Iterable, AsyncIterator, Sequence
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from functools import lru_cache
 from models.schemas import SalesRepData
 from utils.logger import logger
+from utils.metrics import CACHE_LOOKUPS, LLM_DURATION, RETRIEVAL_DURATION
+from utils.tracing import span
 from services.conversation_memory import conversation_memory
+from services.keyword_matcher import KeywordMatcher
+from services.retrieval_cache import RetrievalCache
+from services.embedding_store import EmbeddingStore, hash_sales_data
+from services.vector_index import IndexConfig, build_index, apply_search_params, add_vectors, remove_vectors, renumber_ids
+from services.prompt_packer import PromptPacker
+from services.embedding_backend import EmbeddingBackend, SentenceTransformerBackend
+from services.sales_analytics import SalesAnalyticsService
+
+@dataclass
+class RetrievalState:
+    sales_data: Dict[str, Any]
+    keyword_matcher: KeywordMatcher
+    chunks: Dict[int, str]
+    metadata: Dict[int, Dict[str, Any]]
+    entity_index: Dict[str, List[int]]
+    index: Any = None
+    embeddings: Optional[np.ndarray] = None
+    next_chunk_id: int = 0
+    version: int = 0
 
 class RAGService:
-    def __init__(self, openai_api_key: str, sales_data: Dict[str, Any]):
-        self.sales_data = sales_data
-        self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+    def __init__(self, openai_api_key: str, sales_data: Dict[str, Any], keyword_matcher: Optional[KeywordMatcher] = None,
+                 max_concurrency: int = 16, retrieval_cache: Optional[RetrievalCache] = None,
+                 embedding_store: Optional[EmbeddingStore] = None, index_config: Optional[IndexConfig] = None,
+                 prompt_packer: Optional[PromptPacker] = None, embedding_backend: Optional[EmbeddingBackend] = None,
+                 sales_analytics: Optional[SalesAnalyticsService] = None):
+        self.llm_semaphore = asyncio.Semaphore(max_concurrency)
+        self.prompt_packer = prompt_packer or PromptPacker()
+        self.embedding_model = embedding_backend or SentenceTransformerBackend()
+        self.embedding_model_name = self.embedding_model.name
+        self.embedding_store = embedding_store
+        self.index_config = index_config or IndexConfig()
+        self.sales_analytics = sales_analytics
         
         self.rag_model = ChatOpenAI(
             model="gpt-3.5-turbo",
@@ -25,10 +55,11 @@ class RAGService:
         )
         
         self.rag_prompt = PromptTemplate(
-            input_variables=["question", "sales_data", "conversation_history"],
+            input_variables=["question", "sales_data", "sales_totals", "conversation_history"],
             template=(
                 "You are a sales data assistant. Answer the question using the provided sales data.\n\n"
                 "Previous conversation:\n{conversation_history}\n\n"
+                "Sales Totals (exact, across all reps):\n{sales_totals}\n\n"
                 "Sales Data:\n{sales_data}\n\n"
                 "Current question: {question}\n\n"
                 "If multiple people are mentioned in the question, provide information about ALL of them. "
@@ -39,145 +70,401 @@ class RAGService:
         
         self.rag_chain = self.rag_prompt | self.rag_model
         
-        self.sales_chunks = []
-        self.sales_index = None
-        self.sales_metadata = []
-        self.cache = {}
-        self.sales_keywords = set()
-        
-        self._initialize_vector_store()
-        self._extract_sales_keywords()
+        self.retrieval_cache = retrieval_cache or RetrievalCache()
+        self.state = self._initialize_vector_store(sales_data, keyword_matcher or KeywordMatcher.from_sales_data(sales_data))
 
-    def _extract_sales_keywords(self):
-        for rep in self.sales_data.get("salesReps", []):
-            name_parts = rep["name"].lower().split()
-            self.sales_keywords.update(name_parts)
-            
-            self.sales_keywords.add(rep["role"].lower())
-            self.sales_keywords.add(rep["region"].lower())
-            
-            for skill in rep.get("skills", []):
-                self.sales_keywords.add(skill.lower())
-            
-            for client in rep.get("clients", []):
-                self.sales_keywords.add(client["name"].lower())
-            
-            for deal in rep.get("deals", []):
-                self.sales_keywords.add(deal["client"].lower())
+    @property
+    def sales_data(self) -> Dict[str, Any]:
+        return self.state.sales_data
+
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        return self.state.keyword_matcher
+
+    @property
+    def sales_chunks(self) -> Dict[int, str]:
+        return self.state.chunks
+
+    @property
+    def sales_metadata(self) -> Dict[int, Dict[str, Any]]:
+        return self.state.metadata
 
-    def _extract_mentioned_names(self, question: str) -> Set[str]:
-        question_lower = question.lower()
-        mentioned_keywords = set()
+    @property
+    def entity_index(self) -> Dict[str, List[int]]:
+        return self.state.entity_index
+
+    @property
+    def sales_index(self):
+        return self.state.index
+
+    @property
+    def sales_embeddings(self) -> Optional[np.ndarray]:
+        return self.state.embeddings
+
+    def _extract_mentioned_names(self, question: str, state: Optional[RetrievalState] = None) -> Set[str]:
+        return (state or self.state).keyword_matcher.find_all(question)
+
+    def _initialize_vector_store(self, sales_data: Dict[str, Any], keyword_matcher: KeywordMatcher) -> RetrievalState:
+        chunks, metadata = self._create_sales_chunks(sales_data.get("salesReps", []))
+        state = RetrievalState(
+            sales_data=sales_data,
+            keyword_matcher=keyword_matcher,
+            chunks=chunks,
+            metadata=metadata,
+            entity_index=self._build_entity_index(sales_data, metadata),
+            next_chunk_id=len(chunks)
+        )
         
-        for keyword in self.sales_keywords:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', question_lower):
-                mentioned_keywords.add(keyword)
+        if not chunks:
+            return state
         
-        return mentioned_keywords
+        if self.embedding_store is not None:
+            state.embeddings, state.index = self.embedding_store.load_or_build(
+                list(chunks.values()),
+                hash_sales_data(sales_data),
+                self.embedding_model_name,
+                self.index_config.spec(),
+                self.embedding_model.encode,
+                self._build_index
+            )
+            apply_search_params(state.index, self.index_config)
+            return state
+        
+        state.embeddings = self._encode_chunks(list(chunks.values()))
+        state.index = self._build_index(state.embeddings)
+        return state
 
-    def _initialize_vector_store(self):
-        self.sales_chunks, self.sales_metadata = self._create_sales_chunks()
+    def _encode_chunks(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.embedding_model.get_sentence_embedding_dimension()), dtype='float32')
         
-        if self.sales_chunks:
-            embeddings = self.embedding_model.encode(self.sales_chunks)
-            dimension = embeddings.shape[1]
-            self.sales_index = faiss.IndexFlatIP(dimension)
-            faiss.normalize_L2(embeddings)
-            self.sales_index.add(embeddings.astype('float32'))
+        embeddings = np.asarray(self.embedding_model.encode(texts), dtype='float32')
+        faiss.normalize_L2(embeddings)
+        return embeddings
 
-    def _create_sales_chunks(self):
-        chunks = []
-        metadata = []
+    def _build_index(self, embeddings: np.ndarray, ids: Optional[np.ndarray] = None):
+        return build_index(embeddings, self.index_config, ids)
+
+    @staticmethod
+    def _create_sales_chunks(reps: List[Dict[str, Any]], first_chunk_id: int = 0):
+        chunks: Dict[int, str] = {}
+        metadata: Dict[int, Dict[str, Any]] = {}
+        chunk_id = first_chunk_id
+        
+        def add(text: str, meta: Dict[str, Any]):
+            nonlocal chunk_id
+            chunks[chunk_id] = text
+            metadata[chunk_id] = meta
+            chunk_id += 1
         
-        for rep in self.sales_data.get("salesReps", []):
+        for rep in reps:
             profile_text = f"Sales Rep: {rep['name']}, Role: {rep['role']}, Region: {rep['region']}, Skills: {', '.join(rep['skills'])}"
-            chunks.append(profile_text)
-            metadata.append({"type": "profile", "rep_id": rep["id"], "rep_name": rep["name"]})
+            add(profile_text, {"type": "profile", "rep_id": rep["id"], "rep_name": rep["name"]})
             
             if rep.get("deals"):
                 deals_text = f"{rep['name']} deals: "
                 for deal in rep["deals"]:
                     deals_text += f"Client {deal['client']} - ${deal['value']} - {deal['status']}; "
-                chunks.append(deals_text)
-                metadata.append({"type": "deals", "rep_id": rep["id"], "rep_name": rep["name"]})
+                add(deals_text, {"type": "deals", "rep_id": rep["id"], "rep_name": rep["name"]})
             
             if rep.get("clients"):
                 clients_text = f"{rep['name']} clients: "
                 for client in rep["clients"]:
                     clients_text += f"{client['name']} ({client['industry']}) - {client['contact']}; "
-                chunks.append(clients_text)
-                metadata.append({"type": "clients", "rep_id": rep["id"], "rep_name": rep["name"]})
+                add(clients_text, {"type": "clients", "rep_id": rep["id"], "rep_name": rep["name"]})
         
         return chunks, metadata
 
-    @lru_cache(maxsize=100)
-    def _search_sales_data(self, question: str, top_k: int = 5) -> str:
-        if self.sales_index is None or not self.sales_chunks:
-            return json.dumps(self.sales_data.get("salesReps", [])[:2])
+    def _build_entity_index(self, sales_data: Dict[str, Any], metadata: Dict[int, Dict[str, Any]]) -> Dict[str, List[int]]:
+        reps_by_id = {rep["id"]: rep for rep in sales_data.get("salesReps", [])}
+        index: Dict[str, Set[int]] = {}
         
-        cache_key = f"{question.lower().strip()}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        def add(term: str, chunk_id: int):
+            index.setdefault(term.lower(), set()).add(chunk_id)
         
-        mentioned_keywords = self._extract_mentioned_names(question)
-        relevant_info = set()
+        for chunk_id, meta in metadata.items():
+            rep = reps_by_id.get(meta["rep_id"])
+            if rep is None:
+                continue
+            
+            add(rep["name"], chunk_id)
+            for name_part in rep["name"].split():
+                add(name_part, chunk_id)
+            
+            if meta["type"] == "profile":
+                add(rep["role"], chunk_id)
+                add(rep["region"], chunk_id)
+                for skill in rep.get("skills", []):
+                    add(skill, chunk_id)
+            elif meta["type"] == "deals":
+                for deal in rep.get("deals", []):
+                    add(deal["client"], chunk_id)
+                    add(deal["status"], chunk_id)
+            elif meta["type"] == "clients":
+                for client in rep.get("clients", []):
+                    add(client["name"], chunk_id)
+                    add(client["industry"], chunk_id)
+        
+        return {term: sorted(chunk_ids) for term, chunk_ids in index.items()}
+
+    def apply_sales_data(self, sales_data: Dict[str, Any], changed_rep_ids: Set[Any], keyword_matcher: KeywordMatcher) -> Dict[str, int]:
+        """Build the next retrieval state off to the side, then swap it in.
+
+        Only chunks of reps in ``changed_rep_ids`` (added, removed or modified)
+        are re-embedded; their old vectors are removed from a copy of the index
+        so in-flight searches keep using the previous state untouched. The new
+        state is then written to the embedding store for the next cold start.
+        """
+        old = self.state
+        
+        stale_ids = [chunk_id for chunk_id, meta in old.metadata.items() if meta["rep_id"] in changed_rep_ids]
+        stale = set(stale_ids)
+        fresh_reps = [rep for rep in sales_data.get("salesReps", []) if rep["id"] in changed_rep_ids]
+        new_chunks, new_metadata = self._create_sales_chunks(fresh_reps, old.next_chunk_id)
+        
+        chunks = {chunk_id: text for chunk_id, text in old.chunks.items() if chunk_id not in stale}
+        chunks.update(new_chunks)
+        metadata = {chunk_id: meta for chunk_id, meta in old.metadata.items() if chunk_id not in stale}
+        metadata.update(new_metadata)
+        
+        new_embeddings = self._encode_chunks(list(new_chunks.values()))
+        new_ids = np.array(list(new_chunks.keys()), dtype='int64')
+        
+        if old.embeddings is not None and len(old.embeddings):
+            kept_rows = [row for row, chunk_id in enumerate(old.chunks) if chunk_id not in stale]
+            embeddings = np.vstack([np.asarray(old.embeddings[kept_rows], dtype='float32'), new_embeddings])
+        else:
+            embeddings = new_embeddings
         
-        if mentioned_keywords:
-            for keyword in mentioned_keywords:
-                keyword_results = self._search_by_keyword(keyword, top_k=3)
-                relevant_info.update(keyword_results)
+        index = None
+        if chunks:
+            index = faiss.clone_index(old.index) if old.index is not None else None
+            if index is None or not remove_vectors(index, np.array(stale_ids, dtype='int64')):
+                index = self._build_index(embeddings, np.array(list(chunks.keys()), dtype='int64'))
+            else:
+                add_vectors(index, new_embeddings, new_ids)
+            apply_search_params(index, self.index_config)
+        
+        self.state = RetrievalState(
+            sales_data=sales_data,
+            keyword_matcher=keyword_matcher,
+            chunks=chunks,
+            metadata=metadata,
+            entity_index=self._build_entity_index(sales_data, metadata),
+            index=index,
+            embeddings=embeddings,
+            next_chunk_id=old.next_chunk_id + len(new_chunks),
+            version=old.version + 1
+        )
+        
+        if self.embedding_store is not None and chunks:
+            try:
+                self._persist_state(self.state)
+            except Exception as e:
+                logger.log_sync("RAG_SERVICE", "EMBEDDING_CACHE_ERROR", extra=f"Failed to save reloaded embeddings: {str(e)}")
+        
+        return {"chunks_removed": len(stale_ids), "chunks_embedded": len(new_chunks), "chunks_total": len(chunks)}
+
+    def _persist_state(self, state: RetrievalState):
+        """Saves ``state`` to the embedding store in cold-start chunk order, so a restart on this data re-embeds nothing."""
+        rep_positions = {rep["id"]: position for position, rep in enumerate(state.sales_data.get("salesReps", []))}
+        # A rep's chunks are created together, so within a rep their ids already follow the cold-start order.
+        order = sorted(state.chunks, key=lambda chunk_id: (rep_positions[state.metadata[chunk_id]["rep_id"]], chunk_id))
+        rows = {chunk_id: row for row, chunk_id in enumerate(state.chunks)}
+        embeddings = np.ascontiguousarray(state.embeddings[[rows[chunk_id] for chunk_id in order]], dtype='float32')
+        
+        index = renumber_ids(state.index, {chunk_id: position for position, chunk_id in enumerate(order)})
+        if index is None:
+            index = self._build_index(embeddings)
+        
+        self.embedding_store.save(
+            [state.chunks[chunk_id] for chunk_id in order],
+            hash_sales_data(state.sales_data),
+            self.embedding_model_name,
+            self.index_config.spec(),
+            embeddings,
+            index
+        )
+
+    def _search_sales_data(self, question: str, top_k: int = 5, embedding: Optional[np.ndarray] = None) -> str:
+        """``embedding``, if given, is the question's normalised ``(1, dim)`` row; otherwise it is encoded on a vector search."""
+        state = self.state
         
-        if not relevant_info:
-            query_embedding = self.embedding_model.encode([question])
-            faiss.normalize_L2(query_embedding)
-            scores, indices = self.sales_index.search(query_embedding.astype('float32'), top_k)
+        if state.index is None or not state.chunks:
+            return json.dumps(state.sales_data.get("salesReps", [])[:2])
+        
+        start_time = time.perf_counter()
+        cache_key = self.retrieval_cache.make_key(question, top_k, state.version)
+        cached = self.retrieval_cache.get(cache_key)
+        if cached is not None:
+            CACHE_LOOKUPS.inc("retrieval", "hit")
+            RETRIEVAL_DURATION.observe(time.perf_counter() - start_time, "cache")
+            return cached
+        CACHE_LOOKUPS.inc("retrieval", "miss")
+        
+        mentioned_keywords = self._extract_mentioned_names(question, state)
+        relevant_ids = self._search_by_keywords(mentioned_keywords, top_k=3, state=state) if mentioned_keywords else []
+        source = "entity_index"
+        
+        if not relevant_ids:
+            source = "faiss"
+            if embedding is None:
+                with span("embedding.encode", "embedding", caller="rag"):
+                    embedding = np.asarray(self.embedding_model.encode([question]), dtype='float32')
+                faiss.normalize_L2(embedding)
+            with span("rag.vector_search", "search", top_k=top_k):
+                scores, indices = state.index.search(np.ascontiguousarray(embedding, dtype='float32'), top_k)
             
-            for i, idx in enumerate(indices[0]):
-                if scores[0][i] > 0.25:
-                    chunk = self.sales_chunks[idx]
-                    relevant_info.add(chunk)
+            self._add_vector_hits(state, relevant_ids, scores[0], indices[0])
         
-        result = "\n".join(list(relevant_info)[:6]) if relevant_info else "Limited sales rep data available."
-        self.cache[cache_key] = result
+        result = self._format_chunks(state, relevant_ids)
+        self.retrieval_cache.set(cache_key, result)
+        RETRIEVAL_DURATION.observe(time.perf_counter() - start_time, source)
         return result
     
-    def _search_by_keyword(self, keyword: str, top_k: int = 3) -> List[str]:
-        matching_chunks = []
+    def _add_vector_hits(self, state: RetrievalState, relevant_ids: List[int], scores: np.ndarray, indices: np.ndarray):
+        for score, idx in zip(scores, indices):
+            if idx in state.chunks and score > 0.25 and idx not in relevant_ids:
+                relevant_ids.append(int(idx))
+    
+    def _format_chunks(self, state: RetrievalState, relevant_ids: List[int]) -> str:
+        return "\n".join(state.chunks[idx] for idx in relevant_ids[:6]) if relevant_ids else "Limited sales rep data available."
+    
+    def encode_questions(self, questions: List[str]) -> np.ndarray:
+        """Embeds many questions in one ``encode`` call; rows are L2-normalised float32."""
+        if not questions:
+            return np.zeros((0, self.embedding_model.get_sentence_embedding_dimension()), dtype='float32')
+        with span("embedding.encode", "embedding", caller="batch", size=len(questions)):
+            embeddings = np.asarray(self.embedding_model.encode(questions), dtype='float32')
+        faiss.normalize_L2(embeddings)
+        return embeddings
+    
+    def _search_sales_data_batch(self, questions: List[str], embeddings: np.ndarray, top_k: int = 5) -> List[str]:
+        """``_search_sales_data`` for many questions, with one FAISS search for every question the entity index can't answer."""
+        state = self.state
+        
+        if state.index is None or not state.chunks:
+            return [json.dumps(state.sales_data.get("salesReps", [])[:2])] * len(questions)
+        
+        start_time = time.perf_counter()
+        cache_keys = [self.retrieval_cache.make_key(question, top_k, state.version) for question in questions]
+        results: List[Optional[str]] = [None] * len(questions)
+        relevant: Dict[int, List[int]] = {}
+        
+        for row, question in enumerate(questions):
+            cached = self.retrieval_cache.get(cache_keys[row])
+            if cached is not None:
+                CACHE_LOOKUPS.inc("retrieval", "hit")
+                results[row] = cached
+                continue
+            CACHE_LOOKUPS.inc("retrieval", "miss")
+            
+            mentioned_keywords = self._extract_mentioned_names(question, state)
+            relevant[row] = self._search_by_keywords(mentioned_keywords, top_k=3, state=state) if mentioned_keywords else []
+        
+        vector_rows = [row for row, relevant_ids in relevant.items() if not relevant_ids]
+        if vector_rows:
+            with span("rag.vector_search", "search", top_k=top_k, size=len(vector_rows)):
+                scores, indices = state.index.search(np.ascontiguousarray(embeddings[vector_rows]), top_k)
+            for row, row_scores, row_indices in zip(vector_rows, scores, indices):
+                self._add_vector_hits(state, relevant[row], row_scores, row_indices)
+        
+        for row, relevant_ids in relevant.items():
+            results[row] = self._format_chunks(state, relevant_ids)
+            self.retrieval_cache.set(cache_keys[row], results[row])
+        
+        RETRIEVAL_DURATION.observe(time.perf_counter() - start_time, "batch")
+        return results
+    
+    def _search_by_keywords(self, keywords: Iterable[str], top_k: int = 3, state: Optional[RetrievalState] = None) -> List[int]:
+        entity_index = (state or self.state).entity_index
+        postings = [entity_index.get(keyword.lower(), [])[:top_k] for keyword in keywords]
+        merged = []
         
-        for i, chunk in enumerate(self.sales_chunks):
-            if re.search(r'\b' + re.escape(keyword) + r'\b', chunk.lower()):
-                matching_chunks.append(chunk)
-                if len(matching_chunks) >= top_k:
-                    break
+        for idx in heapq.merge(*postings):
+            if not merged or merged[-1] != idx:
+                merged.append(idx)
         
-        return matching_chunks
+        return merged
 
-    async def process_sales_question(self, question: str, session_id: str) -> str:
+    async def retrieve(self, question: str, session_id: str, embedding: Optional[np.ndarray] = None) -> str:
         start_time = time.time()
         
         logger.log_sync(session_id, "RAG_SEARCH_START", extra="Searching sales data")
         
-        sales_data = self._search_sales_data(question, top_k=5)
+        with span("rag.retrieve", "rag"):
+            sales_data = await asyncio.to_thread(self._search_sales_data, question, 5, embedding)
         
         search_duration = time.time() - start_time
         logger.log_sync(session_id, "RAG_SEARCH_END", search_duration, f"Retrieved {len(sales_data)} chars")
         
-        if len(sales_data) > 3000:
-            sales_data = sales_data[:2500]
-            logger.log_sync(session_id, "RAG_DATA_TRUNCATED", extra="Data truncated to 2500 chars")
+        return sales_data
+
+    async def retrieve_batch(self, questions: List[str], embeddings: np.ndarray, session_id: str) -> List[str]:
+        start_time = time.time()
         
-        openai_start = time.time()
-        logger.log_sync(session_id, "RAG_OPENAI_START", extra="Generating response")
+        logger.log_sync(session_id, "RAG_BATCH_SEARCH_START", extra=f"Searching sales data for {len(questions)} questions")
         
-        conversation_history = await conversation_memory.get_conversation_context(session_id)
+        with span("rag.retrieve", "rag", size=len(questions)):
+            results = await asyncio.to_thread(self._search_sales_data_batch, questions, embeddings, 5)
         
-        response = self.rag_chain.invoke({
+        logger.log_sync(session_id, "RAG_BATCH_SEARCH_END", time.time() - start_time, f"Retrieved {sum(len(r) for r in results)} chars")
+        
+        return results
+
+    async def _prepare_prompt_inputs(self, question: str, session_id: str, sales_data: Optional[str] = None, conversation_history: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        if sales_data is None:
+            sales_data = await self.retrieve(question, session_id)
+        
+        if conversation_history is None:
+            conversation_history = await conversation_memory.get_conversation_exchanges(session_id)
+        
+        # Retrieved chunks cover a few reps; totals and rankings come from the analytics store instead.
+        sales_totals = "Not available"
+        reserved_tokens = 0
+        if self.sales_analytics is not None:
+            with span("analytics.prompt_summary", "analytics"):
+                sales_totals = self.sales_analytics.current().prompt_summary()
+            reserved_tokens = self.prompt_packer.count_tokens(sales_totals)
+        
+        conversation_history, sales_data = self.prompt_packer.pack("sales", session_id, conversation_history, sales_data, reserved_tokens)
+        
+        return {
             "question": question,
             "sales_data": sales_data,
+            "sales_totals": sales_totals,
             "conversation_history": conversation_history or "No previous conversation"
-        })
+        }
+
+    async def process_sales_question(self, question: str, session_id: str, sales_data: Optional[str] = None, conversation_history: Optional[Sequence[str]] = None) -> str:
+        prompt_inputs = await self._prepare_prompt_inputs(question, session_id, sales_data, conversation_history)
+        
+        openai_start = time.time()
+        logger.log_sync(session_id, "RAG_OPENAI_START", extra="Generating response")
+        
+        async with self.llm_semaphore:
+            with span("rag.generate", "llm"):
+                response = await self.rag_chain.ainvoke(prompt_inputs)
         
         openai_duration = time.time() - openai_start
+        LLM_DURATION.observe(openai_duration, "rag", "invoke")
         logger.log_sync(session_id, "RAG_OPENAI_END", openai_duration, f"Response generated")
         
         return response.content if hasattr(response, "content") else str(response)
+
+    async def stream_sales_question(self, question: str, session_id: str, sales_data: Optional[str] = None, conversation_history: Optional[Sequence[str]] = None) -> AsyncIterator[str]:
+        prompt_inputs = await self._prepare_prompt_inputs(question, session_id, sales_data, conversation_history)
+        
+        openai_start = time.time()
+        logger.log_sync(session_id, "RAG_OPENAI_START", extra="Streaming response")
+        
+        async with self.llm_semaphore:
+            with span("rag.generate", "llm", mode="stream"):
+                async for chunk in self.rag_chain.astream(prompt_inputs):
+                    delta = chunk.content if hasattr(chunk, "content") else str(chunk)
+                    if delta:
+                        yield delta
+        
+        openai_duration = time.time() - openai_start
+        LLM_DURATION.observe(openai_duration, "rag", "stream")
+        logger.log_sync(session_id, "RAG_OPENAI_END", openai_duration, "Response streamed")
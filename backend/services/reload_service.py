@@ -0,0 +1,127 @@
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+from utils.logger import logger
+from services.keyword_matcher import KeywordMatcher
+
+@dataclass
+class SalesDataDiff:
+    added: List[Any] = field(default_factory=list)
+    removed: List[Any] = field(default_factory=list)
+    changed: List[Any] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def changed_rep_ids(self) -> Set[Any]:
+        return set(self.added) | set(self.removed) | set(self.changed)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "reps_added": len(self.added),
+            "reps_removed": len(self.removed),
+            "reps_changed": len(self.changed),
+            "reps_unchanged": self.unchanged
+        }
+
+def diff_sales_reps(old_reps: List[Dict[str, Any]], new_reps: List[Dict[str, Any]]) -> SalesDataDiff:
+    old_by_id = {rep["id"]: rep for rep in old_reps}
+    new_by_id = {rep["id"]: rep for rep in new_reps}
+    diff = SalesDataDiff()
+
+    for rep_id, rep in new_by_id.items():
+        if rep_id not in old_by_id:
+            diff.added.append(rep_id)
+        elif old_by_id[rep_id] != rep:
+            diff.changed.append(rep_id)
+        else:
+            diff.unchanged += 1
+
+    diff.removed = [rep_id for rep_id in old_by_id if rep_id not in new_by_id]
+    return diff
+
+class ReloadService:
+    """Re-reads the sales data file and pushes only the differences into every service.
+
+    Each service builds its next state aside and swaps it in with a single
+    assignment, so requests keep being served from the previous state until
+    the swap. Reloads are serialized by a lock and run off the event loop.
+    """
+
+    def __init__(self, data_service, ai_router, rag_service, local_router=None):
+        self.data_service = data_service
+        self.ai_router = ai_router
+        self.rag_service = rag_service
+        self.local_router = local_router
+        self._lock = threading.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def reload(self, reason: str = "manual") -> Dict[str, Any]:
+        with self._lock:
+            start_time = time.time()
+            logger.log_sync("RELOAD", "RELOAD_START", extra=f"Reason: {reason}")
+
+            try:
+                new_data = self.data_service.read_data_file()
+            except Exception as e:
+                logger.log_sync("RELOAD", "RELOAD_ERROR", time.time() - start_time, f"Keeping current data: {str(e)}")
+                return {"status": "error", "detail": str(e)}
+
+            if new_data == self.data_service.get_sales_data():
+                logger.log_sync("RELOAD", "RELOAD_SKIPPED", time.time() - start_time, "Sales data unchanged")
+                return {"status": "unchanged"}
+
+            diff = diff_sales_reps(self.data_service.get_sales_reps(), new_data.get("salesReps", []))
+
+            keyword_matcher = KeywordMatcher.from_sales_data(new_data)
+            rag_stats = self.rag_service.apply_sales_data(new_data, diff.changed_rep_ids, keyword_matcher)
+            self.ai_router.apply_keyword_matcher(keyword_matcher)
+            if self.local_router is not None:
+                self.local_router.rebuild(self.rag_service.sales_embeddings)
+
+            self.data_service.set_sales_data(new_data)
+
+            duration = time.time() - start_time
+            result = {"status": "reloaded", **diff.summary(), **rag_stats, "duration": round(duration, 3)}
+            logger.log_sync("RELOAD", "RELOAD_COMPLETE", duration, " | ".join(f"{key}: {value}" for key, value in result.items()))
+            return result
+
+    async def reload_async(self, reason: str = "manual") -> Dict[str, Any]:
+        return await asyncio.to_thread(self.reload, reason)
+
+    def _data_file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.data_service.data_file_path).st_mtime
+        except OSError:
+            return None
+
+    async def _watch(self, interval_seconds: float):
+        last_mtime = self._data_file_mtime()
+
+        while True:
+            await asyncio.sleep(interval_seconds)
+            mtime = self._data_file_mtime()
+            if mtime is None or mtime == last_mtime:
+                continue
+
+            last_mtime = mtime
+            try:
+                await self.reload_async("file_watcher")
+            except Exception as e:
+                logger.log_sync("RELOAD", "RELOAD_ERROR", extra=f"Watcher reload failed: {str(e)}")
+
+    def start_watching(self, interval_seconds: float):
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.get_running_loop().create_task(self._watch(interval_seconds))
+            logger.log_sync("RELOAD", "WATCHER_STARTED", extra=f"Polling {self.data_service.data_file_path} every {interval_seconds}s")
+
+    async def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
@@ -0,0 +1,189 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from utils.logger import logger
+
+DIMENSIONS = ("rep", "region", "status", "industry", "client")
+METRICS = ("sum", "count", "mean", "max")
+UNKNOWN_INDUSTRY = "Unknown"
+
+class SalesAnalytics:
+    """Columnar, in-memory view of every deal for exact aggregates.
+
+    One row per deal: ``values`` holds the deal value as float64 and the
+    other columns hold integer codes into the matching vocabulary
+    (``labels[dimension]``). Filters become boolean masks and group-bys
+    become ``np.bincount`` over the code column, so a query is a handful of
+    vectorized passes instead of a walk over the nested rep JSON. A deal's
+    industry is its client's, looked up among the owning rep's clients.
+    Instances are immutable; reloads build a new one.
+    """
+
+    def __init__(self, values: np.ndarray, codes: Dict[str, np.ndarray], labels: Dict[str, List[str]]):
+        self.values = values
+        self.codes = codes
+        self.labels = labels
+        self._lookup = {dimension: {label.lower(): code for code, label in enumerate(names)} for dimension, names in labels.items()}
+
+    @classmethod
+    def from_sales_reps(cls, sales_reps: Sequence[Dict[str, Any]]) -> "SalesAnalytics":
+        vocabularies: Dict[str, Dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+        columns: Dict[str, List[int]] = {dimension: [] for dimension in DIMENSIONS}
+        values: List[float] = []
+
+        def code(dimension: str, label: str) -> int:
+            return vocabularies[dimension].setdefault(label, len(vocabularies[dimension]))
+
+        for rep in sales_reps:
+            # Reps without deals still get a code so they show up as filter values.
+            rep_code = code("rep", rep.get("name", str(rep.get("id"))))
+            region_code = code("region", rep.get("region", "Unknown"))
+            industries = {client.get("name"): client.get("industry") or UNKNOWN_INDUSTRY for client in rep.get("clients", [])}
+            for deal in rep.get("deals", []):
+                client = deal.get("client", "Unknown")
+                values.append(float(deal.get("value", 0) or 0))
+                columns["rep"].append(rep_code)
+                columns["region"].append(region_code)
+                columns["status"].append(code("status", deal.get("status", "Unknown")))
+                columns["industry"].append(code("industry", industries.get(client, UNKNOWN_INDUSTRY)))
+                columns["client"].append(code("client", client))
+
+        return cls(
+            np.array(values, dtype=np.float64),
+            {dimension: np.array(column, dtype=np.intp) for dimension, column in columns.items()},
+            {dimension: list(vocabulary) for dimension, vocabulary in vocabularies.items()}
+        )
+
+    @property
+    def deal_count(self) -> int:
+        return len(self.values)
+
+    def mask(self, filters: Optional[Dict[str, Iterable[str]]] = None, min_value: Optional[float] = None,
+             max_value: Optional[float] = None) -> np.ndarray:
+        """Rows matching every filter; values within one dimension are OR-ed, case-insensitively."""
+        selected = np.ones(self.deal_count, dtype=bool)
+        for dimension, wanted in (filters or {}).items():
+            if wanted is None:
+                continue
+            self._check_dimension(dimension)
+            # A per-code lookup table turns the membership test into one gather.
+            allowed = np.zeros(len(self.labels[dimension]), dtype=bool)
+            allowed[[self._lookup[dimension][label.lower()] for label in wanted if label.lower() in self._lookup[dimension]]] = True
+            selected &= allowed[self.codes[dimension]]
+        if min_value is not None:
+            selected &= self.values >= min_value
+        if max_value is not None:
+            selected &= self.values <= max_value
+        return selected
+
+    def _check_dimension(self, dimension: str):
+        if dimension not in self.codes:
+            raise ValueError(f"Unknown dimension '{dimension}', expected one of: {', '.join(DIMENSIONS)}")
+
+    def _aggregate(self, dimension: str, metric: str, selected: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        self._check_dimension(dimension)
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of: {', '.join(METRICS)}")
+
+        size = len(self.labels[dimension])
+        # Unselected rows go to an overflow bin at ``size``: cheaper than compressing every column by the mask.
+        codes = np.where(selected, self.codes[dimension], size)
+        counts = np.bincount(codes, minlength=size + 1)[:size]
+        if metric == "count":
+            return counts.astype(np.float64), counts
+        if metric == "max":
+            result = np.full(size + 1, -np.inf)
+            np.maximum.at(result, codes, self.values)
+            return result[:size], counts
+
+        sums = np.bincount(codes, weights=self.values, minlength=size + 1)[:size]
+        if metric == "sum":
+            return sums, counts
+        return np.divide(sums, counts, out=np.zeros(size), where=counts > 0), counts
+
+    def _groups(self, dimension: str, metric: str, result: np.ndarray, counts: np.ndarray, order: np.ndarray) -> List[Dict[str, Any]]:
+        labels = self.labels[dimension]
+        as_number = int if metric == "count" else float
+        return [{"key": labels[code], "value": as_number(result[code]), "deals": int(counts[code])} for code in order]
+
+    def group_by(self, dimension: str, metric: str = "sum", filters: Optional[Dict[str, Iterable[str]]] = None,
+                 min_value: Optional[float] = None, max_value: Optional[float] = None) -> List[Dict[str, Any]]:
+        """One entry per group with at least one matching deal, in first-seen order."""
+        result, counts = self._aggregate(dimension, metric, self.mask(filters, min_value, max_value))
+        return self._groups(dimension, metric, result, counts, np.flatnonzero(counts))
+
+    def top_k(self, dimension: str, k: int = 5, metric: str = "sum", filters: Optional[Dict[str, Iterable[str]]] = None,
+              min_value: Optional[float] = None, max_value: Optional[float] = None) -> List[Dict[str, Any]]:
+        """The ``k`` groups with the largest metric, largest first."""
+        result, counts = self._aggregate(dimension, metric, self.mask(filters, min_value, max_value))
+        present = np.flatnonzero(counts)
+        if k <= 0:
+            return []
+        if k < len(present):
+            present = present[np.argpartition(-result[present], k - 1)[:k]]
+        # Stable sort so ties keep first-seen order.
+        order = present[np.argsort(-result[present], kind="stable")]
+        return self._groups(dimension, metric, result, counts, order)
+
+    def summary(self, filters: Optional[Dict[str, Iterable[str]]] = None, min_value: Optional[float] = None,
+                max_value: Optional[float] = None) -> Dict[str, Any]:
+        selected = self.mask(filters, min_value, max_value)
+        values = self.values[selected]
+        return {
+            "deals": int(selected.sum()),
+            "total_value": float(values.sum()),
+            "average_value": float(values.mean()) if len(values) else 0.0,
+            "by_status": self.group_by("status", "sum", filters, min_value, max_value)
+        }
+
+    def prompt_summary(self, top: int = 3) -> str:
+        """Exact totals as one line for the RAG prompt, whose retrieved chunks only cover a few reps."""
+        if not self.deal_count:
+            return "No deals recorded."
+
+        def describe(groups: List[Dict[str, Any]]) -> str:
+            return ", ".join(f"{group['key']} ${group['value']:,.0f}" for group in groups)
+
+        won = {"status": ["Closed Won"]}
+        in_progress = {"status": ["In Progress"]}
+        parts = [
+            f"{self.deal_count} deals worth ${self.values.sum():,.0f} across {len(self.labels['rep'])} reps",
+            "by status: " + ", ".join(f"{group['key']} {group['deals']} deals ${group['value']:,.0f}" for group in self.group_by("status")),
+            "closed won by region: " + describe(self.top_k("region", len(self.labels["region"]), filters=won)),
+            f"top {top} reps by closed won value: " + describe(self.top_k("rep", top, filters=won)),
+            f"top {top} reps by open pipeline: " + describe(self.top_k("rep", top, filters=in_progress))
+        ]
+        return "; ".join(parts)
+
+class SalesAnalyticsService:
+    """Keeps a ``SalesAnalytics`` in step with ``DataService``.
+
+    The store is built on first use and rebuilt when ``data_service.version``
+    moves on, so reloads are picked up without a listener and the endpoints
+    don't wait for the AI services to warm up.
+    """
+
+    def __init__(self, data_service):
+        self.data_service = data_service
+        # (version, store) swapped as one reference so readers never see a mismatched pair.
+        self._built: Optional[Tuple[int, SalesAnalytics]] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> SalesAnalytics:
+        version = self.data_service.version
+        built = self._built
+        if built is not None and built[0] == version:
+            return built[1]
+
+        with self._lock:
+            built = self._built
+            if built is None or built[0] != version:
+                start_time = time.perf_counter()
+                analytics = SalesAnalytics.from_sales_reps(self.data_service.get_sales_reps())
+                built = self._built = (version, analytics)
+                logger.log_sync(
+                    "ANALYTICS", "ANALYTICS_BUILT", time.perf_counter() - start_time,
+                    f"Version {version} | {analytics.deal_count} deals | {len(analytics.labels['rep'])} reps"
+                )
+            return built[1]
@@ -0,0 +1,193 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+import faiss
+import numpy as np
+from utils.logger import logger
+from utils.tracing import span
+
+@dataclass
+class CachedAnswer:
+    question: str
+    answer: str
+    route_type: str
+    stored_at: float
+    similarity: float = 1.0
+    entities: FrozenSet[str] = frozenset()
+
+class SemanticCache:
+    """Answer cache keyed by question embedding similarity.
+
+    Entries are evicted in insertion order, which makes both the size bound and
+    the TTL a pop from the front of ``_entries``.
+
+    Questions that differ only in a name ("What deals does Alice have?" vs
+    "...Bob have?") embed almost identically, so with a ``keyword_matcher``
+    each entry also records the entities it mentions and a hit additionally
+    requires the same entity set.
+    """
+
+    # Neighbours checked per lookup, so an entity mismatch on the nearest one
+    # can still hit a slightly less similar entry about the right entities.
+    CANDIDATES = 8
+
+    def __init__(self, embedding_model, similarity_threshold: float = 0.9, max_size: int = 512, ttl_seconds: float = 900.0,
+                 keyword_matcher=None):
+        self.embedding_model = embedding_model
+        self.keyword_matcher = keyword_matcher
+        self.similarity_threshold = similarity_threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        dimension = embedding_model.get_sentence_embedding_dimension()
+        self.index = faiss.IndexIDMap(faiss.IndexFlatIP(dimension))
+        self._entries: "OrderedDict[int, CachedAnswer]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _embed(self, question: str) -> np.ndarray:
+        with span("embedding.encode", "embedding", caller="semantic_cache"):
+            embedding = self.embedding_model.encode([question]).astype('float32')
+        faiss.normalize_L2(embedding)
+        return embedding
+
+    def _entities(self, question: str) -> FrozenSet[str]:
+        if self.keyword_matcher is None:
+            return frozenset()
+        return frozenset(self.keyword_matcher.find_all(question))
+
+    def apply_keyword_matcher(self, keyword_matcher):
+        """Swap in the matcher for reloaded sales data; entries keyed by the old names are dropped."""
+        self.keyword_matcher = keyword_matcher
+        self.clear()
+
+    def _remove(self, entry_ids):
+        for entry_id in entry_ids:
+            self._entries.pop(entry_id, None)
+        if entry_ids:
+            self.index.remove_ids(np.array(entry_ids, dtype='int64'))
+
+    def _purge_expired(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = []
+        for entry_id, entry in self._entries.items():
+            if entry.stored_at >= cutoff:
+                break
+            expired.append(entry_id)
+
+        self._remove(expired)
+        self.expirations += len(expired)
+
+    def _match(self, scores: np.ndarray, ids: np.ndarray, entities: FrozenSet[str]) -> Tuple[Optional[CachedAnswer], float]:
+        """The most similar entry above the threshold with the same entities, from one row of search results."""
+        for score, entry_id in zip(scores, ids):
+            if score < self.similarity_threshold:
+                break
+            candidate = self._entries.get(int(entry_id))
+            if candidate is not None and candidate.entities == entities:
+                return candidate, float(score)
+        return None, float(scores[0])
+
+    def lookup(self, question: str, session_id: str, embedding: Optional[np.ndarray] = None) -> Tuple[Optional[CachedAnswer], np.ndarray]:
+        """``embedding``, if given, must be a normalised ``(1, dim)`` float32 row, e.g. from a batched encode."""
+        start_time = time.time()
+        if embedding is None:
+            embedding = self._embed(question)
+        entities = self._entities(question)
+
+        with self._lock:
+            self._purge_expired()
+
+            if self.index.ntotal == 0:
+                self.misses += 1
+                return None, embedding
+
+            scores, ids = self.index.search(embedding, min(self.CANDIDATES, self.index.ntotal))
+            entry, similarity = self._match(scores[0], ids[0], entities)
+
+            if entry is None:
+                self.misses += 1
+                reason = "entity mismatch" if similarity >= self.similarity_threshold else "below threshold"
+                logger.log_sync(session_id, "SEMANTIC_CACHE_MISS", time.time() - start_time, f"Best similarity: {similarity:.3f} | {reason}")
+                return None, embedding
+
+            self.hits += 1
+
+        logger.log_sync(session_id, "SEMANTIC_CACHE_HIT", time.time() - start_time, f"Similarity: {similarity:.3f} | Matched: {entry.question[:50]}")
+        return CachedAnswer(entry.question, entry.answer, entry.route_type, entry.stored_at, similarity, entry.entities), embedding
+
+    def lookup_batch(self, questions: Sequence[str], session_id: str, embeddings: np.ndarray) -> List[Optional[CachedAnswer]]:
+        """``lookup`` for many questions with one index search; ``embeddings`` holds their normalised rows, in order."""
+        start_time = time.time()
+        entities = [self._entities(question) for question in questions]
+        results: List[Optional[CachedAnswer]] = [None] * len(questions)
+
+        with self._lock:
+            self._purge_expired()
+
+            if self.index.ntotal == 0 or not questions:
+                self.misses += len(questions)
+                return results
+
+            scores, ids = self.index.search(np.ascontiguousarray(embeddings, dtype='float32'), min(self.CANDIDATES, self.index.ntotal))
+            for row in range(len(questions)):
+                entry, similarity = self._match(scores[row], ids[row], entities[row])
+                if entry is not None:
+                    results[row] = CachedAnswer(entry.question, entry.answer, entry.route_type, entry.stored_at, similarity, entry.entities)
+
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(questions) - hits
+
+        logger.log_sync(session_id, "SEMANTIC_CACHE_BATCH_LOOKUP", time.time() - start_time, f"Hits: {hits} of {len(questions)}")
+        return results
+
+    def store(self, question: str, answer: str, route_type: str, embedding: Optional[np.ndarray] = None):
+        if embedding is None:
+            embedding = self._embed(question)
+        entities = self._entities(question)
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+
+            self.index.add_with_ids(embedding, np.array([entry_id], dtype='int64'))
+            self._entries[entry_id] = CachedAnswer(question, answer, route_type, time.monotonic(), entities=entities)
+
+            overflow = len(self._entries) - self.max_size
+            if overflow > 0:
+                self._remove(list(itertools.islice(self._entries.keys(), overflow)))
+                self.evictions += overflow
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.index.reset()
+            self.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "similarity_threshold": self.similarity_threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
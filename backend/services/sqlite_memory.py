@@ -0,0 +1,208 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+from utils.logger import logger
+from services.conversation_memory import ConversationExchange, MemoryBackend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    last_active REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_active ON sessions(last_active);
+CREATE TABLE IF NOT EXISTS exchanges (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    user_message TEXT NOT NULL,
+    ai_response TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exchanges_session ON exchanges(session_id, seq);
+"""
+
+class SQLiteMemoryBackend(MemoryBackend):
+    """Conversation storage in a SQLite WAL database shared by every worker on a host.
+
+    ``append`` and ``delete`` only queue the change; a writer thread commits
+    queued changes in one transaction every ``flush_interval_seconds`` or once
+    ``batch_size`` sessions are pending. Reads overlay this process's pending
+    changes on the database, so a worker always sees its own writes and other
+    workers see them within one flush interval. A flush interval of 0 writes
+    through synchronously.
+
+    Every call may wait on SQLite locks, so the backend is ``blocking`` and
+    ``ConversationMemory`` runs it off the event loop.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        db_path: str = "conversations.db",
+        max_exchanges: int = 5,
+        session_timeout_minutes: int = 30,
+        flush_interval_seconds: float = 0.05,
+        batch_size: int = 256,
+        expire_interval_seconds: float = 60.0
+    ):
+        super().__init__(max_exchanges, session_timeout_minutes)
+        self.db_path = db_path
+        self.flush_interval = flush_interval_seconds
+        self.batch_size = batch_size
+        self.expire_interval = expire_interval_seconds
+        self._local = threading.local()
+        self._pending: Dict[str, Tuple[bool, List[ConversationExchange]]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._last_expire = 0.0
+        self.flushes = 0
+        self.rows_written = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+        self._writer = None
+        if self.flush_interval > 0:
+            self._writer = threading.Thread(target=self._write_loop, name="conversation-writer", daemon=True)
+            self._writer.start()
+        logger.log_sync("MEMORY", "SQLITE_BACKEND_READY", extra=f"{db_path} | flush every {flush_interval_seconds}s or {batch_size} sessions")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _cutoff(self) -> float:
+        return time.time() - self.timeout_minutes * 60
+
+    def append(self, session_id: str, exchange: ConversationExchange):
+        with self._pending_lock:
+            cleared, exchanges = self._pending.get(session_id, (False, []))
+            exchanges.append(exchange)
+            self._pending[session_id] = (cleared, exchanges[-self.max_exchanges:])
+            pending_count = len(self._pending)
+        self._after_enqueue(pending_count)
+
+    def delete(self, session_id: str):
+        with self._pending_lock:
+            self._pending[session_id] = (True, [])
+            pending_count = len(self._pending)
+        self._after_enqueue(pending_count)
+
+    def _after_enqueue(self, pending_count: int):
+        if self._writer is None:
+            self.flush()
+        elif pending_count >= self.batch_size:
+            self._wakeup.set()
+
+    def get_exchanges(self, session_id: str) -> List[ConversationExchange]:
+        with self._flush_lock:
+            with self._pending_lock:
+                cleared, pending = self._pending.get(session_id, (False, []))
+                pending = list(pending)
+
+            stored = []
+            if not cleared:
+                rows = self._connection().execute(
+                    "SELECT e.user_message, e.ai_response, e.created_at FROM exchanges e "
+                    "JOIN sessions s ON s.session_id = e.session_id "
+                    "WHERE e.session_id = ? AND s.last_active >= ? ORDER BY e.seq DESC LIMIT ?",
+                    (session_id, self._cutoff(), self.max_exchanges)
+                ).fetchall()
+                stored = [
+                    ConversationExchange(user_message, ai_response, datetime.fromtimestamp(created_at))
+                    for user_message, ai_response, created_at in reversed(rows)
+                ]
+
+        return (stored + pending)[-self.max_exchanges:]
+
+    def flush(self):
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            now = time.time()
+            expire = now - self._last_expire >= self.expire_interval
+            if not pending and not expire:
+                return
+
+            connection = self._connection()
+            rows_written = 0
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for session_id, (cleared, exchanges) in pending.items():
+                    if cleared:
+                        connection.execute("DELETE FROM exchanges WHERE session_id = ?", (session_id,))
+                        connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                    if not exchanges:
+                        continue
+
+                    connection.executemany(
+                        "INSERT INTO exchanges (session_id, user_message, ai_response, created_at) VALUES (?, ?, ?, ?)",
+                        [(session_id, e.user_message, e.ai_response, e.timestamp.timestamp()) for e in exchanges]
+                    )
+                    connection.execute(
+                        "INSERT INTO sessions (session_id, last_active) VALUES (?, ?) "
+                        "ON CONFLICT(session_id) DO UPDATE SET last_active = excluded.last_active",
+                        (session_id, now)
+                    )
+                    connection.execute(
+                        "DELETE FROM exchanges WHERE session_id = ? AND seq NOT IN "
+                        "(SELECT seq FROM exchanges WHERE session_id = ? ORDER BY seq DESC LIMIT ?)",
+                        (session_id, session_id, self.max_exchanges)
+                    )
+                    rows_written += len(exchanges)
+
+                if expire:
+                    cutoff = now - self.timeout_minutes * 60
+                    connection.execute(
+                        "DELETE FROM exchanges WHERE session_id IN (SELECT session_id FROM sessions WHERE last_active < ?)",
+                        (cutoff,)
+                    )
+                    connection.execute("DELETE FROM sessions WHERE last_active < ?", (cutoff,))
+                    self._last_expire = now
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                self._requeue(pending)
+                raise
+
+            self.flushes += 1
+            self.rows_written += rows_written
+
+    def _requeue(self, failed: Dict[str, Tuple[bool, List[ConversationExchange]]]):
+        with self._pending_lock:
+            for session_id, (cleared, exchanges) in failed.items():
+                newer_cleared, newer = self._pending.get(session_id, (False, []))
+                if newer_cleared:
+                    continue
+                self._pending[session_id] = (cleared, (exchanges + newer)[-self.max_exchanges:])
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.log_sync("MEMORY", "SQLITE_FLUSH_ERROR", extra=f"Error: {str(e)}")
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._wakeup.set()
+            self._writer.join()
+        self.flush()
+        logger.log_sync("MEMORY", "SQLITE_BACKEND_CLOSED", extra=f"{self.flushes} flushes | {self.rows_written} exchanges written")
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+import faiss
+import numpy as np
+from utils.logger import logger
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+@dataclass
+class IndexConfig:
+    index_type: str = "flat"
+    nlist: int = 256
+    nprobe: int = 16
+    pq_m: int = 48
+    pq_bits: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+
+    def __post_init__(self):
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown FAISS index type '{self.index_type}', expected one of {', '.join(INDEX_TYPES)}")
+
+    def spec(self) -> str:
+        """Build-time parameters only; nprobe and efSearch do not change the stored index."""
+        if self.index_type == "ivf_flat":
+            return f"ivf_flat:nlist={self.nlist}|ids"
+        if self.index_type == "ivf_pq":
+            return f"ivf_pq:nlist={self.nlist},m={self.pq_m},bits={self.pq_bits}|ids"
+        if self.index_type == "hnsw":
+            return f"hnsw:m={self.hnsw_m},efc={self.ef_construction}|ids"
+        return "flat_ip|ids"
+
+def build_index(embeddings: np.ndarray, config: IndexConfig, ids: Optional[np.ndarray] = None):
+    """Build an ID-mapped inner-product index over L2-normalized embeddings.
+
+    Search results are the given ``ids`` (row positions by default). IVF
+    variants need enough vectors to train; smaller corpora fall back to a
+    flat index since a brute-force scan is already cheapest there.
+    """
+    count, dimension = embeddings.shape
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+    index_type = config.index_type
+
+    if index_type == "ivf_pq" and count < (1 << config.pq_bits) * 4:
+        logger.log_sync("RAG_SERVICE", "INDEX_FALLBACK", extra=f"{count} vectors too few to train ivf_pq, using flat")
+        index_type = "flat"
+    elif index_type == "ivf_flat" and count < config.nlist * 4:
+        logger.log_sync("RAG_SERVICE", "INDEX_FALLBACK", extra=f"{count} vectors too few for nlist={config.nlist}, using flat")
+        index_type = "flat"
+
+    if index_type == "flat":
+        index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+    elif index_type == "hnsw":
+        hnsw_index = faiss.IndexHNSWFlat(dimension, config.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        hnsw_index.hnsw.efConstruction = config.ef_construction
+        index = faiss.IndexIDMap2(hnsw_index)
+    else:
+        nlist = min(config.nlist, max(1, count // 39))
+        quantizer = faiss.IndexFlatIP(dimension)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, config.pq_m, config.pq_bits, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+
+    if ids is None:
+        ids = np.arange(count, dtype='int64')
+    index.add_with_ids(embeddings, np.asarray(ids, dtype='int64'))
+    apply_search_params(index, config)
+    return index
+
+def add_vectors(index, embeddings: np.ndarray, ids: np.ndarray):
+    if len(ids):
+        index.add_with_ids(np.ascontiguousarray(embeddings, dtype='float32'), np.asarray(ids, dtype='int64'))
+
+def remove_vectors(index, ids: np.ndarray) -> bool:
+    """Remove ids in place; returns False when the index type cannot delete (HNSW)."""
+    if not len(ids):
+        return True
+    try:
+        index.remove_ids(np.asarray(ids, dtype='int64'))
+    except RuntimeError:
+        return False
+    return True
+
+def renumber_ids(index, new_ids: Dict[int, int]):
+    """A copy of ``index`` with every id replaced by ``new_ids[id]``.
+
+    Returns ``None`` for indexes that keep ids in their inverted lists (IVF);
+    rebuild those from the embeddings instead.
+    """
+    if not isinstance(index, faiss.IndexIDMap2):
+        return None
+    renumbered = faiss.clone_index(index)
+    ids = faiss.vector_to_array(renumbered.id_map)
+    faiss.copy_array_to_vector(np.array([new_ids[int(i)] for i in ids], dtype='int64'), renumbered.id_map)
+    renumbered.construct_rev_map()
+    return renumbered
+
+def apply_search_params(index, config: IndexConfig):
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = config.ef_search
+        return
+
+    try:
+        faiss.extract_index_ivf(index).nprobe = config.nprobe
+    except RuntimeError:
+        pass
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+import main
+
+
+class FakeReloadService:
+    async def reload_async(self, reason):
+        return {"status": "unchanged"}
+
+
+def test_admin_reload_is_closed_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_TOKEN", None)
+    client = TestClient(main.app)
+
+    assert client.post("/api/admin/reload").status_code == 403
+    assert client.post("/api/admin/reload", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_admin_reload_requires_the_matching_token(monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(main, "services_ready", True)
+    monkeypatch.setattr(main, "reload_service", FakeReloadService())
+    client = TestClient(main.app)
+
+    assert client.post("/api/admin/reload").status_code == 403
+    assert client.post("/api/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = client.post("/api/admin/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200 and response.json() == {"status": "unchanged"}
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from services.embedding_backend import QuantizedSentenceTransformerBackend, create_embedding_backend
+
+
+class FakeModel:
+    def __init__(self):
+        self.device = None
+        self.options = None
+
+    def encode(self, texts, **kwargs):
+        self.options = kwargs
+        return [[float(len(text)), 0.5] for text in texts]
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+
+class UnloadedQuantizedBackend(QuantizedSentenceTransformerBackend):
+    def _load(self, model_name, device):
+        model = FakeModel()
+        model.device = device
+        return model
+
+
+def test_quantized_backend_has_its_own_cache_name_and_runs_on_cpu():
+    backend = UnloadedQuantizedBackend("all-MiniLM-L6-v2")
+
+    assert backend.name == "all-MiniLM-L6-v2@int8"
+    assert backend.model.device == "cpu"
+    embeddings = backend.encode(["abc"], batch_size=8)
+    assert embeddings.dtype == np.float32 and embeddings.tolist() == [[3.0, 0.5]]
+    assert backend.model.options == {"batch_size": 8}
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="fp32, int8"):
+        create_embedding_backend("fp16")
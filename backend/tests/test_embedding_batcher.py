@@ -0,0 +1,57 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from services.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingModel:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        if "boom" in texts:
+            raise ValueError("boom")
+        time.sleep(self.latency)
+        return np.array([[len(text), 1.0] for text in texts], dtype="float32")
+
+
+def test_concurrent_single_encodes_share_a_batch():
+    model = RecordingModel(latency=0.01)
+    batcher = EmbeddingBatcher(model, max_batch_size=8, max_wait_ms=20)
+    texts = ["a" * n for n in range(1, 9)]
+    results = {}
+
+    def encode(text):
+        results[text] = batcher.encode([text])
+
+    threads = [threading.Thread(target=encode, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert all(results[text].shape == (1, 2) and results[text][0, 0] == len(text) for text in texts)
+    assert len(model.calls) < len(texts)
+    assert batcher.items == len(texts)
+
+
+def test_multi_text_calls_bypass_the_queue_and_errors_propagate():
+    model = RecordingModel()
+    batcher = EmbeddingBatcher(model, max_wait_ms=0)
+
+    assert batcher.encode(["x", "yy"]).shape == (2, 2)
+    assert batcher.batches == 0
+
+    with pytest.raises(ValueError):
+        batcher.encode(["boom"])
+    assert batcher.encode(["ok"])[0, 0] == 2
+    batcher.close()
@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import faiss
+import numpy as np
+
+from services.embedding_store import EmbeddingStore
+
+CHUNKS = ["Alice closed Acme Corp", "Bob is negotiating with Delta LLC", "Charlie lost Theta Enterprises"]
+
+
+def encode(texts):
+    return np.array([[len(text), 1.0, float(i)] for i, text in enumerate(texts)], dtype="float32")
+
+
+def build_index(embeddings):
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+    return index
+
+
+def test_workers_cold_starting_together_all_get_the_entry(tmp_path):
+    def cold_start(_):
+        store = EmbeddingStore(str(tmp_path))
+        embeddings, index = store.load_or_build(CHUNKS, "data", "model", "flat", encode, build_index)
+        return np.asarray(embeddings).tolist(), index.ntotal
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(cold_start, range(8)))
+
+    assert all(result == results[0] for result in results) and results[0][1] == len(CHUNKS)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_losing_the_replace_race_keeps_the_winners_file(tmp_path, monkeypatch):
+    store = EmbeddingStore(str(tmp_path))
+    target = str(tmp_path / "entry.json")
+
+    def lose_race(src, dst):
+        with open(dst, "w") as f:
+            f.write("winner")
+        raise FileNotFoundError(src)
+
+    monkeypatch.setattr("services.embedding_store.os.replace", lose_race)
+    store._write_atomic(target, lambda tmp_path: open(tmp_path, "w").close())
+
+    with open(target) as f:
+        assert f.read() == "winner"
+    assert os.listdir(tmp_path) == ["entry.json"]
+
+
+def test_encode_cached_keeps_the_most_recently_used_text_sets(tmp_path):
+    store = EmbeddingStore(str(tmp_path), max_entries=2)
+    files = {}
+    for name in ("a", "b"):
+        before = set(os.listdir(tmp_path))
+        store.encode_cached([name], "model", encode)
+        (files[name],) = set(os.listdir(tmp_path)) - before
+    os.utime(tmp_path / files["a"], (1, 1))
+    os.utime(tmp_path / files["b"], (2, 2))
+
+    store.encode_cached(["a"], "model", encode)
+    store.encode_cached(["c"], "model", encode)
+
+    remaining = os.listdir(tmp_path)
+    assert len(remaining) == 2 and files["a"] in remaining and files["b"] not in remaining
@@ -0,0 +1,56 @@
+import json
+import os
+import re
+
+from services.keyword_matcher import KeywordMatcher, extract_sales_keywords
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "dummyData.json")
+
+
+def load_sales_data():
+    with open(DATA_PATH, "r") as f:
+        return json.load(f)
+
+
+def regex_matches(keywords, text):
+    text_lower = text.lower()
+    return {kw for kw in keywords if re.search(r'\b' + re.escape(kw) + r'\b', text_lower)}
+
+
+def test_find_all_respects_word_boundaries():
+    matcher = KeywordMatcher(["bob", "acme corp", "corp"])
+    assert matcher.find_all("What did Bob close with Acme Corp?") == {"bob", "acme corp", "corp"}
+    assert matcher.find_all("bobby works at acmecorp") == set()
+
+
+def test_overlapping_keywords_are_all_reported():
+    matcher = KeywordMatcher(["he", "she", "hers", "his"])
+    assert matcher.find_all("she said hers") == {"she", "hers"}
+
+
+def test_contains_any():
+    matcher = KeywordMatcher(["north america"])
+    assert matcher.contains_any("Deals in North America?")
+    assert not matcher.contains_any("Deals in north americana?")
+    assert not KeywordMatcher([]).contains_any("anything")
+
+
+def test_matches_regex_semantics_on_sales_data():
+    keywords = extract_sales_keywords(load_sales_data())
+    matcher = KeywordMatcher(keywords)
+    questions = [
+        "Who closed the deal with Acme Corp?",
+        "Tell me about Alice and Bob",
+        "Which deals are Closed Won in Europe?",
+        "What is the capital of France?",
+        "negotiation skills, anyone? (crm-focused)",
+    ]
+    for question in questions:
+        assert matcher.find_all(question) == regex_matches(keywords, question)
+
+
+def test_punctuated_keywords_follow_regex_boundaries():
+    keywords = ["c++", "r&d", "beta ltd."]
+    matcher = KeywordMatcher(keywords)
+    for text in ["we do c++ and r&d", "c++x", "Beta Ltd. signed", "beta ltd.x"]:
+        assert matcher.find_all(text) == regex_matches(keywords, text)
@@ -0,0 +1,28 @@
+import hashlib
+
+import faiss
+import numpy as np
+
+from services.local_router import LocalRouter
+
+
+class HashEmbeddingModel:
+    def encode(self, texts):
+        return np.array([
+            np.frombuffer(hashlib.sha256(text.encode()).digest(), dtype=np.uint8).astype("float32") - 127.5
+            for text in texts
+        ])
+
+
+def test_batched_classification_matches_single_questions():
+    model = HashEmbeddingModel()
+    router = LocalRouter(model, None, k=5)
+    questions = ["Who closed the biggest deal?", "How do I bake bread?", "Tell me about Alice"]
+
+    embeddings = model.encode(questions)
+    faiss.normalize_L2(embeddings)
+    batched = router.classify_embeddings(embeddings)
+
+    assert batched.shape == (3,)
+    assert np.allclose(batched, [router.classify(question) for question in questions])
+    assert ((batched >= 0) & (batched <= 1)).all()
@@ -0,0 +1,63 @@
+import json
+from datetime import datetime
+
+from utils.log_analyzer import LogAnalyzer, main, parse_line
+from utils.logger import APILogger
+
+FORMATTER = APILogger.__new__(APILogger)
+
+
+def record(minute, session_id, event_type, duration=None, extra=None):
+    return FORMATTER.format_log(session_id, event_type, duration, extra, timestamp=datetime(2025, 1, 1, 9, minute).timestamp())
+
+
+def request(minute, session_id, decided_by, route, total):
+    lines = [record(minute, session_id, "REQUEST_START", extra="POST /api/ai")]
+    if decided_by != "SEMANTIC_CACHE_HIT":
+        lines.append(record(minute, session_id, "AI_ROUTING_START", extra="Analyzing: ..."))
+    lines.append(record(minute, session_id, decided_by, 0.004, "Route: sales | Confidence: 0.9"))
+    lines.append(record(minute, session_id, "ROUTE_DECISION", 0.01, route))
+    lines.append(record(minute, session_id, "REQUEST_COMPLETE", total, "Route: Unknown | Status: 200"))
+    return lines
+
+
+LOG = (
+    ["=== API Log Started - 2025-01-01 ===\n", "Format: TIMESTAMP | EVENT_TYPE | SESSION_ID | DURATION | DETAILS\n"]
+    + request(0, "aaaa0001", "DIRECT_KEYWORD_MATCH", "SALES_RAG_PATH", 0.8)
+    + request(1, "aaaa0002", "AI_ROUTING_COMPLETE", "GENERAL_CHAT_PATH", 1.5)
+    + request(2, "aaaa0003", "SEMANTIC_CACHE_HIT", "SEMANTIC_CACHE_HIT", 0.02)
+    + request(3, "aaaa0004", "DIRECT_KEYWORD_MATCH", "SALES_RAG_PATH", 1.0)
+)
+
+
+def test_parse_line_round_trips_format_log():
+    line = record(5, "abcd1234", "RAG_SEARCH_END", 0.0123, "Retrieved 10 chars | extra pipe")
+    assert parse_line(line) == ("2025-01-01 09:05:00.000", "RAG_SEARCH_END", "abcd1234", 0.012, "Retrieved 10 chars | extra pipe")
+    assert parse_line("=== API Log Started ===\n") is None
+
+
+def test_percentiles_route_mix_and_keyword_rate():
+    analyzer = LogAnalyzer()
+    for line in LOG:
+        analyzer.feed(line)
+    report = analyzer.report()
+
+    assert report["stages"]["REQUEST_COMPLETE"] == {"count": 4, "mean": 0.83, "p50": 0.8, "p90": 1.5, "p99": 1.5, "max": 1.5}
+    assert report["stages"]["AI_ROUTING_COMPLETE"]["count"] == 1
+    assert report["route_mix"]["SALES_RAG_PATH"] == {"count": 2, "share": 0.5}
+    assert report["routing_methods"] == {"keyword": 2, "llm": 1, "semantic_cache": 1}
+    assert report["keyword_fast_path"] == {"routed_requests": 3, "hits": 2, "hit_rate": 0.6667}
+    assert report["lines"]["skipped"] == 2
+    assert not analyzer.open_sessions
+
+
+def test_time_window_and_json_output(tmp_path, capsys):
+    path = tmp_path / "api-log.txt"
+    path.write_text("".join(LOG))
+
+    main([str(path), "--since", "2025-01-01T09:01", "--until", "2025-01-01 09:03", "--json"])
+    output = capsys.readouterr().out
+
+    report = json.loads(output)
+    assert report["requests"] == 2
+    assert set(report["route_mix"]) == {"GENERAL_CHAT_PATH", "SEMANTIC_CACHE_HIT"}
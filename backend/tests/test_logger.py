@@ -0,0 +1,49 @@
+import os
+
+from utils.logger import APILogger
+
+
+def read(path) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_close_drains_buffered_events(tmp_path):
+    log_file = str(tmp_path / "api-log.txt")
+    api_logger = APILogger(log_file, flush_interval=60, batch_size=10_000, console_level="NONE")
+    for i in range(100):
+        api_logger.log_sync("s1", "TEST_EVENT", 0.5, f"event {i}")
+    api_logger.close()
+
+    contents = read(log_file)
+    assert "event 0\n" in contents and "event 99\n" in contents
+    assert contents.count("TEST_EVENT") == 100
+
+
+def test_rotation_by_size(tmp_path):
+    log_file = str(tmp_path / "api-log.txt")
+    api_logger = APILogger(log_file, batch_size=1, max_bytes=2_000, backup_count=2, console_level="NONE")
+    for i in range(200):
+        api_logger.log_sync("s1", "TEST_EVENT", None, "x" * 50)
+    api_logger.close()
+
+    assert os.path.exists(f"{log_file}.1")
+    assert not os.path.exists(f"{log_file}.3")
+
+
+def test_overload_samples_info_but_keeps_errors(tmp_path):
+    log_file = str(tmp_path / "api-log.txt")
+    api_logger = APILogger(log_file, buffer_size=100, flush_interval=60, batch_size=10_000,
+                           console_level="NONE", sample_watermark=0.5, sample_rate=10)
+    for i in range(1_000):
+        api_logger.log_sync("s1", "TEST_EVENT", None, str(i))
+    api_logger.log_sync("s1", "TEST_ERROR", None, "kept")
+
+    stats = api_logger.stats()
+    assert stats["buffered"] <= 100
+    assert stats["sampled_out"] > 0 and stats["dropped"] > 0
+    api_logger.close()
+
+    contents = read(log_file)
+    assert "TEST_ERROR" in contents
+    assert "LOG_OVERLOAD" in contents
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+
+from services.conversation_memory import ConversationExchange, InMemoryBackend, MemoryBackend
+
+
+def exchange(text: str) -> ConversationExchange:
+    return ConversationExchange(user_message=text, ai_response=f"re: {text}", timestamp=datetime.now())
+
+
+def test_sessions_keep_only_the_latest_exchanges():
+    backend = InMemoryBackend(max_exchanges=2)
+    for text in ("one", "two", "three"):
+        backend.append("s1", exchange(text))
+
+    assert [e.user_message for e in backend.get_exchanges("s1")] == ["two", "three"]
+
+
+def test_expiry_follows_last_activity(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.conversation_memory.time.monotonic", lambda: now[0])
+    backend = InMemoryBackend(session_timeout_minutes=1)
+
+    backend.append("a", exchange("first"))
+    now[0] += 30
+    backend.append("b", exchange("second"))
+    now[0] += 20
+    backend.append("a", exchange("touch"))
+
+    now[0] += 45
+    assert backend.expire() == 1
+    assert not backend.has_session("b")
+    assert backend.has_session("a")
+    assert list(backend.session_last_active) == ["a"]
+
+
+def test_exchanges_use_slots():
+    assert not hasattr(exchange("x"), "__dict__")
+
+
+def test_rendered_exchanges_match_full_render_after_eviction():
+    backend = InMemoryBackend(max_exchanges=2)
+    for text in ("one", "two", "three"):
+        backend.append("s1", exchange(text))
+
+    assert backend.get_context("s1") == "User: two\nAssistant: re: two\nUser: three\nAssistant: re: three"
+    assert backend.get_rendered_exchanges("s1") == ("User: two\nAssistant: re: two", "User: three\nAssistant: re: three")
+    assert list(backend.get_rendered_exchanges("s1")) == MemoryBackend.get_rendered_exchanges(backend, "s1")
+
+    backend.delete("s1")
+    assert backend.get_context("s1") == ""
+
+
+def test_backend_must_implement_storage_methods():
+    class ReadOnlyBackend(MemoryBackend):
+        def get_exchanges(self, session_id):
+            return ()
+
+    with pytest.raises(TypeError, match="append"):
+        ReadOnlyBackend()
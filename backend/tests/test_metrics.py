@@ -0,0 +1,31 @@
+from utils.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "search")
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{stage="search",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="search",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{stage="search",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{stage="search"} 4' in lines
+    assert 'latency_seconds_sum{stage="search"} 3.650000' in lines
+    assert histogram.count("search") == 4
+
+
+def test_registry_renders_exposition_format():
+    registry = MetricsRegistry()
+    hits = registry.counter("cache_lookups_total", "Cache lookups", ["cache", "result"])
+    hits.inc("semantic", "hit")
+    hits.inc("semantic", "hit")
+    registry.histogram("empty_seconds", "Never observed")
+
+    text = registry.render()
+    assert text.endswith("\n")
+    assert "# TYPE cache_lookups_total counter" in text
+    assert 'cache_lookups_total{cache="semantic",result="hit"} 2' in text
+    assert "# TYPE empty_seconds histogram" in text
+    assert hits.value("semantic", "miss") == 0
+    assert isinstance(hits, Counter)
@@ -0,0 +1,49 @@
+from services.prompt_packer import PromptPacker, RouteBudget
+
+
+def word_count(text: str) -> int:
+    return len(text.split())
+
+
+def make_packer(**budgets) -> PromptPacker:
+    return PromptPacker(budgets={"sales": RouteBudget(**budgets)}, count_tokens=word_count)
+
+
+def test_history_keeps_most_recent_whole_exchanges():
+    history = ["User: first question\nAssistant: first\nanswer", "User: second\nAssistant: second answer"]
+
+    packed_history, _ = make_packer(history_tokens=6).pack("sales", "s1", history)
+    assert packed_history == "User: second\nAssistant: second answer"
+
+
+def test_answer_quoting_a_user_line_stays_one_exchange():
+    history = ["User: q1\nAssistant: a1", "User: how do I quote?\nAssistant: Write it as\nUser: hi there"]
+
+    packed_history, _ = make_packer(history_tokens=12).pack("sales", "s1", history)
+    assert packed_history == history[1]
+
+
+def test_history_within_budget_is_joined_unchanged():
+    packed_history, _ = make_packer(history_tokens=100).pack("sales", "s1", ["User: hi\nAssistant: hello"])
+    assert packed_history == "User: hi\nAssistant: hello"
+
+
+def test_chunks_are_packed_in_relevance_order_without_slicing():
+    sales_data = "alpha one two three\nbeta one\ngamma one two three four five\ndelta"
+    _, packed_data = make_packer(history_tokens=0, sales_data_tokens=7).pack("sales", "s1", (), sales_data)
+    assert packed_data == "alpha one two three\nbeta one\ndelta"
+
+
+def test_oversized_first_chunk_is_truncated_to_the_budget():
+    _, packed_data = make_packer(history_tokens=0, sales_data_tokens=2).pack("sales", "s1", (), "a b c d\ne")
+    assert packed_data == "a b"
+
+    huge = " ".join(f"deal{i}" for i in range(10000))
+    _, packed_data = make_packer(history_tokens=0, sales_data_tokens=750).pack("sales", "s1", (), huge)
+    assert word_count(packed_data) == 750
+
+
+def test_reserved_tokens_come_out_of_the_data_budget():
+    sales_data = "alpha one two three\nbeta one\ndelta"
+    _, packed_data = make_packer(history_tokens=0, sales_data_tokens=7).pack("sales", "s1", (), sales_data, reserved_data_tokens=5)
+    assert packed_data == "alpha one"
@@ -0,0 +1,70 @@
+import json
+import os
+
+import faiss
+import numpy as np
+
+from services.keyword_matcher import KeywordMatcher
+from services.rag_service import RAGService, RetrievalState
+from services.retrieval_cache import RetrievalCache
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "dummyData.json")
+
+
+def make_service() -> RAGService:
+    """A RAGService with the dummy data's chunks and entity index, without loading a model."""
+    with open(DATA_PATH, "r") as f:
+        sales_data = json.load(f)
+
+    service = RAGService.__new__(RAGService)
+    service.retrieval_cache = RetrievalCache()
+    chunks, metadata = service._create_sales_chunks(sales_data["salesReps"])
+    service.state = RetrievalState(
+        sales_data=sales_data,
+        keyword_matcher=KeywordMatcher.from_sales_data(sales_data),
+        chunks=chunks,
+        metadata=metadata,
+        entity_index=service._build_entity_index(sales_data, metadata),
+        index=faiss.IndexFlatIP(8)
+    )
+    return service
+
+
+def chunk_ids(service: RAGService, rep_name: str):
+    return [chunk_id for chunk_id, meta in service.state.metadata.items() if meta["rep_name"] == rep_name]
+
+
+def test_keyword_postings_merge_in_chunk_order_without_duplicates():
+    service = make_service()
+    alice, bob = chunk_ids(service, "Alice"), chunk_ids(service, "Bob")
+    won = service.state.entity_index["closed won"]
+
+    merged = service._search_by_keywords(["bob", "acme corp", "closed won"])
+
+    assert merged == sorted(set(bob[:3]) | set(service.state.entity_index["acme corp"]) | set(won[:3]))
+    assert len(merged) == len(set(merged))
+    assert set(alice[1:]) <= set(merged)
+
+
+def test_multi_entity_question_returns_each_reps_chunks_in_order():
+    service = make_service()
+
+    result = service._search_sales_data("Compare Bob and Alice", top_k=5).split("\n")
+
+    expected = [service.state.chunks[chunk_id] for chunk_id in chunk_ids(service, "Alice") + chunk_ids(service, "Bob")]
+    assert result == expected
+
+
+def test_vector_search_uses_the_callers_embedding_instead_of_encoding():
+    service = make_service()
+
+    class NoEncode:
+        def encode(self, texts):
+            raise AssertionError("question was encoded again")
+
+    service.embedding_model = NoEncode()
+    embeddings = np.eye(8, dtype="float32")
+    service.state.index.add(embeddings)
+
+    result = service._search_sales_data("what happened last quarter?", top_k=1, embedding=embeddings[2:3])
+    assert result == service.state.chunks[2]
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+
+import faiss
+import numpy as np
+import pytest
+
+from services.data_service import DataService
+from services.embedding_store import EmbeddingStore
+from services.keyword_matcher import KeywordMatcher
+from services.rag_service import RAGService
+from services.reload_service import ReloadService, diff_sales_reps
+from services.retrieval_cache import RetrievalCache
+from services.vector_index import IndexConfig
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "dummyData.json")
+
+
+def test_diff_sales_reps_by_id():
+    old_reps = [
+        {"id": 1, "name": "Alice", "region": "North America"},
+        {"id": 2, "name": "Bob", "region": "Europe"},
+        {"id": 3, "name": "Charlie", "region": "Asia"},
+    ]
+    new_reps = [
+        {"id": 1, "name": "Alice", "region": "South America"},
+        {"id": 3, "name": "Charlie", "region": "Asia"},
+        {"id": 4, "name": "Dana", "region": "Africa"},
+    ]
+
+    diff = diff_sales_reps(old_reps, new_reps)
+
+    assert diff.added == [4]
+    assert diff.removed == [2]
+    assert diff.changed == [1]
+    assert diff.unchanged == 1
+    assert diff.changed_rep_ids == {1, 2, 4}
+
+
+def test_diff_of_identical_data_is_empty():
+    reps = [{"id": 1, "name": "Alice"}]
+    diff = diff_sales_reps(reps, [dict(rep) for rep in reps])
+
+    assert not diff.changed_rep_ids
+    assert diff.summary() == {"reps_added": 0, "reps_removed": 0, "reps_changed": 0, "reps_unchanged": 1}
+
+
+class HashEmbeddingModel:
+    name = "hash"
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.array([np.frombuffer(hashlib.sha256(text.encode()).digest(), dtype=np.uint8).astype("float32") - 127.5 for text in texts])
+
+    def get_sentence_embedding_dimension(self):
+        return 32
+
+
+class FakeRouter:
+    keyword_matcher = None
+
+    def apply_keyword_matcher(self, keyword_matcher):
+        self.keyword_matcher = keyword_matcher
+
+
+def make_rag_service(sales_data, index_type, embedding_store=None) -> RAGService:
+    """The real retrieval setup and reload path, with a hash "model" and no LLM client."""
+    service = RAGService.__new__(RAGService)
+    service.embedding_model = HashEmbeddingModel()
+    service.embedding_model_name = service.embedding_model.name
+    service.embedding_store = embedding_store
+    service.index_config = IndexConfig(index_type=index_type)
+    service.retrieval_cache = RetrievalCache()
+    service.state = service._initialize_vector_store(sales_data, KeywordMatcher.from_sales_data(sales_data))
+    return service
+
+
+def write_data(path, sales_data):
+    with open(path, "w") as f:
+        json.dump(sales_data, f)
+
+
+def load_dummy_data():
+    with open(DATA_PATH, "r") as f:
+        return json.load(f)
+
+
+def search_ids(service, text, k):
+    embedding = service.embedding_model.encode([text])
+    faiss.normalize_L2(embedding)
+    return service.sales_index.search(embedding, k)[1][0].tolist()
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_reload_swaps_in_the_changed_reps_chunks(tmp_path, index_type):
+    sales_data = load_dummy_data()
+    write_data(tmp_path / "data.json", sales_data)
+    data_service = DataService(str(tmp_path / "data.json"))
+    rag_service = make_rag_service(sales_data, index_type)
+    ai_router = FakeRouter()
+    reload_service = ReloadService(data_service, ai_router, rag_service)
+
+    total = rag_service.sales_index.ntotal
+    stale_id = next(chunk_id for chunk_id, meta in rag_service.sales_metadata.items() if meta["rep_name"] == "Bob" and meta["type"] == "profile")
+    stale_text = rag_service.sales_chunks[stale_id]
+    old_state = rag_service.state
+    rag_service.retrieval_cache.set(rag_service.retrieval_cache.make_key("Bob", 5, old_state.version), stale_text)
+
+    seen_by_listener = []
+    data_service.add_reload_listener(lambda _: rag_service.retrieval_cache.clear())
+    data_service.add_reload_listener(lambda data: seen_by_listener.append((rag_service.sales_data is data, ai_router.keyword_matcher is rag_service.keyword_matcher)))
+
+    bob = next(rep for rep in sales_data["salesReps"] if rep["name"] == "Bob")
+    bob["region"] = "Antarctica"
+    write_data(tmp_path / "data.json", sales_data)
+    rag_service.embedding_model.encoded.clear()
+
+    result = reload_service.reload()
+    # A search that started on the old state finishing after the listeners cleared the cache.
+    rag_service.retrieval_cache.set(rag_service.retrieval_cache.make_key("Bob", 5, old_state.version), stale_text)
+
+    assert result["status"] == "reloaded" and result["reps_changed"] == 1
+    assert rag_service.embedding_model.encoded == [text for chunk_id, text in rag_service.sales_chunks.items() if chunk_id >= old_state.next_chunk_id]
+    assert rag_service.sales_index.ntotal == total and old_state.index.ntotal == total
+    assert stale_id not in rag_service.sales_chunks and stale_text not in rag_service.sales_chunks.values()
+    assert stale_id not in search_ids(rag_service, stale_text, total)
+
+    fresh_id, fresh_text = next((chunk_id, text) for chunk_id, text in rag_service.sales_chunks.items() if "Antarctica" in text)
+    assert search_ids(rag_service, fresh_text, 1) == [fresh_id]
+    assert rag_service._search_sales_data("Bob") == rag_service._format_chunks(rag_service.state, rag_service.entity_index["bob"][:3])
+    # Caches are invalidated only once the new state and matcher are in place.
+    assert seen_by_listener == [(True, True)]
+    assert data_service.version == 1
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_restart_after_a_reload_reuses_the_reloaded_embeddings(tmp_path, index_type):
+    sales_data = load_dummy_data()
+    write_data(tmp_path / "data.json", sales_data)
+    store = EmbeddingStore(str(tmp_path / "cache"))
+    rag_service = make_rag_service(sales_data, index_type, store)
+    reload_service = ReloadService(DataService(str(tmp_path / "data.json")), FakeRouter(), rag_service)
+
+    sales_data["salesReps"][0]["region"] = "Antarctica"
+    write_data(tmp_path / "data.json", sales_data)
+    assert reload_service.reload()["status"] == "reloaded"
+
+    restarted = make_rag_service(sales_data, index_type, store)
+
+    assert restarted.embedding_model.encoded == []
+    assert list(restarted.sales_chunks.values()) == list(RAGService._create_sales_chunks(sales_data["salesReps"])[0].values())
+    for chunk_id, text in restarted.sales_chunks.items():
+        assert search_ids(restarted, text, 1) == [chunk_id]
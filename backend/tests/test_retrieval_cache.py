@@ -0,0 +1,53 @@
+import json
+
+from services.data_service import DataService
+from services.retrieval_cache import RetrievalCache
+
+
+def test_normalized_questions_share_a_key():
+    cache = RetrievalCache()
+    assert cache.make_key("Who is  Alice?", 5) == cache.make_key("  who is alice ", 5)
+    assert cache.make_key("who is alice", 5) != cache.make_key("who is alice", 3)
+    assert cache.make_key("who is alice", 5, version=1) != cache.make_key("who is alice", 5, version=2)
+
+
+def test_hits_misses_and_size_eviction():
+    cache = RetrievalCache(max_size=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.retrieval_cache.time.monotonic", lambda: now[0])
+    cache = RetrievalCache(ttl_seconds=10)
+    cache.set("a", "A")
+    now[0] += 11
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_reload_listener_clears_cache_only_when_data_changes(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"salesReps": []}))
+    data_service = DataService(str(data_file))
+    cache = RetrievalCache()
+    data_service.add_reload_listener(lambda _: cache.clear())
+
+    cache.set("a", "A")
+    data_service.reload_data()
+    assert cache.get("a") == "A"
+
+    data_file.write_text(json.dumps({"salesReps": [{"id": 1, "name": "Zed"}]}))
+    data_service.reload_data()
+    assert cache.get("a") is None
+    assert data_service.version == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from services.sales_analytics import SalesAnalytics, SalesAnalyticsService
+
+
+REPS = [
+    {"id": 1, "name": "Alice", "region": "Europe",
+     "clients": [{"name": "Acme", "industry": "Retail"}, {"name": "Beta", "industry": "Tech"}],
+     "deals": [{"client": "Acme", "value": 100, "status": "Closed Won"},
+               {"client": "Beta", "value": 50, "status": "In Progress"},
+               {"client": "Gone", "value": 30, "status": "Closed Lost"}]},
+    {"id": 2, "name": "Bob", "region": "Asia",
+     "clients": [{"name": "Core", "industry": "Tech"}],
+     "deals": [{"client": "Core", "value": 200, "status": "Closed Won"},
+               {"client": "Core", "value": 20, "status": "Closed Won"}]},
+    {"id": 3, "name": "Cleo", "region": "Europe", "clients": [], "deals": []},
+]
+
+
+def test_group_by_and_top_k_match_a_python_aggregation():
+    analytics = SalesAnalytics.from_sales_reps(REPS)
+
+    assert analytics.group_by("region", "sum", {"status": ["closed won"]}) == [
+        {"key": "Europe", "value": 100.0, "deals": 1},
+        {"key": "Asia", "value": 220.0, "deals": 2},
+    ]
+    assert analytics.group_by("industry", "count") == [
+        {"key": "Retail", "value": 1, "deals": 1},
+        {"key": "Tech", "value": 3, "deals": 3},
+        {"key": "Unknown", "value": 1, "deals": 1},
+    ]
+    assert [group["key"] for group in analytics.top_k("rep", 1, "max")] == ["Bob"]
+    assert analytics.top_k("rep", 5, "mean", min_value=40) == [
+        {"key": "Bob", "value": 200.0, "deals": 1},
+        {"key": "Alice", "value": 75.0, "deals": 2},
+    ]
+    assert analytics.summary({"rep": ["Cleo"]}) == {"deals": 0, "total_value": 0.0, "average_value": 0.0, "by_status": []}
+
+    with pytest.raises(ValueError, match="Unknown dimension"):
+        analytics.group_by("country")
+    with pytest.raises(ValueError, match="Unknown metric"):
+        analytics.group_by("rep", "median")
+
+
+class FakeDataService:
+    def __init__(self, reps):
+        self.reps = reps
+        self.version = 0
+
+    def get_sales_reps(self):
+        return self.reps
+
+
+def test_service_rebuilds_only_when_the_data_version_changes():
+    data_service = FakeDataService(REPS)
+    service = SalesAnalyticsService(data_service)
+
+    first = service.current()
+    assert service.current() is first and first.deal_count == 5
+
+    data_service.reps = REPS[:1]
+    data_service.version += 1
+    assert service.current().deal_count == 3
+    assert "Closed Won 1 deals $100" in service.current().prompt_summary()
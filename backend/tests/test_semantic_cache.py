@@ -0,0 +1,102 @@
+import numpy as np
+
+from services.keyword_matcher import KeywordMatcher
+from services.semantic_cache import SemanticCache
+
+VECTORS = {
+    "who closed the most deals": [1.0, 0.0, 0.0],
+    "top closer?": [0.95, 0.05, 0.0],
+    "tell me a joke": [0.0, 1.0, 0.0],
+    "what is the weather": [0.0, 0.0, 1.0],
+    "What deals does Alice have?": [0.6, 0.8, 0.0],
+    "What deals does Bob have?": [0.61, 0.79, 0.0],
+    "Which deals does Alice have?": [0.59, 0.8, 0.01],
+}
+
+
+class FakeEmbeddingModel:
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts):
+        return np.array([VECTORS[text] for text in texts], dtype="float32")
+
+
+def test_near_duplicate_question_hits():
+    cache = SemanticCache(FakeEmbeddingModel(), similarity_threshold=0.9)
+    cache.store("who closed the most deals", "Alice", "sales")
+
+    hit, _ = cache.lookup("top closer?", "test")
+    miss, _ = cache.lookup("tell me a joke", "test")
+
+    assert hit.answer == "Alice" and hit.route_type == "sales"
+    assert miss is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_size_bound_evicts_oldest():
+    cache = SemanticCache(FakeEmbeddingModel(), max_size=2)
+    cache.store("who closed the most deals", "Alice", "sales")
+    cache.store("tell me a joke", "Knock knock", "general")
+    cache.store("what is the weather", "Sunny", "general")
+
+    assert len(cache) == 2 and cache.index.ntotal == 2
+    assert cache.lookup("who closed the most deals", "test")[0] is None
+    assert cache.evictions == 1
+
+
+def test_ttl_and_clear(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("services.semantic_cache.time.monotonic", lambda: now[0])
+    cache = SemanticCache(FakeEmbeddingModel(), ttl_seconds=10)
+    cache.store("tell me a joke", "Knock knock", "general")
+    cache.store("what is the weather", "Sunny", "general")
+
+    now[0] += 11
+    assert cache.lookup("tell me a joke", "test")[0] is None
+    assert cache.expirations == 2
+
+    cache.store("tell me a joke", "Knock knock", "general")
+    cache.clear()
+    assert len(cache) == 0 and cache.index.ntotal == 0
+
+
+def test_lookup_reuses_a_precomputed_embedding():
+    model = FakeEmbeddingModel()
+    cache = SemanticCache(model)
+    cache.store("who closed the most deals", "Alice", "sales")
+    embedding = model.encode(["top closer?"])
+    model.encode = None  # any further encode would fail
+
+    hit, returned = cache.lookup("top closer?", "test", embedding)
+
+    assert hit.answer == "Alice" and returned is embedding
+
+
+def test_questions_about_different_reps_do_not_share_answers():
+    cache = SemanticCache(FakeEmbeddingModel(), similarity_threshold=0.9, keyword_matcher=KeywordMatcher(["alice", "bob"]))
+    cache.store("What deals does Alice have?", "Alice has Acme Corp", "sales")
+
+    assert cache.lookup("What deals does Bob have?", "test")[0] is None
+    cache.store("What deals does Bob have?", "Bob has Delta LLC", "sales")
+
+    hit, _ = cache.lookup("Which deals does Alice have?", "test")
+    assert hit.answer == "Alice has Acme Corp" and hit.entities == {"alice"}
+    assert cache.lookup("What deals does Bob have?", "test")[0].answer == "Bob has Delta LLC"
+
+
+def test_batch_lookup_answers_every_question_with_one_search():
+    model = FakeEmbeddingModel()
+    cache = SemanticCache(model, similarity_threshold=0.9, keyword_matcher=KeywordMatcher(["alice", "bob"]))
+    cache.store("who closed the most deals", "Alice", "sales")
+    cache.store("What deals does Alice have?", "Alice has Acme Corp", "sales")
+    questions = ["top closer?", "tell me a joke", "What deals does Bob have?", "Which deals does Alice have?"]
+
+    searches = []
+    search = cache.index.search
+    cache.index.search = lambda embeddings, k: searches.append(len(embeddings)) or search(embeddings, k)
+    results = cache.lookup_batch(questions, "test", model.encode(questions))
+
+    assert searches == [4]
+    assert [result.answer if result else None for result in results] == ["Alice", None, None, "Alice has Acme Corp"]
+    assert (cache.hits, cache.misses) == (2, 2)
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from datetime import datetime
+
+from services.conversation_memory import ConversationExchange, ConversationMemory
+from services.sqlite_memory import SQLiteMemoryBackend
+
+
+def exchange(text: str) -> ConversationExchange:
+    return ConversationExchange(user_message=text, ai_response=f"re: {text}", timestamp=datetime.now())
+
+
+def test_pending_writes_are_visible_before_flush(tmp_path):
+    backend = SQLiteMemoryBackend(str(tmp_path / "memory.db"), flush_interval_seconds=60)
+    backend.append("s1", exchange("hello"))
+
+    assert [e.user_message for e in backend.get_exchanges("s1")] == ["hello"]
+    assert backend.rows_written == 0
+    backend.close()
+    assert backend.rows_written == 1
+
+
+def test_workers_share_sessions_and_trim(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    worker_a = SQLiteMemoryBackend(db_path, max_exchanges=2, flush_interval_seconds=0)
+    worker_b = SQLiteMemoryBackend(db_path, max_exchanges=2, flush_interval_seconds=0)
+
+    for text in ("one", "two", "three"):
+        worker_a.append("s1", exchange(text))
+
+    assert [e.user_message for e in worker_b.get_exchanges("s1")] == ["two", "three"]
+
+    worker_b.delete("s1")
+    assert not worker_a.has_session("s1")
+    worker_a.close()
+    worker_b.close()
+
+
+def test_expired_sessions_are_hidden_and_removed(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.sqlite_memory.time.time", lambda: now[0])
+    backend = SQLiteMemoryBackend(str(tmp_path / "memory.db"), session_timeout_minutes=1, flush_interval_seconds=0, expire_interval_seconds=0)
+    backend.append("old", exchange("hi"))
+
+    now[0] += 61
+    assert backend.get_exchanges("old") == []
+
+    backend.append("new", exchange("hey"))
+    count = backend._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    assert count == 1
+    backend.close()
+
+
+def test_conversation_memory_renders_from_backend(tmp_path):
+    memory = ConversationMemory(backend=SQLiteMemoryBackend(str(tmp_path / "memory.db")))
+
+    async def scenario():
+        await memory.add_exchange("s1", "Who is Alice?", "A sales rep.")
+        return await memory.get_conversation_context("s1")
+
+    assert asyncio.run(scenario()) == "User: Who is Alice?\nAssistant: A sales rep."
+    memory.close()
+
+
+def test_conversation_memory_calls_sqlite_off_the_event_loop(tmp_path):
+    class RecordingBackend(SQLiteMemoryBackend):
+        threads = set()
+
+        def get_exchanges(self, session_id):
+            self.threads.add(threading.get_ident())
+            return super().get_exchanges(session_id)
+
+    memory = ConversationMemory(backend=RecordingBackend(str(tmp_path / "memory.db"), flush_interval_seconds=0))
+
+    async def scenario():
+        await memory.add_exchange("s1", "Who is Alice?", "A sales rep.")
+        await memory.get_conversation_context("s1")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert RecordingBackend.threads and loop_thread not in RecordingBackend.threads
+    memory.close()
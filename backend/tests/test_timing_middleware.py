@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from middleware import timing
+from utils.logger import TimingContext
+
+
+async def stream(request):
+    async def chunks():
+        for part in (b"abc", b"defg"):
+            yield part
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+async def missing(request):
+    return PlainTextResponse("nope", status_code=404)
+
+
+def test_finish_reports_status_and_streamed_bytes(monkeypatch):
+    finished = []
+
+    async def record_finish(self, status_code=200, response_size=None):
+        finished.append((status_code, response_size))
+    monkeypatch.setattr(TimingContext, "finish_async", record_finish)
+
+    app = timing.TimingMiddleware(Starlette(routes=[Route("/stream", stream), Route("/missing", missing)]))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            streamed = await client.get("/stream")
+            await client.get("/missing")
+        await timing.drain_pending_finishes()
+        return streamed
+
+    streamed = asyncio.run(run())
+
+    assert streamed.text == "abcdefg"
+    assert finished == [(200, 7), (404, 4)]
+    assert not timing.pending_finishes
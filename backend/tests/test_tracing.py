@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from utils.tracing import Trace, Tracer, current_trace, span
+
+
+def run_traced(trace, coroutine):
+    async def main():
+        token = current_trace.set(trace)
+        try:
+            with span("GET /test", "http"):
+                await coroutine()
+        finally:
+            current_trace.reset(token)
+    asyncio.run(main())
+
+
+def test_spans_nest_across_threads_and_tasks():
+    trace = Trace("abcd1234", record=True)
+
+    def encode():
+        with span("embedding.encode", "embedding"):
+            time.sleep(0.001)
+
+    async def handler():
+        with span("rag.retrieve", "rag"):
+            await asyncio.to_thread(encode)
+        await asyncio.create_task(llm())
+
+    async def llm():
+        with span("rag.generate", "llm"):
+            await asyncio.sleep(0)
+
+    run_traced(trace, handler)
+
+    parents = {name: (span_id, parent_id) for name, _, _, _, span_id, parent_id, _, _ in trace.spans}
+    assert parents["GET /test"][1] is None
+    assert parents["rag.retrieve"][1] == parents["GET /test"][0]
+    assert parents["embedding.encode"][1] == parents["rag.retrieve"][0]
+    assert parents["rag.generate"][1] == parents["GET /test"][0]
+    assert trace.counts["llm"] == 1 and trace.counts["rag"] == 1
+
+
+def test_chrome_trace_export_and_counting_without_recording(tmp_path):
+    trace = Trace("abcd1234", record=True)
+    run_traced(trace, lambda: asyncio.sleep(0))
+    trace.add_instant("ROUTE_DECISION", "SALES_RAG_PATH")
+
+    events = trace.to_chrome_trace()["traceEvents"]
+    assert events[0]["ph"] == "X" and events[0]["name"] == "GET /test" and events[0]["dur"] > 0
+    assert events[1]["ph"] == "i" and events[1]["args"] == {"extra": "SALES_RAG_PATH"}
+
+    unrecorded = Trace("efgh5678")
+    run_traced(unrecorded, lambda: asyncio.sleep(0))
+    assert unrecorded.counts["http"] == 1 and not unrecorded.spans
+
+    tracer = Tracer(output_dir=str(tmp_path), sample_rate=0.0, slow_threshold_seconds=1.0)
+    assert not tracer.should_export(tracer.start_trace("fast"), 0.5)
+    assert tracer.should_export(tracer.start_trace("slow"), 1.5)
+    assert tracer.export(trace).startswith(str(tmp_path))
+    assert not Tracer().should_export(Tracer().start_trace("off"), 10.0)
+
+
+def test_span_is_a_no_op_outside_a_request():
+    with span("orphan") as orphan:
+        pass
+    assert orphan.trace is None
@@ -0,0 +1,236 @@
+"""Offline latency report for ``api-log.txt``.
+
+    python -m utils.log_analyzer api-log.txt.2 api-log.txt.1 api-log.txt --since "2025-01-01 09:00" --json
+
+Reads any number of log files (``-`` for stdin) line by line. Memory stays
+constant in the size of the log: ``format_log`` writes durations with
+millisecond precision, so each stage keeps a count per distinct millisecond
+value and percentiles are exact. Per-request state is only held until the
+request's ``REQUEST_COMPLETE`` line, and at most ``max_open_sessions``
+unfinished requests are tracked at once.
+"""
+import argparse
+import json
+import sys
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+DEFAULT_STAGES = ("AI_ROUTING_COMPLETE", "RAG_SEARCH_END", "RAG_OPENAI_END", "CHAT_OPENAI_END", "REQUEST_COMPLETE")
+PERCENTILES = (50, 90, 99)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+TIMESTAMP_LENGTH = 23
+
+# Events that show which step of route_question (or the semantic cache) decided a request.
+ROUTING_METHODS = {
+    "SEMANTIC_CACHE_HIT": "semantic_cache",
+    "DIRECT_KEYWORD_MATCH": "keyword",
+    "LOCAL_ROUTING_COMPLETE": "local",
+    "AI_ROUTING_COMPLETE": "llm",
+    "AI_ROUTING_ERROR": "llm_error",
+}
+
+def parse_line(line: str) -> Optional[Tuple[str, str, str, Optional[float], str]]:
+    """Splits a ``format_log`` line into ``(timestamp, event, session_id, duration, extra)``.
+
+    Returns ``None`` for headers and lines that are not log records.
+    """
+    parts = line.rstrip("\n").split(" | ", 4)
+    if len(parts) < 4 or len(parts[0]) != TIMESTAMP_LENGTH:
+        return None
+    timestamp, event_type, session_id, duration = parts[:4]
+    if duration == "-":
+        seconds = None
+    else:
+        try:
+            seconds = float(duration.rstrip("s"))
+        except ValueError:
+            return None
+    return timestamp, event_type.strip(), session_id, seconds, parts[4] if len(parts) == 5 else ""
+
+def normalize_timestamp(value: str) -> str:
+    """Accepts any ISO date/time and returns it in the log's sortable timestamp format."""
+    return datetime.fromisoformat(value).strftime(TIMESTAMP_FORMAT)[:TIMESTAMP_LENGTH]
+
+class MillisecondHistogram:
+    """Exact percentiles over durations logged with millisecond precision."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+        self.sum_ms = 0
+
+    def add(self, seconds: float):
+        ms = round(seconds * 1000)
+        self.counts[ms] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def percentile(self, pct: float) -> float:
+        rank = max(1, -(-self.total * pct // 100))  # nearest-rank
+        seen = 0
+        for ms in sorted(self.counts):
+            seen += self.counts[ms]
+            if seen >= rank:
+                return ms / 1000
+        return 0.0
+
+    def summary(self) -> Dict[str, float]:
+        if not self.total:
+            return {"count": 0}
+        summary = {"count": self.total, "mean": round(self.sum_ms / self.total / 1000, 3)}
+        for pct in PERCENTILES:
+            summary[f"p{pct}"] = self.percentile(pct)
+        summary["max"] = max(self.counts) / 1000
+        return summary
+
+class LogAnalyzer:
+    def __init__(self, stages: Iterable[str] = DEFAULT_STAGES, since: Optional[str] = None, until: Optional[str] = None,
+                 max_open_sessions: int = 10000):
+        self.stages = {stage: MillisecondHistogram() for stage in stages}
+        self.since = normalize_timestamp(since) if since else None
+        self.until = normalize_timestamp(until) if until else None
+        self.max_open_sessions = max_open_sessions
+
+        # session_id -> [route, routing method, routing started]
+        self.open_sessions: "OrderedDict[str, list]" = OrderedDict()
+        self.route_mix = Counter()
+        self.routing_methods = Counter()
+        self.request_latency_by_route: Dict[str, MillisecondHistogram] = {}
+        self.routed_requests = 0
+        self.keyword_hits = 0
+        self.lines = 0
+        self.skipped = 0
+        self.evicted_sessions = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+    def _session(self, session_id: str) -> list:
+        session = self.open_sessions.get(session_id)
+        if session is None:
+            session = self.open_sessions[session_id] = [None, None, False]
+            if len(self.open_sessions) > self.max_open_sessions:
+                self.open_sessions.popitem(last=False)
+                self.evicted_sessions += 1
+        return session
+
+    def feed(self, line: str):
+        self.lines += 1
+        record = parse_line(line)
+        if record is None:
+            self.skipped += 1
+            return
+
+        timestamp, event_type, session_id, duration, extra = record
+        # The timestamp format sorts lexicographically, so no parsing is needed to filter.
+        if (self.since and timestamp < self.since) or (self.until and timestamp >= self.until):
+            return
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+        histogram = self.stages.get(event_type)
+        if histogram is not None and duration is not None:
+            histogram.add(duration)
+
+        if event_type == "AI_ROUTING_START":
+            self._session(session_id)[2] = True
+        elif event_type in ROUTING_METHODS:
+            self._session(session_id)[1] = ROUTING_METHODS[event_type]
+        elif event_type == "ROUTE_DECISION":
+            self._session(session_id)[0] = extra
+        elif event_type == "REQUEST_COMPLETE":
+            self._finish(session_id, duration)
+
+    def _finish(self, session_id: str, duration: Optional[float]):
+        session = self.open_sessions.pop(session_id, None)
+        if session is None or session[0] is None:
+            return  # not an /api/ai request
+
+        route, method, routing_started = session
+        self.route_mix[route] += 1
+        self.routing_methods[method or "unknown"] += 1
+        if routing_started:
+            self.routed_requests += 1
+            self.keyword_hits += method == "keyword"
+        if duration is not None:
+            self.request_latency_by_route.setdefault(route, MillisecondHistogram()).add(duration)
+
+    def feed_file(self, path: str):
+        if path == "-":
+            for line in sys.stdin:
+                self.feed(line)
+            return
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                self.feed(line)
+
+    def report(self) -> Dict:
+        requests = sum(self.route_mix.values())
+        return {
+            "window": {"since": self.since, "until": self.until, "first_event": self.first_timestamp, "last_event": self.last_timestamp},
+            "lines": {"read": self.lines, "skipped": self.skipped, "unfinished_requests": len(self.open_sessions) + self.evicted_sessions},
+            "stages": {stage: histogram.summary() for stage, histogram in self.stages.items()},
+            "requests": requests,
+            "route_mix": {route: {"count": count, "share": round(count / requests, 4)} for route, count in self.route_mix.most_common()},
+            "routing_methods": dict(self.routing_methods.most_common()),
+            "keyword_fast_path": {
+                "routed_requests": self.routed_requests,
+                "hits": self.keyword_hits,
+                "hit_rate": round(self.keyword_hits / self.routed_requests, 4) if self.routed_requests else None,
+            },
+            "request_latency_by_route": {route: histogram.summary() for route, histogram in self.request_latency_by_route.items()},
+        }
+
+def format_report(report: Dict) -> str:
+    window = report["window"]
+    lines = [
+        f"events {window['first_event'] or '-'} .. {window['last_event'] or '-'} | {report['lines']['read']} lines, "
+        f"{report['lines']['skipped']} skipped, {report['lines']['unfinished_requests']} unfinished requests",
+        "",
+        f"{'stage':<34} | {'count':>8} | {'p50':>8} | {'p90':>8} | {'p99':>8} | {'max':>8}",
+        "-" * 88,
+    ]
+
+    def add_rows(rows: Dict[str, Dict]):
+        for name, summary in rows.items():
+            if not summary["count"]:
+                lines.append(f"{name:<34} | {0:>8} |")
+                continue
+            lines.append(f"{name:<34} | {summary['count']:>8} | " + " | ".join(f"{summary[key]:>7.3f}s" for key in ("p50", "p90", "p99", "max")))
+
+    add_rows(report["stages"])
+    if report["request_latency_by_route"]:
+        lines.append("")
+        add_rows({f"REQUEST_COMPLETE {route}": summary for route, summary in report["request_latency_by_route"].items()})
+
+    lines.append("")
+    lines.append(f"route mix ({report['requests']} requests):")
+    for route, mix in report["route_mix"].items():
+        lines.append(f"  {route:<26} {mix['count']:>8}  {mix['share']:>6.1%}")
+    lines.append("decided by: " + ", ".join(f"{method} {count}" for method, count in report["routing_methods"].items()))
+
+    fast_path = report["keyword_fast_path"]
+    hit_rate = f"{fast_path['hit_rate']:.1%}" if fast_path["hit_rate"] is not None else "-"
+    lines.append(f"keyword fast path: {fast_path['hits']}/{fast_path['routed_requests']} routed requests ({hit_rate})")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency percentiles, route mix and keyword fast-path rate from api-log.txt")
+    parser.add_argument("paths", nargs="*", default=["api-log.txt"], help="Log files in chronological order, '-' for stdin")
+    parser.add_argument("--since", help="Only events at or after this ISO time, e.g. '2025-01-01 09:00'")
+    parser.add_argument("--until", help="Only events before this ISO time")
+    parser.add_argument("--stage", action="append", help="Event to report percentiles for (repeatable, replaces the defaults)")
+    parser.add_argument("--max-open-sessions", type=int, default=10000)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    analyzer = LogAnalyzer(stages=args.stage or DEFAULT_STAGES, since=args.since, until=args.until, max_open_sessions=args.max_open_sessions)
+    for path in args.paths:
+        analyzer.feed_file(path)
+
+    report = analyzer.report()
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,89 @@
+import atexit
 import asyncio
+import threading
 import time
+from collections import deque
 from datetime import datetime
 import uuid
 import os
+from utils.tracing import tracer
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "NONE": 100}
+
+def event_level(event_type):
+    if "ERROR" in event_type or "FAILED" in event_type:
+        return LEVELS["ERROR"]
+    if "FALLBACK" in event_type or "UNCERTAIN" in event_type or "DISCARDED" in event_type:
+        return LEVELS["WARNING"]
+    if event_type == "---":
+        return LEVELS["DEBUG"]
+    return LEVELS["INFO"]
 
 class APILogger:
-    def __init__(self, log_file="api-log.txt"):
+    """Batched, non-blocking event log.
+    
+    ``log_sync`` only appends a raw record to a bounded ring buffer. A single
+    writer thread formats records, echoes them to the console at or above
+    ``console_level`` and appends them in batches to a file that stays open
+    and rotates by size. When the buffer passes ``sample_watermark`` only one
+    in ``sample_rate`` events below WARNING is kept; when it is full, those
+    events are dropped. Both are counted and reported in the log.
+    """
+    
+    def __init__(self, log_file="api-log.txt", buffer_size=65536, batch_size=512, flush_interval=0.2,
+                 max_bytes=50 * 1024 * 1024, backup_count=5, console_level="INFO",
+                 sample_watermark=0.75, sample_rate=10):
         self.log_file = log_file
+        self._buffer = deque(maxlen=buffer_size)
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._writer = None
+        self._stopping = False
+        self._file = None
+        self._sample_counter = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self._reported_losses = (0, 0)
+        self.configure(buffer_size=buffer_size, batch_size=batch_size, flush_interval=flush_interval, max_bytes=max_bytes,
+                       backup_count=backup_count, console_level=console_level, sample_watermark=sample_watermark, sample_rate=sample_rate)
         self.ensure_log_file()
-        self._write_queue = None
-        self._writer_task = None
-        self._initialized = False
+        atexit.register(self.close)
+    
+    def configure(self, buffer_size=None, batch_size=None, flush_interval=None, max_bytes=None, backup_count=None,
+                  console_level=None, sample_watermark=None, sample_rate=None):
+        if buffer_size is not None:
+            self.buffer_size = buffer_size
+            if self._buffer.maxlen != buffer_size:
+                self._buffer = deque(self._buffer, maxlen=buffer_size)
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if backup_count is not None:
+            self.backup_count = backup_count
+        if console_level is not None:
+            self.console_level = LEVELS[console_level.upper()]
+        if sample_watermark is not None:
+            self.sample_watermark = sample_watermark
+        if sample_rate is not None:
+            self.sample_rate = max(1, sample_rate)
+        self._sample_threshold = int(self.buffer_size * self.sample_watermark)
     
     def ensure_log_file(self):
         if not os.path.exists(self.log_file):
             with open(self.log_file, 'w') as f:
-                f.write(f"=== API Log Started - {datetime.now()} ===\n")
-                f.write("Format: TIMESTAMP | EVENT_TYPE | SESSION_ID | DURATION | DETAILS\n")
-                f.write("="*80 + "\n")
-    
-    def _ensure_async_initialized(self):
-        """Initialize async components if not already done"""
-        if not self._initialized:
-            try:
-                loop = asyncio.get_running_loop()
-                if self._write_queue is None:
-                    self._write_queue = asyncio.Queue()
-                if self._writer_task is None or self._writer_task.done():
-                    self._writer_task = loop.create_task(self._background_writer())
-                self._initialized = True
-            except RuntimeError:
-                # No running event loop, will init later when needed
-                pass
-    
-    async def _background_writer(self):
-        """Background task that handles file writing"""
-        while True:
-            try:
-                log_entry = await self._write_queue.get()
-                if log_entry is None:  # Shutdown signal
-                    break
-                
-                def write_to_file():
-                    with open(self.log_file, 'a', encoding='utf-8') as f:
-                        f.write(log_entry)
-                        f.flush()  # Ensure immediate write
-                
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, write_to_file)
-                self._write_queue.task_done()
-            except Exception as e:
-                print(f"Logger error: {e}")
-    
-    def format_log(self, session_id, event_type, duration=None, extra=None):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # Include milliseconds
+                self._write_header(f)
+    
+    def _write_header(self, f):
+        f.write(f"=== API Log Started - {datetime.now()} ===\n")
+        f.write("Format: TIMESTAMP | EVENT_TYPE | SESSION_ID | DURATION | DETAILS\n")
+        f.write("="*80 + "\n")
+    
+    def format_log(self, session_id, event_type, duration=None, extra=None, timestamp=None):
+        timestamp = datetime.fromtimestamp(timestamp) if timestamp is not None else datetime.now()
+        timestamp = timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # Include milliseconds
         
         if duration is not None:
             duration_str = f" | {duration:.3f}s"
@@ -64,44 +94,121 @@ class APILogger:
         return f"{timestamp} | {event_type:<20} | {session_id}{duration_str}{extra_str}\n"
     
     def log_sync(self, session_id, event_type, duration=None, extra=None):
-        log_entry = self.format_log(session_id, event_type, duration, extra)
+        level = event_level(event_type)
+        pending = len(self._buffer)
         
-        # Print to console immediately
-        print(f"🔍 {log_entry.strip()}")
+        if pending >= self._sample_threshold:
+            if level < LEVELS["WARNING"]:
+                if pending >= self.buffer_size:
+                    self.dropped += 1
+                    return
+                self._sample_counter += 1
+                if self._sample_counter % self.sample_rate:
+                    self.sampled_out += 1
+                    return
+            elif pending >= self.buffer_size:
+                self.dropped += 1  # the ring buffer evicts its oldest record
         
-        # Write to file synchronously for critical events
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-                f.flush()
-        except Exception as e:
-            print(f"Sync logging error: {e}")
+        self._buffer.append((time.time(), level, session_id, event_type, duration, extra))
+        
+        if self._writer is None:
+            self._start_writer()
+        elif pending + 1 >= self.batch_size:
+            self._wakeup.set()
     
     async def log_async(self, session_id, event_type, duration=None, extra=None):
-        log_entry = self.format_log(session_id, event_type, duration, extra)
+        self.log_sync(session_id, event_type, duration, extra)
+    
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._stopping = False
+            self._writer = threading.Thread(target=self._write_loop, name="api-log-writer", daemon=True)
+            self._writer.start()
+    
+    def _write_loop(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            stopping = self._stopping
+            self._flush_buffer()
+            if stopping:
+                break
+    
+    def _flush_buffer(self):
+        buffer = self._buffer
+        if not buffer and self._reported_losses == (self.dropped, self.sampled_out):
+            return
         
-        # Print to console immediately
-        print(f"🔍 {log_entry.strip()}")
+        lines = []
+        console_lines = []
+        while buffer:
+            timestamp, level, session_id, event_type, duration, extra = buffer.popleft()
+            entry = self.format_log(session_id, event_type, duration, extra, timestamp)
+            lines.append(entry)
+            if level >= self.console_level:
+                console_lines.append(f"🔍 {entry}")
+        
+        losses = (self.dropped, self.sampled_out)
+        if losses != self._reported_losses:
+            entry = self.format_log("LOGGER", "LOG_OVERLOAD", extra=f"Dropped: {losses[0]} | Sampled out: {losses[1]} (totals)")
+            lines.append(entry)
+            console_lines.append(f"🔍 {entry}")
+            self._reported_losses = losses
+        
+        if console_lines:
+            print("".join(console_lines), end="", flush=True)
         
-        # Queue for background file writing
         try:
-            self._ensure_async_initialized()
-            if self._write_queue:
-                await self._write_queue.put(log_entry)
-            else:
-                # Fallback to sync if async not available
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(log_entry)
-                    f.flush()
+            self._write_lines("".join(lines))
         except Exception as e:
-            print(f"Async logging error: {e}")
-            # Fallback to sync writing
-            try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(log_entry)
-                    f.flush()
-            except Exception as sync_error:
-                print(f"Fallback logging error: {sync_error}")
+            print(f"Logger error: {e}")
+    
+    def _write_lines(self, data):
+        if self._file is None:
+            self._file = open(self.log_file, 'a', encoding='utf-8')
+            if self._file.tell() == 0:
+                self._write_header(self._file)
+        
+        self._file.write(data)
+        self._file.flush()
+        
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+    
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.log_file}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_file}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.log_file, f"{self.log_file}.1")
+        else:
+            os.remove(self.log_file)
+    
+    def stats(self):
+        return {
+            "buffered": len(self._buffer),
+            "buffer_size": self.buffer_size,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out
+        }
+    
+    def close(self):
+        """Drain buffered events and close the file; logging again restarts the writer."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                self._stopping = True
+                self._wakeup.set()
+                writer.join()
+            self._flush_buffer()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
     
     def log_api_call_details(self, session_id, method, path, user_agent=None, ip=None):
         """Log detailed API call information"""
@@ -121,10 +228,7 @@ class APILogger:
     
     async def shutdown(self):
         """Gracefully shutdown the logger"""
-        if self._write_queue:
-            await self._write_queue.put(None)  # Shutdown signal
-        if self._writer_task:
-            await self._writer_task
+        await asyncio.to_thread(self.close)
 
 logger = APILogger()
 
@@ -137,26 +241,31 @@ class TimingContext:
         self.start_time = time.time()
         self.events = []
         self.route_type = None
-        self.openai_calls = 0
-        self.rag_calls = 0
-        self.context_retrieval_calls = 0
+        # Spans opened anywhere in the request (see utils.tracing) land here.
+        self.trace = tracer.start_trace(session_id)
+    
+    @property
+    def openai_calls(self):
+        return self.trace.counts["llm"]
+    
+    @property
+    def rag_calls(self):
+        return self.trace.counts["rag"]
+    
+    @property
+    def context_retrieval_calls(self):
+        return self.trace.counts["memory.get_context"]
     
     def log_event(self, event_type, extra=None):
         current_time = time.time()
         duration_since_start = current_time - self.start_time
         
-        # Track specific event types
-        if event_type == "OPENAI_START":
-            self.openai_calls += 1
-        elif event_type == "RAG_START":
-            self.rag_calls += 1
-        elif event_type == "CONTEXT_RETRIEVAL_START":
-            self.context_retrieval_calls += 1
-        elif event_type == "ROUTING_DECISION":
+        if event_type == "ROUTE_DECISION":
             self.route_type = extra
         
         logger.log_sync(self.session_id, event_type, duration_since_start, extra)
         self.events.append((event_type, current_time, extra))
+        self.trace.add_instant(event_type, extra)
     
     def log_duration_event(self, event_type, start_time, extra=None):
         current_time = time.time()
@@ -197,6 +306,10 @@ class TimingContext:
         
         await logger.log_async(self.session_id, "REQUEST_COMPLETE", total_duration, summary)
         
+        if tracer.should_export(self.trace, total_duration):
+            path = await asyncio.to_thread(tracer.export, self.trace)
+            logger.log_sync(self.session_id, "TRACE_EXPORTED", extra=f"{len(self.trace.spans)} spans | {path}")
+        
         # Log a separator for readability
         await logger.log_async(self.session_id, "---", None, "End of request")
     
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+class Trace:
+    """Spans and instant events recorded for one request.
+
+    ``counts`` is incremented for every span by both its name and its
+    category, so ``counts["llm"]`` is the number of LLM calls and
+    ``counts["memory.get_context"]`` the number of context fetches.
+    Spans are only stored when ``record`` is set; counting is always on.
+    """
+
+    def __init__(self, session_id: str, record: bool = False, sampled: bool = False, max_spans: int = 10000):
+        self.session_id = session_id
+        self.record = record
+        self.sampled = sampled
+        self.max_spans = max_spans
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.counts = Counter()
+        self.spans: List[tuple] = []
+        self.instants: List[tuple] = []
+        self.dropped_spans = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def next_span_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def add_span(self, name: str, category: str, start: float, end: float, span_id: int, parent_id: Optional[int], lane: int, attrs: Dict[str, Any]):
+        with self._lock:
+            self.counts[name] += 1
+            self.counts[category] += 1
+            if not self.record:
+                return
+            if len(self.spans) >= self.max_spans:
+                self.dropped_spans += 1
+                return
+            self.spans.append((name, category, start, end, span_id, parent_id, lane, attrs))
+
+    def add_instant(self, name: str, extra: Optional[str] = None):
+        if self.record:
+            with self._lock:
+                self.instants.append((name, time.perf_counter(), _lane(), extra))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format, loadable in chrome://tracing and Perfetto.
+
+        Each asyncio task or thread gets its own row, so overlapping work
+        (speculative retrieval, ``to_thread`` calls) shows side by side.
+        """
+        lanes: Dict[int, int] = {}
+        events = []
+        for name, category, start, end, span_id, parent_id, lane, attrs in sorted(self.spans, key=lambda s: s[2]):
+            events.append({
+                "name": name, "cat": category, "ph": "X", "pid": 1, "tid": lanes.setdefault(lane, len(lanes) + 1),
+                "ts": round((start - self.origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1),
+                "args": {"span_id": span_id, "parent_id": parent_id, **attrs},
+            })
+        for name, at, lane, extra in self.instants:
+            events.append({
+                "name": name, "cat": "event", "ph": "i", "s": "t", "pid": 1, "tid": lanes.setdefault(lane, len(lanes) + 1),
+                "ts": round((at - self.origin) * 1e6, 1), "args": {"extra": extra} if extra else {},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"session_id": self.session_id, "started_at": self.started_at, "dropped_spans": self.dropped_spans},
+        }
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+current_span_id: ContextVar[Optional[int]] = ContextVar("current_span_id", default=None)
+
+def _lane() -> int:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+class span:
+    """Times a block as a child of the enclosing span of the current request.
+
+        with span("rag.retrieve", "rag", top_k=5):
+            ...
+
+    A no-op outside a request. Contextvars follow ``asyncio.create_task``
+    and ``asyncio.to_thread``, so nothing needs to be passed around.
+    """
+
+    __slots__ = ("name", "category", "attrs", "trace", "span_id", "parent_id", "start")
+
+    def __init__(self, name: str, category: str = "app", **attrs):
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.trace = None
+
+    def __enter__(self):
+        trace = current_trace.get()
+        if trace is None:
+            return self
+        self.trace = trace
+        self.parent_id = current_span_id.get()
+        self.span_id = trace.next_span_id()
+        current_span_id.set(self.span_id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        trace = self.trace
+        if trace is None:
+            return False
+        end = time.perf_counter()
+        # set() rather than reset(token): async generators may resume in a copied context.
+        current_span_id.set(self.parent_id)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        trace.add_span(self.name, self.category, self.start, end, self.span_id, self.parent_id, _lane(), self.attrs)
+        return False
+
+class Tracer:
+    """Creates per-request traces and exports the sampled or slow ones.
+
+    Export is off until ``output_dir`` is set. Then every request records
+    its spans; at the end a trace is written when it was head-sampled
+    (``sample_rate``) or ran for at least ``slow_threshold_seconds``.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, sample_rate: float = 0.01, slow_threshold_seconds: Optional[float] = 2.0):
+        self.configure(output_dir=output_dir, sample_rate=sample_rate, slow_threshold_seconds=slow_threshold_seconds)
+        self.exported = 0
+
+    def configure(self, output_dir: Optional[str] = None, sample_rate: Optional[float] = None, slow_threshold_seconds: Optional[float] = None):
+        self.output_dir = output_dir or None
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if slow_threshold_seconds is not None:
+            self.slow_threshold_seconds = slow_threshold_seconds if slow_threshold_seconds > 0 else None
+
+    def start_trace(self, session_id: str) -> Trace:
+        enabled = self.output_dir is not None
+        return Trace(session_id, record=enabled, sampled=enabled and random.random() < self.sample_rate)
+
+    def should_export(self, trace: Trace, duration: float) -> bool:
+        if not trace.record:
+            return False
+        return trace.sampled or (self.slow_threshold_seconds is not None and duration >= self.slow_threshold_seconds)
+
+    def export(self, trace: Trace) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"trace-{time.strftime('%Y%m%d-%H%M%S', time.localtime(trace.started_at))}-{trace.session_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace.to_chrome_trace(), f)
+        self.exported += 1
+        return path
+
+tracer = Tracer()